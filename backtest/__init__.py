@@ -0,0 +1,4 @@
+"""Replays recorded sensor history through the vent model.
+
+Run it from the repository root with ``python -m backtest``.
+"""
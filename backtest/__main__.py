@@ -0,0 +1,61 @@
+"""Replays the recorded sensor history of rooms through the vent model.
+
+The rooms are read from a JSON file holding a list of rooms with a name and the keys of
+the config entry (sensors, window size, room volume, wished humidity and optionally the
+maximum vent time). A room may carry the calibration episodes stored in the config
+entry for it under "calibration", the vent times then use the fitted constants like the
+sensor does, otherwise the default constants. Every room is replayed in its own worker process and gets a CSV file
+with the readings and the vent time at every step in the output directory.
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+import json
+import os
+import sys
+
+from .replay import DEFAULT_CHUNK_SIZE, replay_room
+
+
+def _timestamp(text):
+    time = datetime.fromisoformat(text)
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=timezone.utc)
+    return time.timestamp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backtest", description=__doc__)
+    parser.add_argument("rooms", help="JSON file with the rooms to replay")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--database", help="recorder SQLite database, e.g. home-assistant_v2.db")
+    source.add_argument("--csv", help="CSV export of the history")
+    parser.add_argument("--output", "-o", default=".", help="directory to write the results to")
+    parser.add_argument("--start", type=_timestamp, help="first time to replay (ISO 8601, UTC by default)")
+    parser.add_argument("--end", type=_timestamp, help="time to stop replaying at (ISO 8601, UTC by default)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes, one per CPU by default")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="steps calculated in one batch")
+    args = parser.parse_args(argv)
+
+    with open(args.rooms, encoding="utf-8") as file:
+        rooms = json.load(file)
+    source = ("recorder", args.database) if args.database else ("csv", args.csv)
+    os.makedirs(args.output, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(replay_room, room, source, args.output, args.start, args.end, args.chunk_size)
+            for room in rooms
+        ]
+        for future in as_completed(futures):
+            summary = future.result()
+            print(
+                f"{summary['name']}: {summary['rows']} steps in {summary['seconds']} s -> {summary['output']}",
+                file=sys.stderr,
+            )
+
+
+if __name__ == "__main__":
+    main()
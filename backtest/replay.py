@@ -0,0 +1,125 @@
+"""Aligns the sensor histories of a room and calculates the vent time at every step."""
+from __future__ import annotations
+
+import csv
+from datetime import datetime, timezone
+from heapq import merge
+from itertools import groupby, islice
+import os
+import time
+
+import numpy as np
+
+from custom_components.ventoptimization.calibration import Calibration
+from custom_components.ventoptimization.const import (
+    CONF_CALIBRATION,
+    CONF_INDOOR_HUMIDITY,
+    CONF_INDOOR_TEMP,
+    CONF_MAX_ALLOWED_HUMIDITY,
+    CONF_MAX_VENT_TIME,
+    CONF_OUTDOOR_HUMIDITY,
+    CONF_OUTDOOR_TEMP,
+    CONF_ROOM_VOLUME,
+    CONF_WINDOW_SIZE,
+    DEFAULT_MAX_VENT_TIME,
+)
+from custom_components.ventoptimization.model import INPUT_DECIMALS, calc_e_s, calc_time_to_vent_batch
+
+from .sources import HUMIDITY, TEMPERATURE, csv_history, recorder_history
+
+# The inputs of the model in the order of the output columns
+SERIES = (
+    (CONF_INDOOR_TEMP, TEMPERATURE),
+    (CONF_INDOOR_HUMIDITY, HUMIDITY),
+    (CONF_OUTDOOR_TEMP, TEMPERATURE),
+    (CONF_OUTDOOR_HUMIDITY, HUMIDITY),
+)
+
+COLUMNS = ("time", "indoor_temp", "indoor_humidity", "outdoor_temp", "outdoor_humidity", "vent_time")
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def align(histories):
+    """Merge the histories into steps holding the latest value of every series.
+
+    Readings with the same timestamp form one step, like the sensor coalesces a burst of
+    updates. Steps are only yielded while every series has a valid value.
+    """
+    latest = [None]*len(histories)
+    tagged = [_tag(history, index) for index, history in enumerate(histories)]
+    for timestamp, readings in groupby(merge(*tagged, key=lambda reading: reading[0]), key=lambda reading: reading[0]):
+        for _, index, value in readings:
+            latest[index] = value
+        if None not in latest:
+            yield (timestamp, *latest)
+
+
+def _tag(history, index):
+    for timestamp, value in history:
+        yield timestamp, index, value
+
+
+def absolute_humidities(hum, temp):
+    """Calculate the absolute humidities like the sensor, from the temperature rounded to its inputs.
+
+    The sensor memoizes the saturation vapour pressure with cached_e_s, which needs Home
+    Assistant, so the replay calculates the same value without the cache.
+    """
+    return [hum/100*calc_e_s(round(temp, INPUT_DECIMALS)) for hum, temp in zip(hum.tolist(), temp.tolist())]
+
+
+def chunked(iterable, size):
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def replay_room(room, source, output_dir, start=None, end=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Replay the history of one room and write the vent time of every step to a CSV file.
+
+    source is ("recorder", path to the database) or ("csv", path to the export). The room
+    uses the constants fitted to its stored calibration episodes like the sensor does. Runs
+    in a worker process, so it only takes and returns plain data. Returns a summary of the run.
+    """
+    kind, path = source
+    constants = Calibration(room.get(CONF_CALIBRATION, ())).constants(room[CONF_WINDOW_SIZE], room[CONF_ROOM_VOLUME])
+    read = recorder_history if kind == "recorder" else csv_history
+    histories = [read(path, room[key], series_kind, start, end) for key, series_kind in SERIES]
+
+    started = time.perf_counter()
+    rows = 0
+    output = os.path.join(output_dir, f"{room['name']}.csv")
+    with open(output, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        for chunk in chunked(align(histories), chunk_size):
+            timestamps, indoor_temp, indoor_hum, outdoor_temp, outdoor_hum = np.array(chunk).T
+            times = calc_time_to_vent_batch(
+                indoor_temp,
+                outdoor_temp,
+                absolute_humidities(indoor_hum, indoor_temp),
+                absolute_humidities(outdoor_hum, outdoor_temp),
+                room[CONF_WINDOW_SIZE],
+                room[CONF_ROOM_VOLUME],
+                room[CONF_MAX_ALLOWED_HUMIDITY],
+                room.get(CONF_MAX_VENT_TIME, DEFAULT_MAX_VENT_TIME),
+                constants,
+            )
+            writer.writerows(
+                (_format_timestamp(timestamp), *readings, round(float(vent_time), 2))
+                for (timestamp, *readings), vent_time in zip(chunk, times)
+            )
+            rows += len(chunk)
+
+    return {
+        "name": room["name"],
+        "output": output,
+        "rows": rows,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def _format_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
@@ -0,0 +1,88 @@
+"""Reads the history of one sensor from the recorder database or a CSV export.
+
+Every reader is a generator of (timestamp, value) tuples ordered by time, with the
+timestamp in seconds since the epoch, temperatures in °C and humidities in %. States
+that are no valid reading have the value None, the sensor is unavailable until the next
+valid reading.
+"""
+from __future__ import annotations
+
+import csv
+from datetime import datetime, timezone
+import json
+import sqlite3
+
+TEMPERATURE = "temperature"
+HUMIDITY = "humidity"
+
+# Rows fetched from the database at once
+FETCH_SIZE = 10000
+
+_RECORDER_QUERY = """
+    SELECT states.last_updated_ts, states.state, states.attributes_id, state_attributes.shared_attrs
+    FROM states
+    JOIN states_meta ON states.metadata_id = states_meta.metadata_id
+    LEFT JOIN state_attributes ON states.attributes_id = state_attributes.attributes_id
+    WHERE states_meta.entity_id = ? AND states.last_updated_ts >= ? AND states.last_updated_ts < ?
+    ORDER BY states.last_updated_ts
+"""
+
+
+def parse_value(state, unit, kind):
+    """Convert a recorded state to °C or %, None if it is no valid reading"""
+    try:
+        value = float(state)
+    except (TypeError, ValueError):
+        return None
+
+    if kind == TEMPERATURE:
+        if unit == "°F":
+            return (value - 32)/1.8
+        return value if unit in ("°C", None) else None
+    if unit not in ("%", None) or not 0 <= value <= 100:
+        return None
+    return value
+
+
+def recorder_history(database, entity_id, kind, start=None, end=None):
+    """Read the states of an entity from a recorder SQLite database (schema of 2023.4 and later)"""
+    connection = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+    try:
+        cursor = connection.execute(
+            _RECORDER_QUERY,
+            (entity_id, start if start is not None else float("-inf"), end if end is not None else float("inf")),
+        )
+        # Consecutive states mostly share their attributes, parse each of them once
+        units = {}
+        while rows := cursor.fetchmany(FETCH_SIZE):
+            for timestamp, state, attributes_id, attributes in rows:
+                if (unit := units.get(attributes_id, units)) is units:
+                    unit = units[attributes_id] = json.loads(attributes).get("unit_of_measurement") if attributes else None
+                yield timestamp, parse_value(state, unit, kind)
+    finally:
+        connection.close()
+
+
+def csv_history(path, entity_id, kind, start=None, end=None):
+    """Read the states of an entity from a CSV history export.
+
+    The file needs the columns entity_id, state and last_changed like the export of the
+    history panel, optionally with a unit_of_measurement column. Without it the readings
+    are taken to be in °C and %. The rows of an entity have to be ordered by time.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            if row["entity_id"] != entity_id:
+                continue
+            timestamp = _parse_timestamp(row["last_changed"])
+            if (start is not None and timestamp < start) or (end is not None and timestamp >= end):
+                continue
+            yield timestamp, parse_value(row["state"], row.get("unit_of_measurement") or None, kind)
+
+
+def _parse_timestamp(text):
+    """Parse an ISO 8601 time, taking times without a zone as UTC"""
+    time = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=timezone.utc)
+    return time.timestamp()
@@ -0,0 +1,4 @@
+"""Calculates the vent time for every row of large CSV or Parquet files.
+
+Run it from the repository root with ``python -m batch``.
+"""
@@ -0,0 +1,119 @@
+"""Calculates the vent time for every row of a CSV or Parquet file.
+
+The file needs the columns indoor_temp, indoor_humidity, outdoor_temp and
+outdoor_humidity (°C and %). The room parameters are given as options or, to vary them
+per row, as columns named like the keys of the config entry. The output has the rows of
+the input with a vent_time column added, in the format of the input. The file is split
+into parts calculated by worker processes, each reading its part in chunks.
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from custom_components.ventoptimization.const import (
+    CONF_MAX_ALLOWED_HUMIDITY,
+    CONF_MAX_VENT_TIME,
+    CONF_ROOM_VOLUME,
+    CONF_WINDOW_SIZE,
+    DEFAULT_MAX_VENT_TIME,
+)
+
+from .files import CSV, PARTS_PER_WORKER, csv_header, csv_parts, file_format, parquet_columns, parquet_parts
+from .run import DEFAULT_CHUNK_SIZE, READING_COLUMNS, VENT_TIME, run_part
+
+
+def _merge_csv(path, summaries, output):
+    names, _ = csv_header(path)
+    with open(output, "w", encoding="utf-8") as file:
+        file.write(",".join([*names, VENT_TIME]) + "\n")
+        for summary in summaries:
+            with open(summary["output"], encoding="utf-8") as part:
+                shutil.copyfileobj(part, file)
+
+
+def _merge_parquet(summaries, output):
+    import pyarrow.parquet
+
+    writer = None
+    try:
+        for summary in summaries:
+            if summary["output"] is None:
+                continue
+            part = pyarrow.parquet.ParquetFile(summary["output"])
+            writer = writer or pyarrow.parquet.ParquetWriter(output, part.schema_arrow)
+            # One row group at a time keeps the memory flat
+            for row_group in range(part.num_row_groups):
+                writer.write_table(part.read_row_group(row_group))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m batch", description=__doc__)
+    parser.add_argument("input", help="CSV or Parquet file with the readings")
+    parser.add_argument("output", help="file to write the rows with the vent times to")
+    parser.add_argument("--window-size", type=float, help="total open window surface in m²")
+    parser.add_argument("--room-volume", type=float, help="room volume in m³")
+    parser.add_argument("--max-humidity", type=float, help="maximum wished humidity in %%")
+    parser.add_argument("--max-vent-time", type=float, default=DEFAULT_MAX_VENT_TIME, help="maximum vent time in minutes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes, one per CPU by default")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows calculated in one batch")
+    parser.add_argument("--verify", type=int, default=0, help="check the first rows of every part against the scalar solver")
+    args = parser.parse_args(argv)
+
+    kind = file_format(args.input)
+    columns = csv_header(args.input)[0] if kind == CSV else parquet_columns(args.input)
+    if missing := [column for column in READING_COLUMNS if column not in columns]:
+        parser.error(f"{args.input} has no column {', '.join(missing)}")
+    room = {
+        CONF_WINDOW_SIZE: args.window_size,
+        CONF_ROOM_VOLUME: args.room_volume,
+        CONF_MAX_ALLOWED_HUMIDITY: args.max_humidity,
+        CONF_MAX_VENT_TIME: args.max_vent_time,
+    }
+    if missing := [key for key, value in room.items() if value is None and key not in columns]:
+        parser.error(f"give {', '.join(missing)} as an option or a column")
+
+    workers = max(1, args.workers)
+    parts = (csv_parts if kind == CSV else parquet_parts)(args.input, workers*PARTS_PER_WORKER)
+
+    started = time.perf_counter()
+    # The parts are written next to the output, moving them around stays on one disk
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(args.output))) as parts_dir:
+        jobs = [
+            (index, part, kind, room, parts_dir, args.chunk_size, args.verify)
+            for index, part in enumerate(parts)
+        ]
+        if workers == 1:
+            summaries = [run_part(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                summaries = list(executor.map(run_part, *zip(*jobs)))
+        if kind == CSV:
+            _merge_csv(args.input, summaries, args.output)
+        else:
+            _merge_parquet(summaries, args.output)
+    seconds = time.perf_counter() - started
+
+    rows = sum(summary["rows"] for summary in summaries)
+    print(
+        f"{rows} rows in {seconds:.2f} s ({rows/seconds:.0f} rows/s, {len(parts)} parts on {workers} workers) -> {args.output}",
+        file=sys.stderr,
+    )
+    if args.verify:
+        verified = sum(summary["verified"] for summary in summaries)
+        mismatches = sum(summary["mismatches"] for summary in summaries)
+        print(f"{verified} rows verified against the scalar solver, {mismatches} differ", file=sys.stderr)
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
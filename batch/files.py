@@ -0,0 +1,135 @@
+"""Splits CSV and Parquet files into parts and reads them chunk by chunk.
+
+A part is the unit of work of one worker process. CSV files are split into byte ranges
+starting at line boundaries, Parquet files into row groups. Reading a part never holds
+more than one chunk in memory.
+"""
+from __future__ import annotations
+
+import io
+import os
+
+import numpy as np
+
+CSV = "csv"
+PARQUET = "parquet"
+
+# Parts per worker, smaller parts balance the load better but each one has an output file
+PARTS_PER_WORKER = 4
+# Bytes of the file used to estimate the length of a CSV line
+SAMPLE_SIZE = 65536
+
+
+def file_format(path):
+    """Return the format of a file from its extension"""
+    return PARQUET if os.path.splitext(path)[1].lower() in (".parquet", ".pq") else CSV
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow.parquet
+    except ImportError as err:
+        raise SystemExit("Reading and writing Parquet files needs pyarrow, install it with `pip install pyarrow`") from err
+    return pyarrow, pyarrow.parquet
+
+
+def csv_header(path):
+    """Return the column names of a CSV file and the offset of its first row"""
+    with open(path, "rb") as file:
+        header = file.readline()
+        return header.decode("utf-8").strip().split(","), file.tell()
+
+
+def csv_parts(path, count):
+    """Split the rows of a CSV file into count byte ranges of whole lines"""
+    _, start = csv_header(path)
+    size = os.path.getsize(path)
+    bounds = [start]
+    with open(path, "rb") as file:
+        for index in range(1, count):
+            file.seek(max(bounds[-1], start + (size - start)*index//count))
+            # Continue at the beginning of the next line
+            if file.tell() > start:
+                file.seek(file.tell() - 1)
+                file.readline()
+            if (bound := file.tell()) > bounds[-1]:
+                bounds.append(bound)
+    bounds.append(size)
+    return [(path, begin, end) for begin, end in zip(bounds, bounds[1:]) if end > begin]
+
+
+def csv_line_length(path):
+    """Estimate the average length of the rows of a CSV file in bytes"""
+    _, start = csv_header(path)
+    with open(path, "rb") as file:
+        file.seek(start)
+        sample = file.read(SAMPLE_SIZE)
+    return max(1, len(sample)//max(1, sample.count(b"\n")))
+
+
+def read_csv_part(part, columns, chunk_size):
+    """Read a byte range of a CSV file in chunks of about chunk_size rows.
+
+    Yields the raw lines of every chunk together with a dict of float arrays of the
+    wanted columns. Fields that are no number are NaN.
+    """
+    path, start, end = part
+    names, _ = csv_header(path)
+    indices = [names.index(column) for column in columns]
+    block_size = chunk_size*csv_line_length(path)
+    with open(path, "rb") as file:
+        file.seek(start)
+        position = start
+        rest = b""
+        while position < end:
+            data = file.read(min(block_size, end - position))
+            position += len(data)
+            data = rest + data
+            # The last block of the part ends with its last line
+            cut = len(data) if position >= end else data.rfind(b"\n") + 1
+            if not cut:
+                rest = data
+                continue
+            lines = [line for line in data[:cut].decode("utf-8").splitlines() if line]
+            rest = data[cut:]
+            if lines:
+                yield lines, dict(zip(columns, _parse_columns(lines, indices)))
+
+
+def _parse_columns(lines, indices):
+    try:
+        values = np.loadtxt(lines, delimiter=",", usecols=indices, ndmin=2, dtype=float, comments=None)
+    except ValueError:
+        # Empty or broken fields, the slower parser fills them with NaN
+        values = np.genfromtxt(io.StringIO("\n".join(lines)), delimiter=",", usecols=indices, dtype=float, comments=None)
+        values = values.reshape(len(lines), len(indices))
+    return values.T
+
+
+def parquet_columns(path):
+    """Return the column names of a Parquet file"""
+    _, parquet = _import_pyarrow()
+    return parquet.ParquetFile(path).schema_arrow.names
+
+
+def parquet_parts(path, count):
+    """Split the row groups of a Parquet file into at most count parts"""
+    _, parquet = _import_pyarrow()
+    row_groups = np.arange(parquet.ParquetFile(path).num_row_groups)
+    return [(path, part.tolist()) for part in np.array_split(row_groups, max(1, min(count, row_groups.size))) if part.size]
+
+
+def read_parquet_part(part, columns, chunk_size):
+    """Read row groups of a memory-mapped Parquet file in batches of chunk_size rows.
+
+    Yields the record batches together with a dict of float arrays of the wanted columns.
+    Missing values are NaN.
+    """
+    pyarrow, parquet = _import_pyarrow()
+    path, row_groups = part
+    file = parquet.ParquetFile(path, memory_map=True)
+    for batch in file.iter_batches(batch_size=chunk_size, row_groups=row_groups):
+        yield batch, {
+            column: batch.column(column).cast(pyarrow.float64()).to_numpy(zero_copy_only=False)
+            for column in columns
+        }
@@ -0,0 +1,162 @@
+"""Calculates the vent times of one part of a file like the sensor does."""
+from __future__ import annotations
+
+import math
+from operator import add
+import os
+import time
+
+import numpy as np
+
+from custom_components.ventoptimization.const import (
+    CONF_MAX_ALLOWED_HUMIDITY,
+    CONF_MAX_VENT_TIME,
+    CONF_ROOM_VOLUME,
+    CONF_WINDOW_SIZE,
+)
+from custom_components.ventoptimization.model import (
+    INPUT_DECIMALS,
+    calc_e_s,
+    calc_time_to_vent,
+    calc_time_to_vent_batch,
+)
+
+from .files import CSV, csv_header, parquet_columns, read_csv_part, read_parquet_part
+
+# Same names as the columns of the backtest results
+READING_COLUMNS = ("indoor_temp", "indoor_humidity", "outdoor_temp", "outdoor_humidity")
+# A column with the key of the config entry overrides the room parameter of the whole file
+ROOM_COLUMNS = (CONF_WINDOW_SIZE, CONF_ROOM_VOLUME, CONF_MAX_ALLOWED_HUMIDITY, CONF_MAX_VENT_TIME)
+VENT_TIME = "vent_time"
+
+# The state of the sensor is rounded to two decimals
+STATE_DECIMALS = 2
+
+DEFAULT_CHUNK_SIZE = 65536
+
+# Vent time fields of the CSV output by the state in hundredths, grown as needed
+_fields = []
+
+
+def absolute_humidity(hum, temp):
+    """Calculate the absolute humidities from e_s of the rounded temperatures like the sensor"""
+    # Readings repeat a lot, e_s is calculated once per temperature with the scalar function
+    temps, inverse = np.unique(np.round(temp, INPUT_DECIMALS), return_inverse=True)
+    e_s = np.array([calc_e_s(round(value, INPUT_DECIMALS)) for value in temps.tolist()])
+    return (hum/100)*e_s[inverse.reshape(-1)]
+
+
+def calc_vent_times(columns, room):
+    """Calculate the states of the sensor for a chunk of readings in hundredths, -1 if a reading is missing"""
+    indoor_temp, indoor_hum, outdoor_temp, outdoor_hum = (columns[column] for column in READING_COLUMNS)
+    times = calc_time_to_vent_batch(
+        indoor_temp,
+        outdoor_temp,
+        absolute_humidity(indoor_hum, indoor_temp),
+        absolute_humidity(outdoor_hum, outdoor_temp),
+        *(columns.get(column, room.get(column)) for column in ROOM_COLUMNS),
+    )
+    return state_hundredths(times)
+
+
+def state_hundredths(times):
+    """Round vent times like the state of the sensor, as integer hundredths of a minute"""
+    scaled = times*10**STATE_DECIMALS
+    hundredths = np.rint(scaled)
+    # Near a tie the scaled value can round the other way than round() does, which is asked for those few
+    for row in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6).tolist():
+        hundredths[row] = round(round(float(times[row]), STATE_DECIMALS)*10**STATE_DECIMALS)
+    return np.where(np.isnan(times), -1, hundredths).astype(np.int64)
+
+
+def _csv_fields(hundredths):
+    """Return the vent time fields to append to the CSV lines, formatted like the state"""
+    if (top := int(hundredths.max(initial=0))) >= len(_fields):
+        _fields.extend(f",{value/10**STATE_DECIMALS!r}" for value in range(len(_fields), top + 1))
+    # A missing state is an empty field
+    return map((_fields[:top + 1] + [","]).__getitem__, hundredths.tolist())
+
+
+def sensor_vent_time(indoor_temp, indoor_hum, outdoor_temp, outdoor_hum, window_size, room_volume, max_hum_allowed, max_vent_time):
+    """Calculate a single state with the scalar solver of the sensor"""
+    indoor_absolute_humidity = (indoor_hum/100)*calc_e_s(round(indoor_temp, INPUT_DECIMALS))
+    outdoor_absolute_humidity = (outdoor_hum/100)*calc_e_s(round(outdoor_temp, INPUT_DECIMALS))
+    if indoor_absolute_humidity <= outdoor_absolute_humidity:
+        return 0
+    time, _ = calc_time_to_vent(
+        indoor_temp,
+        outdoor_temp,
+        indoor_absolute_humidity,
+        outdoor_absolute_humidity,
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        max_vent_time,
+    )
+    return round(time, STATE_DECIMALS)
+
+
+def _verify(columns, room, hundredths, rows):
+    """Return the number of the first rows whose state differs from the scalar solver"""
+    mismatches = 0
+    for row in range(min(rows, len(hundredths))):
+        inputs = [float(columns[column][row]) for column in READING_COLUMNS]
+        inputs += [float(columns[column][row]) if column in columns else room[column] for column in ROOM_COLUMNS]
+        if any(map(math.isnan, inputs)):
+            continue
+        if sensor_vent_time(*inputs) != hundredths[row]/10**STATE_DECIMALS:
+            mismatches += 1
+    return mismatches
+
+
+def run_part(index, part, file_format, room, output_dir, chunk_size=DEFAULT_CHUNK_SIZE, verify=0):
+    """Calculate the vent times of one part and write its rows with them to a part file.
+
+    Runs in a worker process, so it only takes and returns plain data. The first verify
+    rows of the part are checked against the scalar solver. Returns a summary of the run.
+    """
+    started = time.perf_counter()
+    output = os.path.join(output_dir, f"part-{index:05d}.{file_format}")
+    summary = {"index": index, "output": output, "rows": 0, "verified": 0, "mismatches": 0}
+
+    if file_format == CSV:
+        names, _ = csv_header(part[0])
+        columns = [name for name in names if name in READING_COLUMNS + ROOM_COLUMNS]
+        with open(output, "w", encoding="utf-8") as file:
+            for lines, values in read_csv_part(part, columns, chunk_size):
+                hundredths = calc_vent_times(values, room)
+                file.write("\n".join(map(add, lines, _csv_fields(hundredths))))
+                file.write("\n")
+                _count(summary, values, room, hundredths, verify)
+    else:
+        import pyarrow
+        import pyarrow.parquet
+
+        writer = None
+        try:
+            columns = [name for name in parquet_columns(part[0]) if name in READING_COLUMNS + ROOM_COLUMNS]
+            for batch, values in read_parquet_part(part, columns, chunk_size):
+                hundredths = calc_vent_times(values, room)
+                states = np.where(hundredths < 0, np.nan, hundredths/10**STATE_DECIMALS)
+                table = pyarrow.Table.from_batches([batch]).append_column(
+                    VENT_TIME, pyarrow.array(states, pyarrow.float64(), from_pandas=True)
+                )
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(output, table.schema)
+                writer.write_table(table)
+                _count(summary, values, room, hundredths, verify)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            summary["output"] = None
+
+    summary["seconds"] = time.perf_counter() - started
+    return summary
+
+
+def _count(summary, values, room, hundredths, verify):
+    if (rows := verify - summary["verified"]) > 0:
+        summary["mismatches"] += _verify(values, room, hundredths, rows)
+        summary["verified"] += min(rows, len(hundredths))
+    summary["rows"] += len(hundredths)
@@ -0,0 +1,4 @@
+"""Benchmarks for the vent model and the sensor update path.
+
+Run them from the repository root with ``python -m benchmarks``.
+"""
@@ -0,0 +1,69 @@
+"""Runs the benchmarks and writes the results as JSON.
+
+Pass a previous result file with --compare to print the change of every benchmark.
+Exits with status 1 if a benchmark with a budget took longer than its budget.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+
+from . import bench_end_to_end, bench_model, bench_parsing, bench_startup
+
+SUITES = {
+    "model": bench_model,
+    "parsing": bench_parsing,
+    "end_to_end": bench_end_to_end,
+    "startup": bench_startup,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("suites", nargs="*", metavar="suite", help=f"suites to run, all by default ({', '.join(SUITES)})")
+    parser.add_argument("--output", "-o", help="write the results to this file instead of stdout")
+    parser.add_argument("--compare", help="previous results to compare against")
+    args = parser.parse_args(argv)
+    if unknown := set(args.suites).difference(SUITES):
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+
+    results = []
+    for suite in args.suites or SUITES:
+        print(f"Running {suite} benchmarks", file=sys.stderr)
+        results.extend(SUITES[suite].run())
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    over_budget = [result for result in results if "budget" in result and result["median"] > result["budget"]]
+    for result in over_budget:
+        print(f"{result['name']}: {result['median']} {result['unit']} over budget of {result['budget']}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            previous = {result["name"]: result for result in json.load(file)["results"]}
+        for result in results:
+            if (before := previous.get(result["name"])) is not None:
+                print(
+                    f"{result['name']}: {before['median']} -> {result['median']} {result['unit']}"
+                    f" ({result['median']/before['median']:.2f}x)",
+                    file=sys.stderr,
+                )
+
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmarks from a sensor state change to the state write of the vent time entities.
+
+The entities run in a bare Home Assistant core, no integrations are loaded.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import tempfile
+import time
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ventoptimization.const import CONF_CACHE_SIZE, CONF_UPDATE_DELAY
+from custom_components.ventoptimization.sensor import VentTime
+
+from .common import result
+
+ROOM_COUNTS = (1, 50, 500)
+REPEAT = 20
+
+CELSIUS = {"unit_of_measurement": "°C"}
+PERCENT = {"unit_of_measurement": "%"}
+
+# Measure the calculation, not the coalescing window or the result cache
+OPTIONS = {CONF_UPDATE_DELAY: 0, CONF_CACHE_SIZE: 0}
+
+
+async def _async_add_rooms(hass, count, options=OPTIONS):
+    """Add count rooms sharing the outdoor sensors and return their entities."""
+    entities = []
+    hass.states.async_set("sensor.outdoor_temperature", "5", CELSIUS)
+    hass.states.async_set("sensor.outdoor_humidity", "70", PERCENT)
+    for room in range(count):
+        hass.states.async_set(f"sensor.temperature_{room}", str(18 + room % 8), CELSIUS)
+        hass.states.async_set(f"sensor.humidity_{room}", str(60 + room % 35), PERCENT)
+        entity = VentTime(
+            f"Room {room}",
+            f"sensor.temperature_{room}",
+            "sensor.outdoor_temperature",
+            f"sensor.humidity_{room}",
+            "sensor.outdoor_humidity",
+            65,
+            0.75,
+            20 + room % 30,
+            options,
+        )
+        entity.hass = hass
+        entity.entity_id = f"sensor.vent_time_{room}"
+        await entity.async_added_to_hass()
+        entities.append(entity)
+    await hass.async_block_till_done()
+    return entities
+
+
+async def _async_time_writes(hass, change, expected_writes):
+    """Time from applying change until expected_writes vent time states were written."""
+    done = asyncio.Event()
+    writes = 0
+
+    def count_write(event):
+        nonlocal writes
+        if event.data["entity_id"].startswith("sensor.vent_time_"):
+            writes += 1
+            if writes == expected_writes:
+                done.set()
+
+    unsub = hass.bus.async_listen("state_changed", count_write)
+    start = time.perf_counter()
+    change()
+    await asyncio.wait_for(done.wait(), 60)
+    elapsed = time.perf_counter() - start
+    unsub()
+    await hass.async_block_till_done()
+    return elapsed*1e6
+
+
+async def _async_run(count):
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await _async_add_rooms(hass, count)
+
+        outdoor, indoor = [], []
+        for step in range(REPEAT):
+            # Distinct readings, so every step changes every vent time
+            outdoor.append(await _async_time_writes(
+                hass,
+                lambda: hass.states.async_set("sensor.outdoor_temperature", str(5 + (step + 1)*0.1), CELSIUS),
+                count,
+            ))
+            indoor.append(await _async_time_writes(
+                hass,
+                lambda: hass.states.async_set("sensor.humidity_0", str(70 + (step + 1)*0.5), PERCENT),
+                1,
+            ))
+        await hass.async_stop(force=True)
+
+    return [
+        result(f"end_to_end.outdoor_change[{count} rooms]", outdoor, rooms=count),
+        result(f"end_to_end.indoor_change[{count} rooms]", indoor, rooms=count),
+    ]
+
+
+def run():
+    """Run the end to end benchmarks."""
+    # Entities added without a platform warn about it
+    logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+    results = []
+    for count in ROOM_COUNTS:
+        results.extend(asyncio.run(_async_run(count)))
+    return results
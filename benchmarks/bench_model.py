@@ -0,0 +1,125 @@
+"""Benchmarks of the raw vent model."""
+from __future__ import annotations
+
+import numpy as np
+
+from custom_components.ventoptimization.model import (
+    calc_absolute_humidity,
+    calc_e_s,
+    calc_time_to_vent,
+    humidity_exponent,
+    humidity_model,
+    solve_time_to_vent,
+    temperature_exponent,
+    temperature_model,
+    vent_time_percentiles,
+    vent_times,
+)
+
+from .common import measure
+
+ROOM = (0.75, 30, 65) # window size, room volume, wished humidity
+
+# indoor temperature, indoor humidity, outdoor temperature, outdoor humidity
+SCENARIOS = {
+    "typical": (22, 75, 8, 70),
+    # The outdoor air is barely drier, venting never reaches the wished humidity
+    "capped": (20, 90, 19, 85),
+}
+# A room cooler than outside, the solver only starts from the previous solution there
+WARM_START_SCENARIO = (22, 80, 26, 45)
+
+BATCH_SIZE = 10000
+UNCERTAINTY_SAMPLES = 500
+
+
+def minute_scan(indoor_temp, outdoor_temp, indoor_absolute_humidity, outdoor_absolute_humidity, window_size, room_volume, max_hum_allowed):
+    """The linear scan over whole minutes the solver replaced, as a reference"""
+    if indoor_absolute_humidity <= outdoor_absolute_humidity:
+        return 0
+    hum_exponent = humidity_exponent(window_size, room_volume)
+    temp_exponent = temperature_exponent(window_size, room_volume)
+    for i in range(301):
+        absolute_humidity = humidity_model(i, indoor_absolute_humidity, outdoor_absolute_humidity, hum_exponent)
+        if (absolute_humidity/calc_e_s(temperature_model(i, indoor_temp, outdoor_temp, temp_exponent)))*100 <= max_hum_allowed:
+            return i
+    return 300
+
+
+def run():
+    """Run the model benchmarks."""
+    results = [
+        measure("model.calc_e_s", lambda: calc_e_s(21.5), number=100000),
+        measure("model.humidity_model", lambda: humidity_model(12.5, 2000, 800, 0.55), number=100000),
+        measure("model.temperature_model", lambda: temperature_model(12.5, 22, 8, 0.15), number=100000),
+    ]
+
+    for scenario, (indoor_temp, indoor_hum, outdoor_temp, outdoor_hum) in SCENARIOS.items():
+        args = (
+            indoor_temp,
+            outdoor_temp,
+            calc_absolute_humidity(indoor_hum, indoor_temp),
+            calc_absolute_humidity(outdoor_hum, outdoor_temp),
+            *ROOM,
+        )
+        time, evaluations = calc_time_to_vent(*args)
+        results.append(measure(
+            f"model.calc_time_to_vent[{scenario}]",
+            lambda args=args: calc_time_to_vent(*args),
+            number=5000,
+            vent_time=time,
+            evaluations=evaluations,
+        ))
+        results.append(measure(
+            f"reference.minute_scan[{scenario}]",
+            lambda args=args: minute_scan(*args),
+            number=200,
+            vent_time=minute_scan(*args),
+        ))
+
+    # Re-solving after the indoor humidity drifted by a tenth of a percent
+    indoor_temp, indoor_hum, outdoor_temp, outdoor_hum = WARM_START_SCENARIO
+    args = (indoor_temp, outdoor_temp, calc_absolute_humidity(indoor_hum, indoor_temp), calc_absolute_humidity(outdoor_hum, outdoor_temp), *ROOM)
+    drifted = (indoor_temp, outdoor_temp, calc_absolute_humidity(indoor_hum - 0.1, indoor_temp), *args[3:])
+    previous = solve_time_to_vent(*args)
+    solution = solve_time_to_vent(*drifted, previous=previous)
+    cold = solve_time_to_vent(*drifted)
+    assert solution.evaluations < cold.evaluations, "the warm start does not save evaluations"
+    results.append(measure(
+        "model.solve_time_to_vent[cold]",
+        lambda: solve_time_to_vent(*drifted),
+        number=5000,
+        vent_time=cold.time,
+        evaluations=cold.evaluations,
+    ))
+    results.append(measure(
+        "model.solve_time_to_vent[warm]",
+        lambda: solve_time_to_vent(*drifted, previous=previous),
+        number=5000,
+        vent_time=solution.time,
+        evaluations=solution.evaluations,
+    ))
+
+    rng = np.random.default_rng(0)
+    batch = (
+        rng.uniform(15, 30, BATCH_SIZE),
+        rng.uniform(-10, 30, BATCH_SIZE),
+        rng.uniform(40, 100, BATCH_SIZE),
+        rng.uniform(30, 100, BATCH_SIZE),
+        *ROOM,
+    )
+    result = measure("model.vent_times[batch]", lambda: vent_times(*batch), number=1, repeat=5, batch_size=BATCH_SIZE)
+    result["per_scenario_us"] = round(result["median"]/BATCH_SIZE, 4)
+    results.append(result)
+
+    indoor_temp, indoor_hum, outdoor_temp, outdoor_hum = SCENARIOS["typical"]
+    band = (indoor_temp, outdoor_temp, indoor_hum, outdoor_hum, *ROOM, UNCERTAINTY_SAMPLES)
+    results.append(measure(
+        "model.vent_time_percentiles",
+        lambda: vent_time_percentiles(*band),
+        number=20,
+        samples=UNCERTAINTY_SAMPLES,
+        percentiles=vent_time_percentiles(*band).tolist(),
+    ))
+
+    return results
@@ -0,0 +1,23 @@
+"""Benchmarks of parsing sensor states."""
+from __future__ import annotations
+
+from homeassistant.core import State
+
+from custom_components.ventoptimization.parsing import parse_humidity, parse_temperature
+
+from .common import measure
+
+
+def run():
+    """Run the parsing benchmarks."""
+    celsius = State("sensor.temperature", "21.4", {"unit_of_measurement": "°C"})
+    fahrenheit = State("sensor.temperature", "70.5", {"unit_of_measurement": "°F"})
+    humidity = State("sensor.humidity", "63", {"unit_of_measurement": "%"})
+    invalid = State("sensor.humidity", "unavailable", {"unit_of_measurement": "%"})
+
+    return [
+        measure("parsing.parse_temperature[celsius]", lambda: parse_temperature(celsius), number=20000),
+        measure("parsing.parse_temperature[fahrenheit]", lambda: parse_temperature(fahrenheit), number=20000),
+        measure("parsing.parse_humidity", lambda: parse_humidity(humidity), number=20000),
+        measure("parsing.parse_humidity[invalid]", lambda: parse_humidity(invalid), number=20000),
+    ]
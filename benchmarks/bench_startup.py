@@ -0,0 +1,80 @@
+"""Benchmarks of importing the integration, setting up rooms and changing their options.
+
+Every result carries a budget in microseconds, the runner reports results over budget.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ventoptimization.const import CONF_CACHE_SIZE, CONF_MAX_VENT_TIME, CONF_UPDATE_DELAY
+
+from .bench_end_to_end import _async_add_rooms
+from .common import result
+
+ROOM_COUNTS = (1, 50, 500)
+REPEAT = 5
+
+# Home Assistant and its sensor platform are loaded anyway, only the integration counts
+IMPORT_BUDGET = 30000 # us
+# Per room, from adding the entities until all first states are written
+SETUP_BUDGET = 1000 # us
+# Per room, from changing the options until all states are written again
+OPTIONS_BUDGET = 500 # us
+
+OPTIONS = {CONF_UPDATE_DELAY: 0, CONF_CACHE_SIZE: 0}
+
+_IMPORT_SCRIPT = """
+import time
+import homeassistant.components.sensor
+start = time.perf_counter()
+import custom_components.ventoptimization.sensor
+print(time.perf_counter() - start)
+"""
+
+
+def _time_import():
+    """Import the sensor platform in a fresh interpreter and return the time in microseconds."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT], cwd=root, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.split()[-1])*1e6
+
+
+async def _async_run(count):
+    """Time setting up count rooms and changing their options in place."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        start = time.perf_counter()
+        entities = await _async_add_rooms(hass, count, OPTIONS)
+        setup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for entity in entities:
+            entity.async_set_options({**OPTIONS, CONF_MAX_VENT_TIME: 120})
+        await hass.async_block_till_done()
+        options = time.perf_counter() - start
+        await hass.async_stop(force=True)
+    return setup*1e6, options*1e6
+
+
+def run():
+    """Run the startup benchmarks."""
+    # Entities added without a platform warn about it
+    logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+    results = [
+        result("startup.import", [_time_import() for _ in range(REPEAT)], budget=IMPORT_BUDGET),
+    ]
+    for count in ROOM_COUNTS:
+        setup, options = zip(*(asyncio.run(_async_run(count)) for _ in range(REPEAT)))
+        results.append(result(f"startup.setup[{count} rooms]", setup, rooms=count, budget=SETUP_BUDGET*count))
+        results.append(result(f"startup.options[{count} rooms]", options, rooms=count, budget=OPTIONS_BUDGET*count))
+    return results
@@ -0,0 +1,29 @@
+"""Timing helpers shared by the benchmarks."""
+from __future__ import annotations
+
+import statistics
+import time
+
+
+def measure(name, func, number=1000, repeat=5, **info):
+    """Time func and return a result with the per-call time in microseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start)/number*1e6)
+    return result(name, timings, number=number, **info)
+
+
+def result(name, timings, **info):
+    """Summarize timings in microseconds into a machine readable result."""
+    return {
+        "name": name,
+        "unit": "us",
+        "min": round(min(timings), 3),
+        "median": round(statistics.median(timings), 3),
+        "max": round(max(timings), 3),
+        "repeat": len(timings),
+        **info,
+    }
@@ -1,8 +1,50 @@
 """Predicts how long you have to vent given temperature and humidity from inside and outside"""
+from __future__ import annotations
 
-from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from typing import TYPE_CHECKING
+
+# Home Assistant is only imported for type checking, so the HA-free model in this
+# package can be used on its own, e.g. for analysis
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_CALIBRATION,
+    CONF_MAX_ALLOWED_HUMIDITY,
+    CONF_ROOM_VOLUME,
+    CONF_ROOMS,
+    CONF_WINDOW_SIZE,
+    DATA_ENTITIES,
+    DATA_ENTRY_CONFIG,
+    DOMAIN,
+)
+
+PLATFORMS = ["sensor"]
+
+# The running sensors apply these room parameters, other changes of the data set the entry up again
+ROOM_PARAMETERS = (CONF_MAX_ALLOWED_HUMIDITY, CONF_WINDOW_SIZE, CONF_ROOM_VOLUME)
+
+
+def _config_entry_only_config_schema(config: dict) -> dict:
+    """Warn about configuring the integration in YAML, it is set up from the UI only."""
+    import homeassistant.helpers.config_validation as cv
+
+    return cv.config_entry_only_config_schema(DOMAIN)(config)
+
+
+# Validates the YAML configuration passed to async_setup, the helper of Home Assistant
+# is only imported when Home Assistant calls it
+CONFIG_SCHEMA = _config_entry_only_config_schema
+
+
+async def async_setup(hass: HomeAssistant, _config) -> bool:
+    """Register the services not bound to an entity."""
+    # Imported here, importing the package must not load Home Assistant
+    from .compute import async_setup_services
+
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -11,8 +53,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     This function is called by Home Assistant when the integration is set up with the UI.
     """
+    hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ENTRY_CONFIG, {})[entry.entry_id] = _entry_config(entry)
+
     # Forward entry setup for the sensor platform
-    await hass.config_entries.async_forward_entry_setups(entry, [SENSOR_DOMAIN])
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Reload the entry whenever its data or options are updated
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
@@ -23,7 +70,11 @@ async def async_unload_entry(_hass: HomeAssistant, _entry: ConfigEntry) -> bool:
 
     This function is called by Home Assistant when the integration is being removed.
     """
-    return await _hass.config_entries.async_forward_entry_unload(_entry, SENSOR_DOMAIN)
+    unloaded = await _hass.config_entries.async_unload_platforms(_entry, PLATFORMS)
+    if unloaded:
+        _hass.data.get(DOMAIN, {}).get(DATA_ENTITIES, {}).pop(_entry.entry_id, None)
+        _hass.data.get(DOMAIN, {}).get(DATA_ENTRY_CONFIG, {}).pop(_entry.entry_id, None)
+    return unloaded
 
 
 async def async_reload_entry(_hass: HomeAssistant, _entry: ConfigEntry) -> None:
@@ -32,8 +83,36 @@ async def async_reload_entry(_hass: HomeAssistant, _entry: ConfigEntry) -> None:
 
     This function is called by Home Assistant when the integration configuration is updated.
     """
-    # Unload the entry and its dependent components
-    await async_unload_entry(_hass, _entry)
+    entry_configs = _hass.data.get(DOMAIN, {}).get(DATA_ENTRY_CONFIG, {})
+    loaded = entry_configs.get(_entry.entry_id)
+    data, options = entry_configs[_entry.entry_id] = _entry_config(_entry)
+    # The sensor stores its calibration on the entry itself and already calculates with it
+    if loaded == (data, options):
+        return
+
+    # Options and room parameters are applied to the running sensors, other changes of
+    # the rooms need setting up again
+    if loaded is not None and _without_room_parameters(loaded[0]) == _without_room_parameters(data):
+        for entity, room in zip(_hass.data[DOMAIN].get(DATA_ENTITIES, {}).get(_entry.entry_id, []), _rooms(data)):
+            entity.async_set_options(options, room)
+        return
+
+    # Let Home Assistant unload and set up the entry again, so the update listener
+    # registered in async_setup_entry is released together with the platform
+    await _hass.config_entries.async_reload(_entry.entry_id)
+
+
+def _entry_config(entry: ConfigEntry):
+    """Return the data and options of an entry a reload has to apply"""
+    return {key: value for key, value in entry.data.items() if key != CONF_CALIBRATION}, dict(entry.options)
+
+
+def _rooms(data: dict) -> list[dict]:
+    """Return the rooms in the data of an entry in the order their sensors are set up"""
+    return data[CONF_ROOMS] if CONF_ROOMS in data else [data]
+
 
-    # Set up the entry again
-    await async_setup_entry(_hass, _entry)
+def _without_room_parameters(data: dict):
+    """Return the rooms in the data of an entry without the parameters applied in place"""
+    rooms = [{key: value for key, value in room.items() if key not in ROOM_PARAMETERS} for room in _rooms(data)]
+    return {**data, CONF_ROOMS: rooms} if CONF_ROOMS in data else rooms[0]
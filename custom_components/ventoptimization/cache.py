@@ -0,0 +1,124 @@
+"""Memoizes results of the vent model for recently seen inputs."""
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN
+from .model import INPUT_DECIMALS, calc_e_s
+
+DATA_VENT_TIME_CACHES = "vent_time_caches"
+
+SATURATION_PRESSURE_CACHE_SIZE = 1024
+
+
+class LRUCache:
+    """A bounded mapping that evicts the least recently used entry and counts hits and misses."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Return the value for key and mark it as recently used."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        """Store a value, evicting the least recently used entry if the cache is full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> dict:
+        """Return the size and the hit and miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits/lookups, 3) if lookups else None,
+        }
+
+
+_saturation_pressures = LRUCache(SATURATION_PRESSURE_CACHE_SIZE)
+
+
+def cached_e_s(temp):
+    """Calculate the saturation vapour pressure, memoized on the rounded temperature"""
+    key = round(temp, INPUT_DECIMALS)
+    if (e_s := _saturation_pressures.get(key)) is None:
+        e_s = calc_e_s(key)
+        _saturation_pressures.put(key, e_s)
+    return e_s
+
+
+def saturation_pressure_cache_stats() -> dict:
+    """Return the counters of the saturation vapour pressure cache."""
+    return _saturation_pressures.stats
+
+
+def vent_time_key(indoor_temp, indoor_hum, outdoor_temp, outdoor_hum):
+    """Quantize the sensor readings into a cache key"""
+    return (
+        round(indoor_temp, INPUT_DECIMALS),
+        round(indoor_hum, INPUT_DECIMALS),
+        round(outdoor_temp, INPUT_DECIMALS),
+        round(outdoor_hum, INPUT_DECIMALS),
+    )
+
+
+class VentTimeCache(LRUCache):
+    """Vent times of all rooms sharing the same room parameters, keyed on their readings."""
+
+    def __init__(self, hass: HomeAssistant, room_key: tuple, maxsize: int) -> None:
+        """Initialize the cache."""
+        super().__init__(maxsize)
+        self.hass = hass
+        self.room_key = room_key
+        self._users = 0
+
+    @classmethod
+    @callback
+    def async_get(cls, hass: HomeAssistant, room_key: tuple, maxsize: int) -> VentTimeCache:
+        """Return the cache for the room parameters, creating it if necessary."""
+        caches = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_VENT_TIME_CACHES, {})
+        if (cache := caches.get(room_key)) is None:
+            cache = caches[room_key] = cls(hass, room_key, maxsize)
+        cache.maxsize = max(cache.maxsize, maxsize)
+        return cache
+
+    @callback
+    def async_acquire(self) -> CALLBACK_TYPE:
+        """Register a user of the cache and return a callback releasing it."""
+        self._users += 1
+
+        @callback
+        def release() -> None:
+            self._users -= 1
+            if not self._users:
+                self.hass.data[DOMAIN][DATA_VENT_TIME_CACHES].pop(self.room_key, None)
+
+        return release
@@ -0,0 +1,201 @@
+"""Fits the model constants of a room to observed venting episodes.
+
+Both models decay like (time+1)**-exponent, so the logarithm of the remaining fraction of
+the initial difference to the outside is proportional to log(time+1). A least squares
+fit through the origin only needs the sums of x*x and x*y, which are collected per
+episode. The exponents only determine the ratios k_1/k_2 and k_3/k_4, so k_2 and k_4
+keep their defaults and k_1 and k_3 are fitted.
+
+While the window is open the DecayTracker collects the same sums sample by sample and
+predicts the remaining vent time from the decay measured so far.
+"""
+from __future__ import annotations
+
+from collections import deque
+import math
+from typing import NamedTuple
+
+from .model import DEFAULT_CONSTANTS, ModelConstants, Solution, solve_time_to_vent
+
+# Episodes kept for the fit, older ones are forgotten so the fit follows changes of the room
+CALIBRATION_MAX_EPISODES = 20
+# Samples kept per episode, later samples of a long episode are dropped
+CALIBRATION_MAX_SAMPLES = 2000
+CALIBRATION_MIN_EPISODES = 3
+
+# Episodes starting closer to the outside carry mostly sensor noise
+MIN_HUMIDITY_DIFFERENCE = 100 # Pa
+MIN_TEMP_DIFFERENCE = 2 # °C
+# Fractions of the initial difference outside of this range are dominated by noise
+MIN_FRACTION = 0.05
+MAX_FRACTION = 1.0
+
+
+class EpisodeStats(NamedTuple):
+    """Sums of one venting episode for the least squares fit."""
+
+    humidity_xx: float
+    humidity_xy: float
+    temp_xx: float
+    temp_xy: float
+    samples: int
+
+
+def _decay_sums(log_time, indoor, outdoor):
+    """Return the sums of x*x and x*y of the samples usable for the fit of one model"""
+    import numpy as np
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = (indoor - outdoor)/(indoor[0] - outdoor)
+        usable = (log_time > 0) & (fraction > MIN_FRACTION) & (fraction < MAX_FRACTION)
+        x = log_time[usable]
+        y = np.log(fraction[usable])
+    return float(x @ x), float(x @ y)
+
+
+def episode_stats(time, indoor_temp, indoor_absolute_humidity, outdoor_temp, outdoor_absolute_humidity):
+    """Calculate the sums of one episode from arrays of its samples.
+
+    Takes the minutes since the window was opened with the readings at that time. Returns
+    None if the episode tells nothing about the room. Runs in the executor.
+    """
+    import numpy as np
+
+    time, indoor_temp, indoor_ah, outdoor_temp, outdoor_ah = (
+        np.asarray(array, dtype=float)[:CALIBRATION_MAX_SAMPLES]
+        for array in (time, indoor_temp, indoor_absolute_humidity, outdoor_temp, outdoor_absolute_humidity)
+    )
+    log_time = np.log(time + 1)
+
+    humidity_xx = humidity_xy = temp_xx = temp_xy = 0.0
+    if indoor_ah[0] - outdoor_ah[0] >= MIN_HUMIDITY_DIFFERENCE:
+        humidity_xx, humidity_xy = _decay_sums(log_time, indoor_ah, outdoor_ah)
+    if abs(indoor_temp[0] - outdoor_temp[0]) >= MIN_TEMP_DIFFERENCE:
+        temp_xx, temp_xy = _decay_sums(log_time, indoor_temp, outdoor_temp)
+
+    if not (humidity_xx or temp_xx):
+        return None
+    return EpisodeStats(humidity_xx, humidity_xy, temp_xx, temp_xy, int(time.size))
+
+
+def _fitted_constants(humidity_xx, humidity_xy, temp_xx, temp_xy, window_size, room_volume, base):
+    """Return base with k_1 and k_3 fitted to the sums of the samples"""
+    k_1, k_3 = base.k_1, base.k_3
+    # The models decay with exponent k_1*w/(k_2*V) and k_3*w/(k_4*V)
+    if humidity_xx > 0 and humidity_xy < 0:
+        k_1 = -humidity_xy/humidity_xx*base.k_2*room_volume/window_size
+    if temp_xx > 0 and temp_xy < 0:
+        k_3 = -temp_xy/temp_xx*base.k_4*room_volume/window_size
+    return base._replace(k_1=k_1, k_3=k_3)
+
+
+class Calibration:
+    """Ring buffer of the sums of recent episodes together with their running totals."""
+
+    def __init__(self, episodes=()) -> None:
+        """Initialize the calibration from stored episodes."""
+        self._episodes: deque[EpisodeStats] = deque(maxlen=CALIBRATION_MAX_EPISODES)
+        self._totals = [0.0]*4
+        for episode in episodes:
+            self.add(EpisodeStats(*episode))
+
+    def __len__(self) -> int:
+        return len(self._episodes)
+
+    def add(self, episode: EpisodeStats) -> None:
+        """Add an episode, forgetting the oldest one if the buffer is full."""
+        if len(self._episodes) == self._episodes.maxlen:
+            self._totals = [total - value for total, value in zip(self._totals, self._episodes[0])]
+        self._episodes.append(episode)
+        self._totals = [total + value for total, value in zip(self._totals, episode)]
+
+    def constants(self, window_size, room_volume, base: ModelConstants = DEFAULT_CONSTANTS) -> ModelConstants:
+        """Return the constants fitted to the episodes, base until there are enough of them."""
+        if len(self._episodes) < CALIBRATION_MIN_EPISODES:
+            return base
+        return _fitted_constants(*self._totals, window_size, room_volume, base)
+
+    def as_list(self) -> list:
+        """Return the episodes for storing them."""
+        return [list(episode) for episode in self._episodes]
+
+
+class DecayTracker:
+    """Fits the decay of a running venting episode one sample at a time.
+
+    Only the sums of the fit are kept, so the memory stays constant however long the
+    window is open. The first sample holds the readings when the window was opened.
+    """
+
+    def __init__(self, window_size, room_volume, max_hum_allowed, max_vent_time, constants: ModelConstants) -> None:
+        """Initialize the tracker with the room and the constants to start from."""
+        self._room = (window_size, room_volume, max_hum_allowed, max_vent_time)
+        self._base = constants
+        self._sums = [0.0]*4
+        self._start = None
+        self._outdoor = None
+        # Whether the readings started far enough from the outside to fit the models
+        self._fit_humidity = self._fit_temp = False
+        self.samples = 0
+        # Total vent time since opening for the current fit, None after a new sample
+        self._vent_time = None
+        self._solution: Solution | None = None
+
+    def add(self, time, indoor_temp, indoor_absolute_humidity, outdoor_temp, outdoor_absolute_humidity) -> None:
+        """Add the readings taken time minutes after the window was opened."""
+        if self._start is None:
+            self._start = (indoor_temp, indoor_absolute_humidity)
+            self._fit_humidity = indoor_absolute_humidity - outdoor_absolute_humidity >= MIN_HUMIDITY_DIFFERENCE
+            self._fit_temp = abs(indoor_temp - outdoor_temp) >= MIN_TEMP_DIFFERENCE
+        start_temp, start_absolute_humidity = self._start
+
+        if (log_time := math.log(time + 1)) > 0:
+            if self._fit_humidity:
+                self._add_decay(0, log_time, indoor_absolute_humidity, start_absolute_humidity, outdoor_absolute_humidity)
+            if self._fit_temp:
+                self._add_decay(2, log_time, indoor_temp, start_temp, outdoor_temp)
+        self._outdoor = (outdoor_temp, outdoor_absolute_humidity)
+        self.samples += 1
+        self._vent_time = None
+
+    def _add_decay(self, index, log_time, value, start, outdoor):
+        if (difference := start - outdoor) == 0:
+            return
+        fraction = (value - outdoor)/difference
+        if MIN_FRACTION < fraction < MAX_FRACTION:
+            self._sums[index] += log_time*log_time
+            self._sums[index + 1] += log_time*math.log(fraction)
+
+    @property
+    def constants(self) -> ModelConstants:
+        """Return the constants fitted to the episode so far."""
+        return _fitted_constants(*self._sums, *self._room[:2], self._base)
+
+    @property
+    def episode_stats(self) -> EpisodeStats | None:
+        """Return the sums of the episode for the calibration, None if it tells nothing about the room."""
+        if not (self._sums[0] or self._sums[2]):
+            return None
+        return EpisodeStats(*self._sums, self.samples)
+
+    def remaining_time(self, time):
+        """Return the vent time left time minutes after the window was opened."""
+        if self._vent_time is None:
+            start_temp, start_absolute_humidity = self._start
+            outdoor_temp, outdoor_absolute_humidity = self._outdoor
+            window_size, room_volume, max_hum_allowed, max_vent_time = self._room
+            # The fit changes little from sample to sample, the solver starts from its last answer
+            self._solution = solve_time_to_vent(
+                start_temp,
+                outdoor_temp,
+                start_absolute_humidity,
+                outdoor_absolute_humidity,
+                window_size,
+                room_volume,
+                max_hum_allowed,
+                max_vent_time,
+                self.constants,
+                previous=self._solution,
+            )
+            self._vent_time = self._solution.time
+        return max(0.0, self._vent_time - time)
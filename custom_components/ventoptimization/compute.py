@@ -0,0 +1,151 @@
+"""The compute service calculating vent times for hypothetical inputs."""
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .cache import LRUCache, cached_e_s, vent_time_key
+from .const import (
+    CONF_MAX_ALLOWED_HUMIDITY,
+    CONF_MAX_VENT_TIME,
+    CONF_ROOM_VOLUME,
+    CONF_WINDOW_SIZE,
+    DEFAULT_MAX_VENT_TIME,
+    DOMAIN,
+)
+from .model import DEFAULT_CONSTANTS, ModelConstants, calc_time_to_vent_batch
+from .sensor import VentTime
+
+SERVICE_COMPUTE = "compute"
+DATA_COMPUTE_CACHE = "compute_cache"
+
+ATTR_SCENARIOS = "scenarios"
+ATTR_RESULTS = "results"
+ATTR_VENT_TIME = "vent_time"
+ATTR_INDOOR_TEMP = "indoor_temp"
+ATTR_INDOOR_HUMIDITY = "indoor_humidity"
+ATTR_OUTDOOR_TEMP = "outdoor_temp"
+ATTR_OUTDOOR_HUMIDITY = "outdoor_humidity"
+
+# Dashboards ask for the same few scenarios over and over
+COMPUTE_CACHE_SIZE = 1024
+
+# The inputs of a scenario in the order of the arguments of the model
+INPUTS = (
+    ATTR_INDOOR_TEMP,
+    ATTR_INDOOR_HUMIDITY,
+    ATTR_OUTDOOR_TEMP,
+    ATTR_OUTDOOR_HUMIDITY,
+    CONF_WINDOW_SIZE,
+    CONF_ROOM_VOLUME,
+    CONF_MAX_ALLOWED_HUMIDITY,
+    CONF_MAX_VENT_TIME,
+)
+
+_HUMIDITY = vol.All(vol.Coerce(float), vol.Range(min=0, max=100))
+
+SCENARIO_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
+    vol.Optional(ATTR_INDOOR_TEMP): vol.Coerce(float),
+    vol.Optional(ATTR_INDOOR_HUMIDITY): _HUMIDITY,
+    vol.Optional(ATTR_OUTDOOR_TEMP): vol.Coerce(float),
+    vol.Optional(ATTR_OUTDOOR_HUMIDITY): _HUMIDITY,
+    vol.Optional(CONF_WINDOW_SIZE): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+    vol.Optional(CONF_ROOM_VOLUME): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+    vol.Optional(CONF_MAX_ALLOWED_HUMIDITY): _HUMIDITY,
+    vol.Optional(CONF_MAX_VENT_TIME): vol.All(vol.Coerce(float), vol.Range(min=1)),
+})
+
+SERVICE_SCHEMA = vol.Schema({
+    # The room every scenario starts from unless it names its own
+    vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
+    vol.Required(ATTR_SCENARIOS): vol.All(cv.ensure_list, vol.Length(min=1), [SCENARIO_SCHEMA]),
+})
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the compute service."""
+    if hass.services.has_service(DOMAIN, SERVICE_COMPUTE):
+        return
+
+    async def async_compute(call: ServiceCall) -> ServiceResponse:
+        return {ATTR_RESULTS: compute(hass, call.data)}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_COMPUTE, async_compute, schema=SERVICE_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
+
+
+def compute_cache(hass: HomeAssistant) -> LRUCache:
+    """Return the cache of the compute service, creating it if necessary."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (cache := data.get(DATA_COMPUTE_CACHE)) is None:
+        cache = data[DATA_COMPUTE_CACHE] = LRUCache(COMPUTE_CACHE_SIZE)
+    return cache
+
+
+def compute(hass: HomeAssistant, data: dict) -> list[dict]:
+    """Calculate the vent times of the scenarios, the ones not cached in one batch."""
+    scenarios = [_resolve(hass, index, scenario, data.get(ATTR_ENTITY_ID)) for index, scenario in enumerate(data[ATTR_SCENARIOS])]
+    cache = compute_cache(hass)
+
+    keys = [(vent_time_key(*inputs[:4]), *inputs[4:], constants) for inputs, constants in scenarios]
+    # Each distinct scenario is looked up and calculated once
+    times = {key: cache.get(key) for key in dict.fromkeys(keys)}
+    if misses := {key: scenarios[index] for index, key in enumerate(keys) if times[key] is None}:
+        import numpy as np
+
+        (
+            indoor_temp,
+            indoor_hum,
+            outdoor_temp,
+            outdoor_hum,
+            window_size,
+            room_volume,
+            max_hum_allowed,
+            max_vent_time,
+        ) = np.array([inputs for inputs, _ in misses.values()]).T
+        # The absolute humidities like the sensor calculates them
+        indoor_absolute_humidity = [hum/100*cached_e_s(temp) for hum, temp in zip(indoor_hum.tolist(), indoor_temp.tolist())]
+        outdoor_absolute_humidity = [hum/100*cached_e_s(temp) for hum, temp in zip(outdoor_hum.tolist(), outdoor_temp.tolist())]
+        batch = calc_time_to_vent_batch(
+            indoor_temp,
+            outdoor_temp,
+            indoor_absolute_humidity,
+            outdoor_absolute_humidity,
+            window_size,
+            room_volume,
+            max_hum_allowed,
+            max_vent_time,
+            ModelConstants(*np.array([constants for _, constants in misses.values()]).T),
+        )
+        for key, time in zip(misses, batch.tolist()):
+            times[key] = round(time, 2)
+            cache.put(key, times[key])
+
+    return [
+        {**dict(zip(INPUTS, inputs)), ATTR_VENT_TIME: times[key]}
+        for (inputs, _), key in zip(scenarios, keys)
+    ]
+
+
+def _resolve(hass, index, scenario, entity_id):
+    """Return the inputs of a scenario filled up from its room and the constants of the room"""
+    base = {CONF_MAX_VENT_TIME: DEFAULT_MAX_VENT_TIME}
+    constants = DEFAULT_CONSTANTS
+    if (entity_id := scenario.get(ATTR_ENTITY_ID, entity_id)) is not None:
+        component = hass.data.get(SENSOR_DOMAIN)
+        entity = component.get_entity(entity_id) if component is not None else None
+        if not isinstance(entity, VentTime):
+            raise ServiceValidationError(f"Scenario {index}: {entity_id} is no vent time sensor")
+        base, constants = entity.scenario_base
+    inputs = [scenario.get(key, base.get(key)) for key in INPUTS]
+    if missing := [key for key, value in zip(INPUTS, inputs) if value is None]:
+        raise ServiceValidationError(f"Scenario {index} is missing {', '.join(missing)}")
+    return inputs, constants
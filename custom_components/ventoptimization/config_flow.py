@@ -2,8 +2,18 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.components.sensor import SensorDeviceClass
-from homeassistant.const import CONF_NAME, PERCENTAGE, UnitOfArea, UnitOfVolume
+from homeassistant.const import (
+    CONF_NAME,
+    PERCENTAGE,
+    UnitOfArea,
+    UnitOfPressure,
+    UnitOfTemperature,
+    UnitOfTime,
+    UnitOfVolume,
+)
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
 
@@ -17,17 +27,27 @@ class VentOptimizationFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     def __init__(self, *args, **kwargs):
         self._name = DEFAULT_NAME
+        self._room_name = None
         self._indoor_temp = None
         self._outdoor_temp = None
         self._indoor_humidity = None
         self._outdoor_humidity = None
+        self._window_sensor = None
+        self._weather_entity = None
         self._window_size = 0.75
         self._room_volume = 30
         self._max_allowed_humidity = 65
+        self._surface_factor = None
         self._existing_entry: ConfigEntry | None = None
+        # Rooms of a building entered so far and those of the reconfigured building
+        self._rooms = []
+        self._existing_rooms = []
         super().__init__(*args, **kwargs)
 
     async def async_step_user(self, _user_input=None) -> FlowResult:
+        return self.async_show_menu(step_id="user", menu_options=["room", "building"])
+
+    async def async_step_room(self, _user_input=None) -> FlowResult:
         if _user_input is not None:
             await self.async_set_unique_id(
                 _user_input[CONF_NAME].lower().replace(" ", "_")
@@ -35,57 +55,256 @@ class VentOptimizationFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             if self._existing_entry is None:
                 self._abort_if_unique_id_configured()
             else:
+                # The update listener reloads the entry
                 self.hass.config_entries.async_update_entry(
-                    self._existing_entry, data=_user_input
-                )
-                self.hass.async_create_task(
-                    self.hass.config_entries.async_reload(self._existing_entry.entry_id)
+                    self._existing_entry, data=self._with_calibrations(_user_input)
                 )
                 return self.async_abort(reason="reconfigure_successful")
             return self.async_create_entry(
                 title=_user_input[CONF_NAME], data=_user_input
             )
 
-        humidity_entity_selector = selector.EntitySelector(
-            selector.EntitySelectorConfig(device_class=SensorDeviceClass.HUMIDITY)
+        return self.async_show_form(
+            step_id="room",
+            data_schema=vol.Schema({
+                vol.Required(CONF_NAME, default=self._name): str,
+                vol.Required(CONF_INDOOR_TEMP, default=self._indoor_temp): _temperature_entity_selector(),
+                vol.Required(CONF_OUTDOOR_TEMP, default=self._outdoor_temp): _temperature_entity_selector(),
+                vol.Required(CONF_INDOOR_HUMIDITY, default=self._indoor_humidity): _humidity_entity_selector(),
+                vol.Required(CONF_OUTDOOR_HUMIDITY, default=self._outdoor_humidity): _humidity_entity_selector(),
+                **self._weather_entity_schema(),
+                **self._window_sensor_schema(),
+                **self._room_parameters_schema(),
+            }),
         )
 
-        temperature_entity_selector = selector.EntitySelector(
-            selector.EntitySelectorConfig(device_class=SensorDeviceClass.TEMPERATURE)
-        )
+    def _with_calibrations(self, data: dict) -> dict:
+        """Return the data of the reconfigured entry with the calibrations of the rooms still in it."""
+        # The sensors store the calibrations by the name of the room
+        names = {str(room.get(CONF_NAME, DEFAULT_NAME)).lower() for room in data.get(CONF_ROOMS, [data])}
+        calibrations = {
+            name: episodes
+            for name, episodes in self._existing_entry.data.get(CONF_CALIBRATION, {}).items()
+            if name in names
+        }
+        return {**data, CONF_CALIBRATION: calibrations} if calibrations else data
+
+    async def async_step_building(self, _user_input=None) -> FlowResult:
+        """Enter the name and the shared outdoor sensors of a building."""
+        if _user_input is not None:
+            self._name = _user_input[CONF_NAME]
+            self._outdoor_temp = _user_input[CONF_OUTDOOR_TEMP]
+            self._outdoor_humidity = _user_input[CONF_OUTDOOR_HUMIDITY]
+            self._weather_entity = _user_input.get(CONF_WEATHER_ENTITY)
+            await self.async_set_unique_id(self._name.lower().replace(" ", "_"))
+            if self._existing_entry is None:
+                self._abort_if_unique_id_configured()
+            self._rooms = []
+            self._load_existing_room()
+            return await self.async_step_building_room()
 
         return self.async_show_form(
-            step_id="user",
+            step_id="building",
             data_schema=vol.Schema({
                 vol.Required(CONF_NAME, default=self._name): str,
-                vol.Required(CONF_INDOOR_TEMP, default=self._indoor_temp): temperature_entity_selector,
-                vol.Required(CONF_OUTDOOR_TEMP, default=self._outdoor_temp): temperature_entity_selector,
-                vol.Required(CONF_INDOOR_HUMIDITY, default=self._indoor_humidity): humidity_entity_selector,
-                vol.Required(CONF_OUTDOOR_HUMIDITY, default=self._outdoor_humidity): humidity_entity_selector,
-                vol.Optional(CONF_WINDOW_SIZE, default=self._window_size): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0, max=10, step=0.1, unit_of_measurement=UnitOfArea.SQUARE_METERS)
-                ),
-                vol.Optional(CONF_ROOM_VOLUME, default=self._room_volume): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0, max=100, step=0.1, unit_of_measurement=UnitOfVolume.CUBIC_METERS)
-                ),
-                vol.Optional(CONF_MAX_ALLOWED_HUMIDITY, default=self._max_allowed_humidity): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=1, max=100, step=1, unit_of_measurement=PERCENTAGE)
-                ),
+                vol.Required(CONF_OUTDOOR_TEMP, default=self._outdoor_temp): _temperature_entity_selector(),
+                vol.Required(CONF_OUTDOOR_HUMIDITY, default=self._outdoor_humidity): _humidity_entity_selector(),
+                **self._weather_entity_schema(),
             }),
         )
 
+    async def async_step_building_room(self, _user_input=None) -> FlowResult:
+        """Enter the rooms of a building one after the other."""
+        if _user_input is not None:
+            add_another = _user_input.pop(CONF_ADD_ANOTHER_ROOM)
+            self._rooms.append(_user_input)
+            if add_another:
+                self._load_existing_room()
+                return await self.async_step_building_room()
+
+            data = {
+                CONF_NAME: self._name,
+                CONF_OUTDOOR_TEMP: self._outdoor_temp,
+                CONF_OUTDOOR_HUMIDITY: self._outdoor_humidity,
+                CONF_ROOMS: self._rooms,
+            }
+            if self._weather_entity is not None:
+                data[CONF_WEATHER_ENTITY] = self._weather_entity
+            if self._existing_entry is not None:
+                # The update listener reloads the entry
+                self.hass.config_entries.async_update_entry(self._existing_entry, data=self._with_calibrations(data))
+                return self.async_abort(reason="reconfigure_successful")
+            return self.async_create_entry(title=self._name, data=data)
+
+        return self.async_show_form(
+            step_id="building_room",
+            data_schema=vol.Schema({
+                vol.Required(CONF_NAME, default=self._room_name): str,
+                vol.Required(CONF_INDOOR_TEMP, default=self._indoor_temp): _temperature_entity_selector(),
+                vol.Required(CONF_INDOOR_HUMIDITY, default=self._indoor_humidity): _humidity_entity_selector(),
+                **self._window_sensor_schema(),
+                **self._room_parameters_schema(),
+                vol.Optional(CONF_ADD_ANOTHER_ROOM, default=bool(self._existing_rooms)): selector.BooleanSelector(),
+            }),
+            description_placeholders={"rooms": str(len(self._rooms))},
+        )
+
+    def _load_existing_room(self):
+        """Take the next room of the reconfigured building as defaults of the room form."""
+        room = self._existing_rooms.pop(0) if self._existing_rooms else {}
+        self._room_name = room.get(CONF_NAME)
+        self._indoor_temp = room.get(CONF_INDOOR_TEMP)
+        self._indoor_humidity = room.get(CONF_INDOOR_HUMIDITY)
+        self._window_sensor = room.get(CONF_WINDOW_SENSOR)
+        self._window_size = room.get(CONF_WINDOW_SIZE, 0.75)
+        self._room_volume = room.get(CONF_ROOM_VOLUME, 30)
+        self._max_allowed_humidity = room.get(CONF_MAX_ALLOWED_HUMIDITY, 65)
+        self._surface_factor = room.get(CONF_SURFACE_FACTOR)
+
+    def _window_sensor_schema(self):
+        # The sensor is optional, a default would make it impossible to remove it again
+        return {
+            vol.Optional(CONF_WINDOW_SENSOR, description={"suggested_value": self._window_sensor}): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="binary_sensor",
+                    device_class=[BinarySensorDeviceClass.WINDOW, BinarySensorDeviceClass.DOOR, BinarySensorDeviceClass.OPENING],
+                )
+            ),
+        }
+
+    def _weather_entity_schema(self):
+        return {
+            vol.Optional(CONF_WEATHER_ENTITY, description={"suggested_value": self._weather_entity}): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="weather")
+            ),
+        }
+
+    def _room_parameters_schema(self):
+        return {
+            vol.Optional(CONF_WINDOW_SIZE, default=self._window_size): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0, max=10, step=0.1, unit_of_measurement=UnitOfArea.SQUARE_METERS)
+            ),
+            vol.Optional(CONF_ROOM_VOLUME, default=self._room_volume): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0, max=100, step=0.1, unit_of_measurement=UnitOfVolume.CUBIC_METERS)
+            ),
+            vol.Optional(CONF_MAX_ALLOWED_HUMIDITY, default=self._max_allowed_humidity): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=1, max=100, step=1, unit_of_measurement=PERCENTAGE)
+            ),
+            # Optional like the window sensor, only rooms with a factor get a mold risk sensor
+            vol.Optional(CONF_SURFACE_FACTOR, description={"suggested_value": self._surface_factor}): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=1, max=10, step=0.01, mode=selector.NumberSelectorMode.BOX)
+            ),
+        }
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        return VentOptimizationOptionsFlowHandler(config_entry)
+
     async def async_step_reconfigure(self, _user_input: dict[str, Any] | None = None) -> FlowResult:
         self._existing_entry = self.hass.config_entries.async_get_entry(
             self.context["entry_id"]
         )
         assert self._existing_entry is not None
+        if CONF_ROOMS in self._existing_entry.data:
+            if _user_input is None:
+                self._name = self._existing_entry.data[CONF_NAME]
+                self._outdoor_temp = self._existing_entry.data[CONF_OUTDOOR_TEMP]
+                self._outdoor_humidity = self._existing_entry.data[CONF_OUTDOOR_HUMIDITY]
+                self._weather_entity = self._existing_entry.data.get(CONF_WEATHER_ENTITY)
+                self._existing_rooms = list(self._existing_entry.data[CONF_ROOMS])
+            return await self.async_step_building(_user_input)
+
         if _user_input is None:
             self._name = self._existing_entry.data.get(CONF_NAME, self._indoor_temp)
             self._indoor_temp = self._existing_entry.data.get(CONF_INDOOR_TEMP, self._indoor_temp)
             self._outdoor_temp = self._existing_entry.data.get(CONF_OUTDOOR_TEMP, self._outdoor_temp)
             self._indoor_humidity = self._existing_entry.data.get(CONF_INDOOR_HUMIDITY, self._indoor_humidity)
             self._outdoor_humidity = self._existing_entry.data.get(CONF_OUTDOOR_HUMIDITY, self._outdoor_humidity)
+            self._window_sensor = self._existing_entry.data.get(CONF_WINDOW_SENSOR)
+            self._weather_entity = self._existing_entry.data.get(CONF_WEATHER_ENTITY)
             self._window_size = self._existing_entry.data.get(CONF_WINDOW_SIZE, self._window_size)
             self._room_volume = self._existing_entry.data.get(CONF_ROOM_VOLUME, self._room_volume)
             self._max_allowed_humidity = self._existing_entry.data.get(CONF_MAX_ALLOWED_HUMIDITY, self._max_allowed_humidity)
-        return await self.async_step_user(_user_input)
+            self._surface_factor = self._existing_entry.data.get(CONF_SURFACE_FACTOR)
+        return await self.async_step_room(_user_input)
+
+
+def _temperature_entity_selector():
+    return selector.EntitySelector(
+        selector.EntitySelectorConfig(device_class=SensorDeviceClass.TEMPERATURE)
+    )
+
+
+def _humidity_entity_selector():
+    return selector.EntitySelector(
+        selector.EntitySelectorConfig(device_class=SensorDeviceClass.HUMIDITY)
+    )
+
+
+class VentOptimizationOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self.config_entry = config_entry
+
+    async def async_step_init(self, _user_input: dict[str, Any] | None = None) -> FlowResult:
+        if _user_input is not None:
+            return self.async_create_entry(title="", data=_user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Optional(CONF_MAX_VENT_TIME, default=options.get(CONF_MAX_VENT_TIME, DEFAULT_MAX_VENT_TIME)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=1, max=1440, step=1, unit_of_measurement=UnitOfTime.MINUTES)
+                ),
+                vol.Optional(CONF_UPDATE_DELAY, default=options.get(CONF_UPDATE_DELAY, DEFAULT_UPDATE_DELAY)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=60, step=0.1, unit_of_measurement=UnitOfTime.SECONDS)
+                ),
+                vol.Optional(CONF_TEMP_DEADBAND, default=options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=5, step=0.05, unit_of_measurement=UnitOfTemperature.CELSIUS)
+                ),
+                vol.Optional(CONF_HUMIDITY_DEADBAND, default=options.get(CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=10, step=0.1, unit_of_measurement=PERCENTAGE)
+                ),
+                vol.Optional(CONF_CACHE_SIZE, default=options.get(CONF_CACHE_SIZE, DEFAULT_CACHE_SIZE)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=10000, step=1, mode=selector.NumberSelectorMode.BOX)
+                ),
+                vol.Optional(CONF_TABLE_MODE, default=options.get(CONF_TABLE_MODE, DEFAULT_TABLE_MODE)): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_PERFORMANCE_STATS, default=options.get(CONF_PERFORMANCE_STATS, DEFAULT_PERFORMANCE_STATS)
+                ): selector.BooleanSelector(),
+                vol.Optional(CONF_FORECAST_RESOLUTION, default=options.get(CONF_FORECAST_RESOLUTION, DEFAULT_FORECAST_RESOLUTION)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=60, step=1, unit_of_measurement=UnitOfTime.MINUTES)
+                ),
+                vol.Optional(CONF_UNCERTAINTY_SAMPLES, default=options.get(CONF_UNCERTAINTY_SAMPLES, DEFAULT_UNCERTAINTY_SAMPLES)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=5000, step=100, mode=selector.NumberSelectorMode.BOX)
+                ),
+                vol.Optional(CONF_PLANNING_HORIZON, default=options.get(CONF_PLANNING_HORIZON, DEFAULT_PLANNING_HORIZON)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=1, max=48, step=1, unit_of_measurement=UnitOfTime.HOURS)
+                ),
+                vol.Optional(CONF_TRACKING_INTERVAL, default=options.get(CONF_TRACKING_INTERVAL, DEFAULT_TRACKING_INTERVAL)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=1, max=300, step=1, unit_of_measurement=UnitOfTime.SECONDS)
+                ),
+                vol.Optional(CONF_MAX_UPDATE_INTERVAL, default=options.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=3600, step=1, unit_of_measurement=UnitOfTime.SECONDS)
+                ),
+                vol.Optional(CONF_STALE_AFTER, default=options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=1440, step=1, unit_of_measurement=UnitOfTime.MINUTES)
+                ),
+                vol.Optional(CONF_STATE_TOLERANCE, default=options.get(CONF_STATE_TOLERANCE, DEFAULT_STATE_TOLERANCE)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=30, step=0.1, unit_of_measurement=UnitOfTime.MINUTES)
+                ),
+                vol.Optional(CONF_ATTRIBUTE_TOLERANCE, default=options.get(CONF_ATTRIBUTE_TOLERANCE, DEFAULT_ATTRIBUTE_TOLERANCE)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=100, step=1, unit_of_measurement=UnitOfPressure.PA)
+                ),
+                vol.Optional(CONF_HEARTBEAT, default=options.get(CONF_HEARTBEAT, DEFAULT_HEARTBEAT)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=1, max=1440, step=1, unit_of_measurement=UnitOfTime.MINUTES)
+                ),
+                vol.Optional(
+                    CONF_RECORD_ABSOLUTE_HUMIDITY,
+                    default=options.get(CONF_RECORD_ABSOLUTE_HUMIDITY, DEFAULT_RECORD_ABSOLUTE_HUMIDITY),
+                ): selector.BooleanSelector(),
+            }),
+        )
@@ -6,8 +6,63 @@ DEFAULT_NAME = "Vent Optimization Time"
 CONF_ROOM_VOLUME = "room_volume"
 CONF_WINDOW_SIZE = "total_open_window_surface"
 CONF_MAX_ALLOWED_HUMIDITY = "maximum_wished_humidity"
+# Optional, (indoor - outdoor)/(surface - outdoor) temperature of the coldest surface for the mold risk
+CONF_SURFACE_FACTOR = "surface_temperature_factor"
 
 CONF_INDOOR_TEMP = "indoor_temp_sensor"
 CONF_OUTDOOR_TEMP = "outdoor_temp_sensor"
 CONF_INDOOR_HUMIDITY = "indoor_humidity_sensor"
 CONF_OUTDOOR_HUMIDITY = "outdoor_humidity_sensor"
+# Optional, while the window is open the measured decay is tracked
+CONF_WINDOW_SENSOR = "window_sensor"
+# Optional, its hourly forecast is searched for the best time to vent
+CONF_WEATHER_ENTITY = "weather_entity"
+
+# A building shares the outdoor sensors between its rooms
+CONF_ROOMS = "rooms"
+CONF_ADD_ANOTHER_ROOM = "add_another_room"
+
+# Stored on the config entry by the sensor
+CONF_CALIBRATION = "calibration"
+
+# Options
+CONF_MAX_VENT_TIME = "maximum_vent_time"
+CONF_UPDATE_DELAY = "update_delay"
+CONF_TEMP_DEADBAND = "temperature_deadband"
+CONF_HUMIDITY_DEADBAND = "humidity_deadband"
+CONF_CACHE_SIZE = "cache_size"
+CONF_TABLE_MODE = "table_mode"
+CONF_PERFORMANCE_STATS = "performance_stats"
+CONF_FORECAST_RESOLUTION = "forecast_resolution"
+CONF_TRACKING_INTERVAL = "tracking_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_STALE_AFTER = "stale_after"
+CONF_STATE_TOLERANCE = "state_tolerance"
+CONF_ATTRIBUTE_TOLERANCE = "attribute_tolerance"
+CONF_HEARTBEAT = "heartbeat"
+CONF_RECORD_ABSOLUTE_HUMIDITY = "record_absolute_humidity"
+CONF_UNCERTAINTY_SAMPLES = "uncertainty_samples"
+CONF_PLANNING_HORIZON = "planning_horizon"
+
+# Defaults
+DEFAULT_MAX_VENT_TIME = 300 # min
+DEFAULT_UPDATE_DELAY = 0.5 # s
+DEFAULT_TEMP_DEADBAND = 0 # °C
+DEFAULT_HUMIDITY_DEADBAND = 0 # %
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_TABLE_MODE = False
+DEFAULT_PERFORMANCE_STATS = False
+DEFAULT_FORECAST_RESOLUTION = 0 # min, 0 disables the forecast
+DEFAULT_TRACKING_INTERVAL = 10 # s
+DEFAULT_MAX_UPDATE_INTERVAL = 0 # s, 0 calculates on every reading
+DEFAULT_STALE_AFTER = 0 # min, 0 trusts readings of any age
+DEFAULT_STATE_TOLERANCE = 0 # min, together with the attribute tolerance 0 writes every change
+DEFAULT_ATTRIBUTE_TOLERANCE = 0 # Pa
+DEFAULT_HEARTBEAT = 60 # min
+DEFAULT_RECORD_ABSOLUTE_HUMIDITY = True
+DEFAULT_UNCERTAINTY_SAMPLES = 0 # 0 disables the uncertainty band
+DEFAULT_PLANNING_HORIZON = 24 # h
+
+# Keys in hass.data[DOMAIN]
+DATA_ENTITIES = "entities"
+DATA_ENTRY_CONFIG = "entry_config"
@@ -0,0 +1,33 @@
+"""Diagnostics support for Vent optimization."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .cache import DATA_VENT_TIME_CACHES, saturation_pressure_cache_stats
+from .compute import DATA_COMPUTE_CACHE
+from .const import DATA_ENTITIES, DOMAIN
+from .dispatcher import DATA_DISPATCHER
+from .hub import DATA_OUTDOOR_HUBS
+from .planner import DATA_FORECAST_HUBS
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data.get(DOMAIN, {})
+    entities = data.get(DATA_ENTITIES, {}).get(entry.entry_id, [])
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "entities": {entity.entity_id: entity.diagnostics for entity in entities},
+        "tracked_entities": dispatcher.tracked_entities if (dispatcher := data.get(DATA_DISPATCHER)) else 0,
+        "outdoor_hubs": [hub.diagnostics for hub in data.get(DATA_OUTDOOR_HUBS, {}).values()],
+        "forecast_hubs": [hub.diagnostics for hub in data.get(DATA_FORECAST_HUBS, {}).values()],
+        "vent_time_caches": [cache.stats for cache in data.get(DATA_VENT_TIME_CACHES, {}).values()],
+        "saturation_pressure_cache": saturation_pressure_cache_stats(),
+        "compute_cache": data[DATA_COMPUTE_CACHE].stats if DATA_COMPUTE_CACHE in data else None,
+    }
@@ -0,0 +1,75 @@
+"""Routes the state changes of all tracked sensors through a single subscription."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import logging
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISPATCHER = "dispatcher"
+
+
+class StateDispatcher:
+    """Indexes the rooms and hubs by the entity ids they depend on."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._routes: dict[str, list[Callable[[Event], None]]] = {}
+        self._unsub_listener: CALLBACK_TYPE | None = None
+
+    @classmethod
+    @callback
+    def async_get(cls, hass: HomeAssistant) -> StateDispatcher:
+        """Return the dispatcher, creating it if necessary."""
+        data = hass.data.setdefault(DOMAIN, {})
+        if (dispatcher := data.get(DATA_DISPATCHER)) is None:
+            dispatcher = data[DATA_DISPATCHER] = cls(hass)
+        return dispatcher
+
+    @callback
+    def async_track(self, entity_ids: Iterable[str], action: Callable[[Event], None]) -> CALLBACK_TYPE:
+        """Call action with the state change events of the entities, return a callback to stop."""
+        entity_ids = {entity_id.lower() for entity_id in entity_ids}
+        for entity_id in entity_ids:
+            self._routes.setdefault(entity_id, []).append(action)
+        if self._unsub_listener is None:
+            self._unsub_listener = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_dispatch, event_filter=self._async_filter, run_immediately=True
+            )
+
+        @callback
+        def untrack() -> None:
+            for entity_id in entity_ids:
+                self._routes[entity_id].remove(action)
+                if not self._routes[entity_id]:
+                    del self._routes[entity_id]
+            if not self._routes:
+                self._unsub_listener()
+                self._unsub_listener = None
+                self.hass.data[DOMAIN].pop(DATA_DISPATCHER, None)
+
+        return untrack
+
+    @property
+    def tracked_entities(self) -> int:
+        """Return the number of entities the dispatcher routes."""
+        return len(self._routes)
+
+    @callback
+    def _async_filter(self, event: Event) -> bool:
+        return event.data["entity_id"] in self._routes
+
+    @callback
+    def _async_dispatch(self, event: Event) -> None:
+        # Copy, an action may stop tracking while being dispatched
+        for action in list(self._routes.get(event.data["entity_id"], ())):
+            try:
+                action(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error while dispatching %s", event)
@@ -0,0 +1,234 @@
+"""Shares the outdoor conditions between all rooms using the same outdoor sensors."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.const import STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+
+from .const import DOMAIN
+from .cache import cached_e_s
+from .dispatcher import StateDispatcher
+from .model import ModelConstants, calc_time_to_vent_batch
+from .parsing import parse_humidity, parse_temperature
+
+if TYPE_CHECKING:
+    from .sensor import VentTime
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_OUTDOOR_HUBS = "outdoor_hubs"
+
+# Below this number of rooms letting every room run the scalar solver is faster than a batch
+BATCH_MIN_ROOMS = 4
+
+
+class OutdoorHub:
+    """Parses the readings of one pair of outdoor sensors once for all rooms using them."""
+
+    def __init__(self, hass: HomeAssistant, temp_sensor: str, humidity_sensor: str) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.temp_sensor = temp_sensor
+        self.humidity_sensor = humidity_sensor
+
+        self.temp = None
+        self.hum = None
+        self.absolute_humidity = None
+
+        self._rooms: set[VentTime] = set()
+        self._events = 0
+        self._batches = 0
+        self._batched_rooms = 0
+        self._unsub_state_listener: CALLBACK_TYPE | None = None
+        self._refresh: asyncio.Handle | None = None
+        self._debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=0,
+            immediate=False,
+            function=self._async_update_rooms,
+        )
+
+    @classmethod
+    @callback
+    def async_get(cls, hass: HomeAssistant, temp_sensor: str, humidity_sensor: str) -> OutdoorHub:
+        """Return the hub for the outdoor sensors, creating it if necessary."""
+        hubs = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_OUTDOOR_HUBS, {})
+        if (hub := hubs.get((temp_sensor, humidity_sensor))) is None:
+            hub = hubs[(temp_sensor, humidity_sensor)] = cls(hass, temp_sensor, humidity_sensor)
+        return hub
+
+    @callback
+    def async_add_room(self, room: VentTime) -> CALLBACK_TYPE:
+        """Add a room depending on the outdoor conditions and return a callback to remove it."""
+        if not self._rooms:
+            self._async_start()
+        self._rooms.add(room)
+        self.update_cooldown()
+
+        @callback
+        def remove_room() -> None:
+            self._rooms.discard(room)
+            if not self._rooms:
+                self._async_stop()
+            else:
+                self.update_cooldown()
+
+        return remove_room
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return the state and counters of the hub for the diagnostics."""
+        return {
+            "temp_sensor": self.temp_sensor,
+            "humidity_sensor": self.humidity_sensor,
+            "temp": self.temp,
+            "humidity": self.hum,
+            "absolute_humidity": self.absolute_humidity,
+            "rooms": len(self._rooms),
+            "events": self._events,
+            "batches": self._batches,
+            "batched_rooms": self._batched_rooms,
+        }
+
+    def update_cooldown(self) -> None:
+        """Coalesce outdoor readings for as long as the most eager room allows."""
+        self._debouncer.cooldown = min(room.update_delay for room in self._rooms)
+
+    @callback
+    def async_schedule_refresh(self) -> None:
+        """Recalculate the changed rooms soon, together with all rooms asking for it meanwhile."""
+        if self._refresh is None:
+            self._refresh = self.hass.loop.call_soon(self._async_refresh)
+
+    @callback
+    def _async_refresh(self) -> None:
+        self._refresh = None
+        self._async_update_rooms()
+
+    @callback
+    def _async_start(self) -> None:
+        """Start tracking the outdoor sensors."""
+        self._unsub_state_listener = StateDispatcher.async_get(self.hass).async_track(
+            [self.temp_sensor, self.humidity_sensor], self._async_state_listener
+        )
+
+        # Read initial state
+        self._update_sensor(self.temp_sensor, None, self.hass.states.get(self.temp_sensor))
+        self._update_sensor(self.humidity_sensor, None, self.hass.states.get(self.humidity_sensor))
+
+    @callback
+    def _async_stop(self) -> None:
+        """Stop tracking the outdoor sensors once no room is left."""
+        if self._unsub_state_listener is not None:
+            self._unsub_state_listener()
+            self._unsub_state_listener = None
+        self._debouncer.async_cancel()
+        if self._refresh is not None:
+            self._refresh.cancel()
+            self._refresh = None
+        self.hass.data[DOMAIN][DATA_OUTDOOR_HUBS].pop((self.temp_sensor, self.humidity_sensor), None)
+
+    @callback
+    def _async_state_listener(self, event: Event) -> None:
+        """Handle state changes of the outdoor sensors."""
+        new_state = event.data.get("new_state")
+        old_state = event.data.get("old_state")
+        entity = event.data.get("entity_id")
+        _LOGGER.debug(
+            "Outdoor sensor state change for %s that had old state %s and new state %s",
+            entity,
+            old_state,
+            new_state,
+        )
+
+        self._events += 1
+        if not self._update_sensor(entity, old_state, new_state):
+            return
+        if self._debouncer.cooldown:
+            self.hass.async_create_task(self._debouncer.async_call())
+        else:
+            self._async_update_rooms()
+
+    def _update_sensor(self, entity, old_state, new_state):
+        """Update the outdoor conditions based on new sensor states."""
+        if new_state is None:
+            return False
+
+        # If old_state is not set and new state is unknown then it means
+        # that the sensor just started up
+        if old_state is None and new_state.state == STATE_UNKNOWN:
+            return False
+
+        if entity == self.temp_sensor:
+            self.temp = parse_temperature(new_state)
+        if entity == self.humidity_sensor:
+            self.hum = parse_humidity(new_state)
+
+        if None in (self.temp, self.hum):
+            self.absolute_humidity = None
+        else:
+            self.absolute_humidity = (self.hum/100)*cached_e_s(self.temp)
+            _LOGGER.debug("Outdoor absolute humidity: %f", self.absolute_humidity)
+
+        return True
+
+    @callback
+    def _async_update_rooms(self) -> None:
+        """Recompute all rooms, in a single batch if enough of them miss the cache."""
+        changed = []
+        for room in self._rooms:
+            if not room.inputs_changed:
+                continue
+            # Rooms pacing their calculations join a later batch once they are due
+            if room.update_due():
+                changed.append(room)
+            else:
+                room.async_defer_update()
+        ready = []
+        if self.absolute_humidity is not None:
+            ready = [room for room in changed if room.model_inputs is not None]
+
+        misses = []
+        for room in ready:
+            if (time := room.cached_time_to_vent) is not None:
+                room.async_set_time_to_vent(time, cached=True)
+            else:
+                misses.append(room)
+
+        if len(misses) >= BATCH_MIN_ROOMS:
+            import numpy as np
+
+            (
+                indoor_temp,
+                indoor_absolute_humidity,
+                window_size,
+                room_volume,
+                max_hum_allowed,
+                max_vent_time,
+                constants,
+            ) = zip(*(room.model_inputs for room in misses))
+            times = calc_time_to_vent_batch(
+                indoor_temp,
+                self.temp,
+                indoor_absolute_humidity,
+                self.absolute_humidity,
+                window_size,
+                room_volume,
+                max_hum_allowed,
+                max_vent_time,
+                ModelConstants(*np.array(constants).T),
+            )
+            self._batches += 1
+            self._batched_rooms += len(misses)
+            for room, time in zip(misses, times):
+                room.async_set_time_to_vent(float(time))
+            misses = []
+
+        # Rooms missing inputs become unavailable through their own update
+        for room in misses + [room for room in changed if room not in ready]:
+            room.async_recalculate()
@@ -0,0 +1,690 @@
+"""The vent model, free of any Home Assistant dependencies.
+
+Temperatures are in °C, relative humidities in %, absolute humidities are given as
+vapour pressure in Pa, window sizes in m², room volumes in m³ and times in minutes.
+Every scalar function has a vectorized counterpart working on NumPy arrays. NumPy is only
+imported by the vectorized functions, the scalar ones used for the first state do not
+pay for loading it.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+import math
+from typing import NamedTuple
+
+from .const import DEFAULT_MAX_VENT_TIME
+
+
+class ModelConstants(NamedTuple):
+    """Parameters of the model."""
+
+    k_1: float
+    k_2: float
+    k_3: float
+    k_4: float
+
+
+DEFAULT_CONSTANTS = ModelConstants(
+    k_1=49.9737675,
+    k_2=2.28452262,
+    k_3=49.3679433,
+    k_4=8.39747826,
+)
+
+# Sensors report 0.1 °C and 1 % steps, rounding to two decimals keeps them apart
+# while merging the noise of unit conversions
+INPUT_DECIMALS = 2
+
+# Parameters of the vent time solver
+SOLVER_TOLERANCE = 0.01 # min
+SOLVER_GRID_FACTOR = 1.25 # growth of (time+1) per step while searching the first crossing
+SOLVER_MAX_EVALUATIONS = 50
+SOLVER_NEWTON_STEPS = 3 # for a room warmer than outside before searching the bracket
+# Relative humidities this close to max_hum_allowed count as reaching it. Sensors with
+# whole percents often report exactly the wished humidity, and the last bit of e_s
+# differs between math.exp and np.exp, which would otherwise tip the comparison.
+HUMIDITY_TOLERANCE = 1e-9 # %
+
+# Typical measurement errors of the sensors, taken as standard deviations
+TEMP_ERROR = 0.5 # °C
+HUMIDITY_ERROR = 3 # %
+UNCERTAINTY_PERCENTILES = (10, 90)
+
+AIR_HEAT_CAPACITY = 1206 # J/(m³·K), volumetric at room temperature
+
+# According to https://journals.ametsoc.org/view/journals/bams/86/2/bams-86-2-225.xml?tab_body=pdf Equation 6 p.226
+C_1 = 610.94 # Kp
+A_1 = 17.625
+B_1 = 243.04 # °C
+
+
+def calc_e_s(temp):
+    """Calculate the saturation vapour pressure for a temperature"""
+    return C_1*math.exp((A_1*temp)/(B_1+temp))
+
+
+def calc_e_s_batch(temp):
+    """Calculate the saturation vapour pressure for an array of temperatures"""
+    import numpy as np
+
+    temp = np.asarray(temp, dtype=float)
+    return C_1*np.exp((A_1*temp)/(B_1+temp))
+
+
+def calc_absolute_humidity(hum, temp):
+    """Calculate the absolute humidity from the relative humidity and the temperature"""
+    return (hum/100)*calc_e_s(temp)
+
+
+def calc_absolute_humidity_batch(hum, temp):
+    """Calculate the absolute humidity for arrays of relative humidities and temperatures"""
+    import numpy as np
+
+    return (np.asarray(hum, dtype=float)/100)*calc_e_s_batch(temp)
+
+
+def humidity_exponent(window_size, room_volume, constants=DEFAULT_CONSTANTS):
+    """Calculate the decay exponent of the humidity model"""
+    return (constants.k_1*window_size)/(constants.k_2*room_volume)
+
+
+def temperature_exponent(window_size, room_volume, constants=DEFAULT_CONSTANTS):
+    """Calculate the decay exponent of the temperature model"""
+    return (constants.k_3*window_size)/(constants.k_4*room_volume)
+
+
+def humidity_model(time, indoor_absolute_humidity, outdoor_absolute_humidity, exponent):
+    """Predict the indoor absolute humidity after venting for time minutes, works on arrays too"""
+    return (indoor_absolute_humidity - outdoor_absolute_humidity)/((time+1)**exponent) + outdoor_absolute_humidity
+
+
+def temperature_model(time, indoor_temp, outdoor_temp, exponent):
+    """Predict the indoor temperature after venting for time minutes, works on arrays too"""
+    return (indoor_temp - outdoor_temp)/((time+1)**exponent) + outdoor_temp
+
+
+def ventilation_heat_loss(time, indoor_temp, outdoor_temp, window_size, room_volume, constants=DEFAULT_CONSTANTS):
+    """Calculate the heat in Wh to warm the room air back up after venting for time minutes, works on arrays too"""
+    temp = temperature_model(time, indoor_temp, outdoor_temp, temperature_exponent(window_size, room_volume, constants))
+    return AIR_HEAT_CAPACITY*room_volume*(indoor_temp - temp)/3600
+
+
+def calc_dew_point(absolute_humidity):
+    """Calculate the dew point from a positive absolute humidity, the inverse of calc_e_s"""
+    ratio = math.log(absolute_humidity/C_1)
+    return (B_1*ratio)/(A_1 - ratio)
+
+
+def surface_temperature(indoor_temp, outdoor_temp, surface_factor):
+    """Estimate the temperature of the coldest surface like the mold indicator does.
+
+    The factor is the ratio of the difference between inside and outside to the difference
+    between the surface and outside, measured once e.g. at a window frame or an outer corner.
+    """
+    return outdoor_temp + (indoor_temp - outdoor_temp)/surface_factor
+
+
+def _humidity_model_inverse(absolute_humidity, indoor_absolute_humidity, outdoor_absolute_humidity, exponent):
+    """Calculate the time at which the humidity model reaches the given absolute humidity"""
+    if exponent <= 0 or absolute_humidity <= outdoor_absolute_humidity:
+        return math.inf
+    return ((indoor_absolute_humidity - outdoor_absolute_humidity)/(absolute_humidity - outdoor_absolute_humidity))**(1/exponent) - 1
+
+
+def _humidity_model_inverse_batch(absolute_humidity, indoor_absolute_humidity, outdoor_absolute_humidity, exponent):
+    """Vectorized version of _humidity_model_inverse"""
+    import numpy as np
+
+    time = ((indoor_absolute_humidity - outdoor_absolute_humidity)/(absolute_humidity - outdoor_absolute_humidity))**(1/exponent) - 1
+    return np.where((exponent <= 0) | (absolute_humidity <= outdoor_absolute_humidity), np.inf, time)
+
+
+class Solution(NamedTuple):
+    """A vent time together with what is needed to warm start the next calculation."""
+
+    time: float
+    evaluations: int
+    # Change of the relative humidity excess per minute at the time, None if the
+    # time is not at a crossing of max_hum_allowed
+    slope: float | None = None
+
+
+def calc_time_to_vent(
+        indoor_temp,
+        outdoor_temp,
+        indoor_absolute_humidity,
+        outdoor_absolute_humidity,
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        max_vent_time=DEFAULT_MAX_VENT_TIME,
+        constants=DEFAULT_CONSTANTS,
+):
+    """Calculate the time until the humidity is under max_hum_allowed.
+
+    Returns the time in minutes together with the number of model evaluations used.
+    """
+    # The common case of a humid room warmer than outside without building a Solution
+    if indoor_temp > outdoor_temp and indoor_absolute_humidity > outdoor_absolute_humidity:
+        indoor_e_s = calc_e_s(indoor_temp)
+        if (indoor_absolute_humidity/indoor_e_s)*100 > max_hum_allowed + HUMIDITY_TOLERANCE:
+            time, evaluations, _ = _solve_cooling(
+                indoor_e_s,
+                indoor_temp,
+                outdoor_temp,
+                indoor_absolute_humidity,
+                outdoor_absolute_humidity,
+                humidity_exponent(window_size, room_volume, constants),
+                temperature_exponent(window_size, room_volume, constants),
+                max_hum_allowed,
+                max_vent_time,
+            )
+            if time is not None:
+                return time, evaluations
+    return solve_time_to_vent(
+        indoor_temp,
+        outdoor_temp,
+        indoor_absolute_humidity,
+        outdoor_absolute_humidity,
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        max_vent_time,
+        constants,
+    )[:2]
+
+
+def solve_time_to_vent(
+        indoor_temp,
+        outdoor_temp,
+        indoor_absolute_humidity,
+        outdoor_absolute_humidity,
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        max_vent_time=DEFAULT_MAX_VENT_TIME,
+        constants=DEFAULT_CONSTANTS,
+        previous: Solution | None = None,
+) -> Solution:
+    """Calculate the time until the humidity is under max_hum_allowed.
+
+    A room warmer than outside is usually solved with one model evaluation by Newton's
+    method. Otherwise, given the solution for slightly different readings, the search
+    starts from there and usually takes three model evaluations. It falls back to the
+    full search if the crossing is not found next to the previous time.
+    """
+    if indoor_absolute_humidity <= outdoor_absolute_humidity:
+        return Solution(0, 0)
+    indoor_e_s = calc_e_s(indoor_temp)
+    if (indoor_absolute_humidity/indoor_e_s)*100 <= max_hum_allowed + HUMIDITY_TOLERANCE:
+        return Solution(0, 1)
+
+    hum_exponent = humidity_exponent(window_size, room_volume, constants)
+    temp_exponent = temperature_exponent(window_size, room_volume, constants)
+
+    evaluations = 0
+    if indoor_temp > outdoor_temp:
+        time, evaluations, slope = _solve_cooling(
+            indoor_e_s,
+            indoor_temp,
+            outdoor_temp,
+            indoor_absolute_humidity,
+            outdoor_absolute_humidity,
+            hum_exponent,
+            temp_exponent,
+            max_hum_allowed,
+            max_vent_time,
+        )
+        if time is not None:
+            return Solution(time, evaluations, slope)
+
+    def humidity_excess(time):
+        """Calculate by how many percent the relative humidity is above max_hum_allowed"""
+        absolute_humidity = humidity_model(time, indoor_absolute_humidity, outdoor_absolute_humidity, hum_exponent)
+        return (absolute_humidity/calc_e_s(temperature_model(time, indoor_temp, outdoor_temp, temp_exponent)))*100 - max_hum_allowed
+
+    # The temperature model always stays between indoor and outdoor temperature, so the
+    # saturation pressure of the warmer one bounds the relative humidity from below and the
+    # one of the colder one from above. Inverting the humidity model for both gives a bracket.
+    target = max_hum_allowed/100
+    lower = max(0.0, _humidity_model_inverse(
+        target*calc_e_s(max(indoor_temp, outdoor_temp)), indoor_absolute_humidity, outdoor_absolute_humidity, hum_exponent
+    ))
+    upper = min(float(max_vent_time), max(lower, _humidity_model_inverse(
+        target*calc_e_s(min(indoor_temp, outdoor_temp)), indoor_absolute_humidity, outdoor_absolute_humidity, hum_exponent
+    )))
+
+    if lower >= max_vent_time:
+        return Solution(max_vent_time, evaluations)
+
+    if previous is not None and previous.slope is not None and lower < upper:
+        solution, evaluations = _warm_start(humidity_excess, lower, upper, previous, evaluations)
+        if solution is not None:
+            return solution
+
+    excess_lower = humidity_excess(lower)
+    evaluations += 1
+    if excess_lower <= 0:
+        return Solution(lower, evaluations)
+
+    # A cooling room can raise the relative humidity again, so it is not monotonic.
+    # March through the bracket on a logarithmic grid to find the first crossing.
+    while True:
+        time = min(upper, (lower + 1)*SOLVER_GRID_FACTOR - 1)
+        excess = humidity_excess(time)
+        evaluations += 1
+        if excess <= 0 or time >= upper:
+            break
+        lower, excess_lower = time, excess
+
+    if excess > 0:
+        return Solution(time, evaluations)
+    return _refine(humidity_excess, lower, excess_lower, time, excess, evaluations)
+
+
+def _solve_cooling(
+        indoor_e_s,
+        indoor_temp,
+        outdoor_temp,
+        indoor_absolute_humidity,
+        outdoor_absolute_humidity,
+        hum_exponent,
+        temp_exponent,
+        max_hum_allowed,
+        max_vent_time,
+):
+    """Solve for a room warmer than outside with Newton's method.
+
+    Over the logarithm of the fraction of the humidity difference left, the crossing is
+    where inverting the humidity model at the temperature of the same time gives that
+    fraction back. The inverse is nearly straight, so a second order step from the indoor
+    temperature, which needs no model evaluation, lands next to the crossing and Newton's
+    method usually settles after one evaluation. The relative humidity falls until it
+    possibly rises again, so a falling crossing is the first one. Returns the time, the
+    evaluations spent and the slope, the time is None if the steps leave the falling part.
+    """
+    target = max_hum_allowed/100
+    absolute_humidity = target*indoor_e_s
+    humidity = absolute_humidity - outdoor_absolute_humidity
+    if humidity <= 0:
+        return None, 0, None
+    difference = indoor_absolute_humidity - outdoor_absolute_humidity
+    temp_difference = indoor_temp - outdoor_temp
+    ratio = temp_exponent/hum_exponent
+    start = math.log(humidity/difference)
+    end = -hum_exponent*math.log(max_vent_time + 1)
+
+    # Slope and curvature of the inverse at the indoor temperature
+    denominator = B_1 + indoor_temp
+    growth = absolute_humidity/humidity
+    sensitivity = A_1*B_1/(denominator*denominator)
+    change = ratio*temp_difference
+    slope = growth*sensitivity*change
+    curvature = slope*((sensitivity*(1 - growth) - 2/denominator)*change + ratio)
+    discriminant = (1 - slope)**2 - 2*curvature*start
+    if slope >= 1 or discriminant < 0:
+        return None, 0, None
+    log_left = 2*start/(1 - slope + math.sqrt(discriminant))
+    if not end <= log_left <= start:
+        return None, 0, None
+
+    for evaluations in range(1, SOLVER_NEWTON_STEPS + 1):
+        temp = temp_difference*math.exp(ratio*log_left)
+        denominator = B_1 + outdoor_temp + temp
+        absolute_humidity = target*C_1*math.exp(A_1*(outdoor_temp + temp)/denominator)
+        humidity = absolute_humidity - outdoor_absolute_humidity
+        if humidity <= 0:
+            break
+        # Below 1 where the relative humidity falls
+        slope = absolute_humidity*A_1*B_1*ratio*temp/(denominator*denominator*humidity)
+        if slope >= 1:
+            break
+        step = (log_left - math.log(humidity/difference))/(1 - slope)
+        log_left -= step
+        if not end <= log_left <= start:
+            break
+        time = math.exp(-log_left/hum_exponent)
+        # Close enough once the step moves the time by less than the tolerance
+        if abs(step)*time <= SOLVER_TOLERANCE*hum_exponent:
+            # The change of the excess in percent per minute
+            return time - 1, evaluations, -max_hum_allowed*(1 - slope)*hum_exponent*humidity/(absolute_humidity*time)
+    return None, evaluations, None
+
+
+def _solve_cooling_batch(
+        indoor_e_s,
+        indoor_temp,
+        outdoor_temp,
+        indoor_absolute_humidity,
+        outdoor_absolute_humidity,
+        hum_exponent,
+        temp_exponent,
+        max_hum_allowed,
+        max_vent_time,
+):
+    """Vectorized version of _solve_cooling, returns the times, NaN where it does not settle, and the evaluations"""
+    import numpy as np
+
+    target = max_hum_allowed/100
+    absolute_humidity = target*indoor_e_s
+    humidity = absolute_humidity - outdoor_absolute_humidity
+    difference = indoor_absolute_humidity - outdoor_absolute_humidity
+    temp_difference = indoor_temp - outdoor_temp
+    ratio = temp_exponent/hum_exponent
+    start = np.log(humidity/difference)
+    end = -hum_exponent*np.log(max_vent_time + 1)
+
+    denominator = B_1 + indoor_temp
+    growth = absolute_humidity/humidity
+    sensitivity = A_1*B_1/(denominator*denominator)
+    change = ratio*temp_difference
+    slope = growth*sensitivity*change
+    curvature = slope*((sensitivity*(1 - growth) - 2/denominator)*change + ratio)
+    discriminant = (1 - slope)**2 - 2*curvature*start
+    log_left = 2*start/(1 - slope + np.sqrt(discriminant))
+
+    time = np.full(log_left.shape, np.nan)
+    evaluations = np.zeros(log_left.shape, dtype=int)
+    rows = np.flatnonzero((humidity > 0) & (slope < 1) & (discriminant >= 0) & (end <= log_left) & (log_left <= start))
+    for _ in range(SOLVER_NEWTON_STEPS):
+        if not rows.size:
+            break
+        temp = temp_difference[rows]*np.exp(ratio[rows]*log_left[rows])
+        denominator = B_1 + outdoor_temp[rows] + temp
+        absolute_humidity = target[rows]*C_1*np.exp(A_1*(outdoor_temp[rows] + temp)/denominator)
+        humidity = absolute_humidity - outdoor_absolute_humidity[rows]
+        evaluations[rows] += 1
+        slope = absolute_humidity*A_1*B_1*ratio[rows]*temp/(denominator*denominator*humidity)
+        step = (log_left[rows] - np.log(humidity/difference[rows]))/(1 - slope)
+        log_left[rows] -= step
+        inside = (humidity > 0) & (slope < 1) & (end[rows] <= log_left[rows]) & (log_left[rows] <= start[rows])
+        estimate = np.exp(-log_left[rows]/hum_exponent[rows])
+        settled = inside & (np.abs(step)*estimate <= SOLVER_TOLERANCE*hum_exponent[rows])
+        time[rows[settled]] = estimate[settled] - 1
+        rows = rows[inside & ~settled]
+    return time, evaluations
+
+
+def _warm_start(humidity_excess, lower, upper, previous, evaluations=0):
+    """Search the crossing next to the previous solution.
+
+    Takes a Newton step from the previous time with the previous slope and evaluates
+    the excess just before and after the estimate. The relative humidity falls until it
+    possibly rises again in a cooling room, so it only falls through max_hum_allowed
+    once and a bracket with falling excess holds the first crossing. Returns the
+    solution, or None with the evaluations spent if there is no such bracket.
+    """
+    start = min(upper, max(lower, previous.time))
+    points = [(start, humidity_excess(start))]
+    estimate = start - points[0][1]/previous.slope if previous.slope < 0 else start
+    for time in (estimate - SOLVER_TOLERANCE/2, estimate + SOLVER_TOLERANCE/2):
+        time = min(upper, max(lower, time))
+        if time != start:
+            points.append((time, humidity_excess(time)))
+    evaluations += len(points)
+    points.sort()
+
+    if points[0][0] == lower and points[0][1] <= 0:
+        return Solution(lower, evaluations), evaluations
+    for (time_low, excess_low), (time_high, excess_high) in zip(points, points[1:]):
+        if excess_low > 0 >= excess_high:
+            return _refine(humidity_excess, time_low, excess_low, time_high, excess_high, evaluations), evaluations
+    return None, evaluations
+
+
+def _refine(humidity_excess, lower, excess_lower, upper, excess_upper, evaluations):
+    """Narrow down a bracket with excess_lower > 0 >= excess_upper to the solver tolerance"""
+    # Illinois variant of regula falsi, falling back to bisection if an interpolation
+    # leaves the bracket. The weights halve the excess of a side kept twice in a row.
+    weight_lower = weight_upper = 1.0
+    side = 0
+    while upper - lower > SOLVER_TOLERANCE and evaluations < SOLVER_MAX_EVALUATIONS:
+        weighted_lower, weighted_upper = excess_lower*weight_lower, excess_upper*weight_upper
+        time = upper - weighted_upper*(upper - lower)/(weighted_upper - weighted_lower)
+        if not lower < time < upper:
+            time = (lower + upper)/2
+        excess = humidity_excess(time)
+        evaluations += 1
+        if excess > 0:
+            lower, excess_lower, weight_lower = time, excess, 1.0
+            if side == -1:
+                weight_upper /= 2
+            side = -1
+        else:
+            upper, excess_upper, weight_upper = time, excess, 1.0
+            if side == 1:
+                weight_lower /= 2
+            side = 1
+
+    return Solution(upper, evaluations, (excess_upper - excess_lower)/(upper - lower))
+
+
+def calc_time_to_vent_batch(
+        indoor_temp,
+        outdoor_temp,
+        indoor_absolute_humidity,
+        outdoor_absolute_humidity,
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        max_vent_time=DEFAULT_MAX_VENT_TIME,
+        constants=DEFAULT_CONSTANTS,
+):
+    """Vectorized version of calc_time_to_vent.
+
+    All arguments may be arrays and are broadcast against each other, the fields of the
+    constants too, e.g. to give every room its calibrated constants. Every element takes
+    the same steps as calc_time_to_vent would take for it. Elements with missing (NaN)
+    inputs are NaN in the returned array of times.
+    """
+    import numpy as np
+
+    arrays = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (
+        indoor_temp,
+        outdoor_temp,
+        indoor_absolute_humidity,
+        outdoor_absolute_humidity,
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        max_vent_time,
+        *constants,
+    )))
+    shape = arrays[0].shape
+    t_in, t_out, ah_in, ah_out, window, volume, max_hum, horizon, *k = (np.ravel(array) for array in arrays)
+
+    result = np.full(t_in.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        valid = ~np.isnan(t_in + t_out + ah_in + ah_out + window + volume + max_hum + horizon)
+        dry = (ah_in <= ah_out) | ((ah_in/calc_e_s_batch(t_in))*100 <= max_hum + HUMIDITY_TOLERANCE)
+        result[valid & dry] = 0
+        todo = np.flatnonzero(valid & ~dry)
+        t_in, t_out, ah_in, ah_out, window, volume, max_hum, horizon, *k = (
+            array[todo] for array in (t_in, t_out, ah_in, ah_out, window, volume, max_hum, horizon, *k)
+        )
+        constants = ModelConstants(*k)
+
+        hum_exponent = humidity_exponent(window, volume, constants)
+        temp_exponent = temperature_exponent(window, volume, constants)
+
+        # Rooms warmer than outside are usually solved right away, the others search the bracket
+        spent = np.zeros(t_in.shape, dtype=int)
+        cooling = np.flatnonzero(t_in > t_out)
+        time, spent[cooling] = _solve_cooling_batch(*(array[cooling] for array in (
+            calc_e_s_batch(t_in), t_in, t_out, ah_in, ah_out, hum_exponent, temp_exponent, max_hum, horizon
+        )))
+        settled = ~np.isnan(time)
+        result[todo[cooling[settled]]] = time[settled]
+        rest = np.ones(t_in.shape, dtype=bool)
+        rest[cooling[settled]] = False
+        todo, t_in, t_out, ah_in, ah_out, max_hum, horizon, hum_exponent, temp_exponent, spent = (
+            array[rest] for array in (todo, t_in, t_out, ah_in, ah_out, max_hum, horizon, hum_exponent, temp_exponent, spent)
+        )
+
+        def humidity_excess(time, rows):
+            absolute_humidity = humidity_model(time, ah_in[rows], ah_out[rows], hum_exponent[rows])
+            temp = temperature_model(time, t_in[rows], t_out[rows], temp_exponent[rows])
+            return (absolute_humidity/calc_e_s_batch(temp))*100 - max_hum[rows]
+
+        target = max_hum/100
+        lower = np.maximum(0.0, _humidity_model_inverse_batch(
+            target*calc_e_s_batch(np.maximum(t_in, t_out)), ah_in, ah_out, hum_exponent
+        ))
+        upper = np.minimum(horizon, np.maximum(lower, _humidity_model_inverse_batch(
+            target*calc_e_s_batch(np.minimum(t_in, t_out)), ah_in, ah_out, hum_exponent
+        )))
+
+        capped = lower >= horizon
+        result[todo[capped]] = horizon[capped]
+
+        rows = np.flatnonzero(~capped)
+        excess_lower = np.full(lower.shape, np.nan)
+        excess_lower[rows] = humidity_excess(lower[rows], rows)
+        crossed = excess_lower[rows] <= 0
+        result[todo[rows[crossed]]] = lower[rows[crossed]]
+        rows = rows[~crossed]
+
+        # March through the bracket on the same logarithmic grid as calc_time_to_vent,
+        # all steps at once, and pick the first crossing of each element.
+        if rows.size:
+            steps = max(1, math.ceil(math.log(float(np.max(horizon[rows])) + 1)/math.log(SOLVER_GRID_FACTOR)) + 1)
+            grid = (lower[rows, None] + 1)*SOLVER_GRID_FACTOR**np.arange(1, steps + 1) - 1
+            grid = np.minimum(grid, upper[rows, None])
+            grid_excess = humidity_excess(grid, rows[:, None])
+            first = np.argmax((grid_excess <= 0) | (grid >= upper[rows, None]), axis=1)
+            moved = first > 0
+            lower[rows[moved]] = grid[moved, first[moved] - 1]
+            excess_lower[rows[moved]] = grid_excess[moved, first[moved] - 1]
+            upper[rows] = grid[np.arange(rows.size), first]
+            excess_upper = np.full(lower.shape, np.nan)
+            excess_upper[rows] = grid_excess[np.arange(rows.size), first]
+            evaluations = np.zeros(lower.shape, dtype=int)
+            evaluations[rows] = first + 2 + spent[rows]
+            side = np.zeros(lower.shape, dtype=int)
+
+            rows = rows[excess_upper[rows] <= 0]
+            while True:
+                rows = rows[(upper[rows] - lower[rows] > SOLVER_TOLERANCE) & (evaluations[rows] < SOLVER_MAX_EVALUATIONS)]
+                if not rows.size:
+                    break
+                time = upper[rows] - excess_upper[rows]*(upper[rows] - lower[rows])/(excess_upper[rows] - excess_lower[rows])
+                time = np.where((lower[rows] < time) & (time < upper[rows]), time, (lower[rows] + upper[rows])/2)
+                excess = humidity_excess(time, rows)
+                evaluations[rows] += 1
+
+                above = excess > 0
+                moved, stayed = rows[above], rows[~above]
+                excess_upper[moved[side[moved] == -1]] /= 2
+                lower[moved], excess_lower[moved], side[moved] = time[above], excess[above], -1
+                excess_lower[stayed[side[stayed] == 1]] /= 2
+                upper[stayed], excess_upper[stayed], side[stayed] = time[~above], excess[~above], 1
+
+        unresolved = np.isnan(result[todo])
+        result[todo[unresolved]] = upper[unresolved]
+
+    return result.reshape(shape)
+
+
+def forecast(
+        indoor_temp,
+        outdoor_temp,
+        indoor_absolute_humidity,
+        outdoor_absolute_humidity,
+        window_size,
+        room_volume,
+        resolution,
+        max_vent_time=DEFAULT_MAX_VENT_TIME,
+        constants=DEFAULT_CONSTANTS,
+):
+    """Predict the indoor temperature and relative humidity while venting.
+
+    Evaluates both models in one vectorized pass at every resolution minutes from 0 up to
+    max_vent_time. Returns the arrays of times, temperatures and relative humidities.
+    """
+    import numpy as np
+
+    time = resolution*np.arange(int(max_vent_time//resolution) + 1)
+    temp = temperature_model(
+        time, indoor_temp, outdoor_temp, temperature_exponent(window_size, room_volume, constants)
+    )
+    absolute_humidity = humidity_model(
+        time, indoor_absolute_humidity, outdoor_absolute_humidity, humidity_exponent(window_size, room_volume, constants)
+    )
+    return time, temp, (absolute_humidity/calc_e_s_batch(temp))*100
+
+
+def vent_times(
+        indoor_temp,
+        outdoor_temp,
+        indoor_hum,
+        outdoor_hum,
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        max_vent_time=DEFAULT_MAX_VENT_TIME,
+        constants=DEFAULT_CONSTANTS,
+):
+    """Calculate the vent times for arrays of scenarios in one vectorized pass.
+
+    Takes temperatures and relative humidities as read from the sensors together with the
+    room parameters. All arguments but the constants may be arrays and are broadcast.
+    """
+    return calc_time_to_vent_batch(
+        indoor_temp,
+        outdoor_temp,
+        calc_absolute_humidity_batch(indoor_hum, indoor_temp),
+        calc_absolute_humidity_batch(outdoor_hum, outdoor_temp),
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        max_vent_time,
+        constants,
+    )
+
+
+@lru_cache(maxsize=4)
+def _standard_noise(samples):
+    """Return standard normal noise for the four readings, the same for every call"""
+    import numpy as np
+
+    noise = np.random.default_rng(0).standard_normal((4, samples))
+    noise.flags.writeable = False
+    return noise
+
+
+def vent_time_percentiles(
+        indoor_temp,
+        outdoor_temp,
+        indoor_hum,
+        outdoor_hum,
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        samples,
+        percentiles=UNCERTAINTY_PERCENTILES,
+        max_vent_time=DEFAULT_MAX_VENT_TIME,
+        constants=DEFAULT_CONSTANTS,
+        temp_error=TEMP_ERROR,
+        humidity_error=HUMIDITY_ERROR,
+):
+    """Calculate percentiles of the vent time under the measurement errors of the sensors.
+
+    Adds normally distributed errors to the readings and evaluates all samples in one
+    vectorized pass. The noise is the same for every call, so equal readings always give
+    equal percentiles and slightly different ones do not jump around.
+    """
+    import numpy as np
+
+    indoor_temp_noise, indoor_hum_noise, outdoor_temp_noise, outdoor_hum_noise = _standard_noise(samples)
+    times = vent_times(
+        indoor_temp + temp_error*indoor_temp_noise,
+        outdoor_temp + temp_error*outdoor_temp_noise,
+        np.clip(indoor_hum + humidity_error*indoor_hum_noise, 0, 100),
+        np.clip(outdoor_hum + humidity_error*outdoor_hum_noise, 0, 100),
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        max_vent_time,
+        constants,
+    )
+    return np.percentile(times, percentiles)
@@ -0,0 +1,98 @@
+"""Parses the states of the temperature and humidity sensors."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant import util
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    PERCENTAGE,
+    STATE_UNKNOWN,
+    UnitOfTemperature,
+)
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_temperature(state):
+    """Parse temperature sensor value."""
+    _LOGGER.debug("Updating temp sensor with value %s", state.state)
+
+    # Return an error if the sensor change its state to Unknown.
+    if state.state == STATE_UNKNOWN:
+        _LOGGER.debug(
+            "Unable to parse temperature sensor %s with state: %s",
+            state.entity_id,
+            state.state,
+        )
+        return None
+
+    unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+
+    if (temp := util.convert(state.state, float)) is None:
+        _LOGGER.debug(
+            "Unable to parse temperature sensor %s with state: %s",
+            state.entity_id,
+            state.state,
+        )
+        return None
+
+    # convert to celsius if necessary
+    if unit == UnitOfTemperature.FAHRENHEIT:
+        return TemperatureConverter.convert(
+            temp, UnitOfTemperature.FAHRENHEIT, UnitOfTemperature.CELSIUS
+        )
+    if unit == UnitOfTemperature.CELSIUS:
+        return temp
+    _LOGGER.error(
+        "Temp sensor %s has unsupported unit: %s (allowed: %s, %s)",
+        state.entity_id,
+        unit,
+        UnitOfTemperature.CELSIUS,
+        UnitOfTemperature.FAHRENHEIT,
+    )
+
+    return None
+
+
+def parse_humidity(state):
+    """Parse humidity sensor value."""
+    _LOGGER.debug("Updating humidity sensor with value %s", state.state)
+
+    # Return an error if the sensor change its state to Unknown.
+    if state.state == STATE_UNKNOWN:
+        _LOGGER.debug(
+            "Unable to parse humidity sensor %s, state: %s",
+            state.entity_id,
+            state.state,
+        )
+        return None
+
+    if (hum := util.convert(state.state, float)) is None:
+        _LOGGER.debug(
+            "Unable to parse humidity sensor %s, state: %s",
+            state.entity_id,
+            state.state,
+        )
+        return None
+
+    if (unit := state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)) != PERCENTAGE:
+        _LOGGER.error(
+            "Humidity sensor %s has unsupported unit: %s %s",
+            state.entity_id,
+            unit,
+            " (allowed: %)",
+        )
+        return None
+
+    if hum > 100 or hum < 0:
+        _LOGGER.error(
+            "Humidity sensor %s is out of range: %s %s",
+            state.entity_id,
+            hum,
+            "(allowed: 0-100%)",
+        )
+        return None
+
+    return hum
@@ -0,0 +1,222 @@
+"""Plans the best time to vent within the hourly forecast of a weather entity."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, NamedTuple
+
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_time_interval
+import homeassistant.util.dt as dt_util
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+from .const import DOMAIN
+from .dispatcher import StateDispatcher
+from .model import (
+    DEFAULT_CONSTANTS,
+    DEFAULT_MAX_VENT_TIME,
+    calc_absolute_humidity,
+    calc_absolute_humidity_batch,
+    calc_time_to_vent_batch,
+    ventilation_heat_loss,
+)
+
+if TYPE_CHECKING:
+    from .sensor import VentTime
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_FORECAST_HUBS = "forecast_hubs"
+
+# Most weather integrations update their forecast hourly, the state changes more often
+FORECAST_REFRESH_INTERVAL = timedelta(minutes=30)
+FORECAST_COOLDOWN = 60 # s
+SLOT_LENGTH = timedelta(hours=1)
+
+
+class ForecastSlots(NamedTuple):
+    """The hourly forecast as parallel lists, temperatures in °C and relative humidities in %."""
+
+    start: list[datetime]
+    temp: list[float]
+    hum: list[float]
+
+
+def plan_venting(
+        indoor_temp,
+        indoor_hum,
+        outdoor_temp,
+        outdoor_hum,
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        max_vent_time=DEFAULT_MAX_VENT_TIME,
+        constants=DEFAULT_CONSTANTS,
+):
+    """Find the forecast slot venting in loses the least heat.
+
+    Takes the current indoor readings and arrays of the forecast outdoor temperatures and
+    relative humidities. All slots are evaluated in one vectorized pass. Returns the index
+    of the best slot with the vent times and heat losses of all slots, the index is None
+    if venting reaches the wished humidity in no slot.
+    """
+    import numpy as np
+
+    outdoor_temp = np.asarray(outdoor_temp, dtype=float)
+    if indoor_hum <= max_hum_allowed:
+        return None, np.zeros(outdoor_temp.shape), np.zeros(outdoor_temp.shape)
+    indoor_absolute_humidity = calc_absolute_humidity(indoor_hum, indoor_temp)
+    outdoor_absolute_humidity = calc_absolute_humidity_batch(outdoor_hum, outdoor_temp)
+    times = calc_time_to_vent_batch(
+        indoor_temp,
+        outdoor_temp,
+        indoor_absolute_humidity,
+        outdoor_absolute_humidity,
+        window_size,
+        room_volume,
+        max_hum_allowed,
+        max_vent_time,
+        constants,
+    )
+    heat_losses = ventilation_heat_loss(times, indoor_temp, outdoor_temp, window_size, room_volume, constants)
+
+    # Venting only helps with drier air outside and if it reaches the wished humidity in time
+    useful = (outdoor_absolute_humidity < indoor_absolute_humidity) & (times < max_vent_time)
+    if not useful.any():
+        return None, times, heat_losses
+    # The least heat lost, among equal losses the shortest vent time
+    return int(np.lexsort((times, np.where(useful, np.round(heat_losses), np.inf)))[0]), times, heat_losses
+
+
+class ForecastHub:
+    """Fetches the hourly forecast of one weather entity for all rooms planning with it."""
+
+    def __init__(self, hass: HomeAssistant, weather_entity: str) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.weather_entity = weather_entity
+        self.slots: ForecastSlots | None = None
+        # Increased with every new forecast, the rooms key their plans on it
+        self.version = 0
+        self._fetches = 0
+        self._rooms: set[VentTime] = set()
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=FORECAST_COOLDOWN,
+            immediate=True,
+            function=self._async_fetch,
+        )
+
+    @classmethod
+    @callback
+    def async_get(cls, hass: HomeAssistant, weather_entity: str) -> ForecastHub:
+        """Return the hub for the weather entity, creating it if necessary."""
+        hubs = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_FORECAST_HUBS, {})
+        if (hub := hubs.get(weather_entity)) is None:
+            hub = hubs[weather_entity] = cls(hass, weather_entity)
+        return hub
+
+    @callback
+    def async_add_room(self, room: VentTime) -> CALLBACK_TYPE:
+        """Add a room planning with the forecast and return a callback to remove it."""
+        if not self._rooms:
+            self._async_start()
+        self._rooms.add(room)
+
+        @callback
+        def remove_room() -> None:
+            self._rooms.discard(room)
+            if not self._rooms:
+                self._async_stop()
+
+        return remove_room
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return the state of the hub for the diagnostics."""
+        return {
+            "weather_entity": self.weather_entity,
+            "slots": len(self.slots.start) if self.slots is not None else None,
+            "version": self.version,
+            "fetches": self._fetches,
+            "rooms": len(self._rooms),
+        }
+
+    @callback
+    def _async_start(self) -> None:
+        """Fetch the forecast now, whenever the weather changes and at least every refresh interval."""
+        self._unsubs = [
+            StateDispatcher.async_get(self.hass).async_track([self.weather_entity], self._async_weather_changed),
+            async_track_time_interval(self.hass, self._async_weather_changed, FORECAST_REFRESH_INTERVAL),
+        ]
+        self.hass.async_create_task(self._debouncer.async_call())
+
+    @callback
+    def _async_stop(self) -> None:
+        while self._unsubs:
+            self._unsubs.pop()()
+        self._debouncer.async_cancel()
+        self.hass.data[DOMAIN][DATA_FORECAST_HUBS].pop(self.weather_entity, None)
+
+    @callback
+    def _async_weather_changed(self, _event: Event | datetime) -> None:
+        self.hass.async_create_task(self._debouncer.async_call())
+
+    async def _async_fetch(self) -> None:
+        """Fetch the hourly forecast and let the rooms plan with it."""
+        self._fetches += 1
+        try:
+            response = await self.hass.services.async_call(
+                "weather",
+                "get_forecasts",
+                {"entity_id": self.weather_entity, "type": "hourly"},
+                blocking=True,
+                return_response=True,
+            )
+        except HomeAssistantError as err:
+            _LOGGER.warning("Could not fetch the hourly forecast of %s: %s", self.weather_entity, err)
+            return
+        slots = self._parse(response.get(self.weather_entity, {}).get("forecast", []))
+        if slots == self.slots:
+            return
+        self.slots = slots
+        self.version += 1
+        for room in self._rooms:
+            room.async_forecast_updated()
+
+    def _parse(self, forecast: list[dict]) -> ForecastSlots | None:
+        """Take the slots with a temperature and a humidity, converted to °C"""
+        unit = self.hass.config.units.temperature_unit
+        slots = ForecastSlots([], [], [])
+        for entry in forecast:
+            if (
+                entry.get("temperature") is None
+                or entry.get("humidity") is None
+                or (start := dt_util.parse_datetime(entry.get("datetime", ""))) is None
+            ):
+                continue
+            slots.start.append(start)
+            slots.temp.append(TemperatureConverter.convert(entry["temperature"], unit, UnitOfTemperature.CELSIUS))
+            slots.hum.append(float(entry["humidity"]))
+        if not slots.start:
+            _LOGGER.debug("The forecast of %s has no slots with temperature and humidity", self.weather_entity)
+            return None
+        return slots
+
+    def upcoming(self, horizon: timedelta) -> ForecastSlots | None:
+        """Return the slots from the current one up to the horizon."""
+        if self.slots is None:
+            return None
+        now = dt_util.utcnow()
+        upcoming = ForecastSlots([], [], [])
+        for start, temp, hum in zip(*self.slots):
+            if start + SLOT_LENGTH > now and start < now + horizon:
+                upcoming.start.append(start)
+                upcoming.temp.append(temp)
+                upcoming.hum.append(hum)
+        return upcoming if upcoming.start else None
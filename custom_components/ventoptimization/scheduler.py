@@ -0,0 +1,97 @@
+"""Picks when a room is calculated again from how fast its readings change."""
+from __future__ import annotations
+
+import math
+
+# Changes of the readings that are worth a new calculation
+SIGNIFICANT_TEMP_CHANGE = 0.5 # °C
+SIGNIFICANT_HUMIDITY_CHANGE = 2 # %
+# Time constant of the moving average of the rates of change
+RATE_TIME_CONSTANT = 300 # s
+# While the readings settle the interval grows at most by this factor per calculation
+BACKOFF_FACTOR = 2
+
+# Order of the readings: indoor temperature, indoor humidity, outdoor temperature, outdoor humidity
+_SCALES = (SIGNIFICANT_TEMP_CHANGE, SIGNIFICANT_HUMIDITY_CHANGE, SIGNIFICANT_TEMP_CHANGE, SIGNIFICANT_HUMIDITY_CHANGE)
+INDOOR_TEMP, INDOOR_HUMIDITY, OUTDOOR_TEMP, OUTDOOR_HUMIDITY = range(4)
+
+
+class UpdateScheduler:
+    """Estimates the rates of change of the readings of a room.
+
+    The rate of a reading changing by dv after dt seconds is weighted with
+    1 - exp(-dt/RATE_TIME_CONSTANT) in a moving average. The rates keep their sign, so a
+    reading jittering around a value averages out while a trend adds up. Without
+    changes the rates decay with the same time constant. The rates dilute a sudden step
+    after a quiet period, so a significant change since the last calculation or an indoor
+    humidity crossing max_hum_allowed is due right away.
+    """
+
+    def __init__(self, max_hum_allowed, min_interval, max_interval) -> None:
+        """Initialize the scheduler."""
+        self.max_hum_allowed = max_hum_allowed
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._changes: list[tuple[float, float] | None] = [None]*4
+        self._rates = [0.0]*4
+        self._indoor_hum = None
+        self._calculated = None
+        # The readings the last calculation was made with
+        self._calculated_values: list[float | None] = [None]*4
+        # Interval after the last calculation, the base of the backoff
+        self.interval: float | None = None
+
+    def observe(self, reading: int, value, time: float) -> None:
+        """Take a reading, time is in seconds."""
+        if value is None:
+            return
+        if reading == INDOOR_HUMIDITY:
+            self._indoor_hum = value
+        last = self._changes[reading]
+        if last is not None:
+            last_time, last_value = last
+            if value == last_value or time <= last_time:
+                return
+            elapsed = time - last_time
+            weight = 1 - math.exp(-elapsed/RATE_TIME_CONSTANT)
+            self._rates[reading] += weight*((value - last_value)/elapsed - self._rates[reading])
+        self._changes[reading] = (time, value)
+
+    def rate(self, reading: int, time: float) -> float:
+        """Return the rate of change of a reading per second, negative if it falls."""
+        if (last := self._changes[reading]) is None:
+            return 0.0
+        return self._rates[reading]*math.exp(-(time - last[0])/RATE_TIME_CONSTANT)
+
+    def calculated(self, time: float) -> None:
+        """Note that the room was calculated."""
+        self._calculated = time
+        self._calculated_values = [change[1] if change is not None else None for change in self._changes]
+        self.interval = self._next_interval(time)
+
+    def delay(self, time: float) -> float:
+        """Return the seconds until the next calculation is due, 0 if it is due."""
+        if self._calculated is None or self._changed_significantly():
+            return 0.0
+        return max(0.0, self._calculated + self._next_interval(time) - time)
+
+    def _changed_significantly(self):
+        """Return whether the readings moved enough since the last calculation to calculate again"""
+        for change, calculated, scale in zip(self._changes, self._calculated_values, _SCALES):
+            if change is not None and calculated is not None and abs(change[1] - calculated) >= scale:
+                return True
+        calculated = self._calculated_values[INDOOR_HUMIDITY]
+        if calculated is None or self._indoor_hum is None:
+            return False
+        return (calculated > self.max_hum_allowed) != (self._indoor_hum > self.max_hum_allowed)
+
+    def _next_interval(self, time):
+        speed = max(abs(self.rate(reading, time))/scale for reading, scale in enumerate(_SCALES))
+        interval = 1/speed if speed > 0 else math.inf
+        # Approaching the wished humidity the vent time changes the most
+        if (rate := self.rate(INDOOR_HUMIDITY, time)) and self._indoor_hum is not None:
+            if (time_to_threshold := (self.max_hum_allowed - self._indoor_hum)/rate) >= 0:
+                interval = min(interval, time_to_threshold/2)
+        if self.interval is not None:
+            interval = min(interval, self.interval*BACKOFF_FACTOR)
+        return min(self.max_interval, max(self.min_interval, interval))
@@ -1,44 +1,120 @@
 """Calculates how long one has to vent for a given values."""
 from __future__ import annotations
 
+from datetime import timedelta
 import logging
-import math
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, NamedTuple
 
 import voluptuous as vol
 
-from homeassistant import util
-from homeassistant.components.sensor import PLATFORM_SCHEMA, SensorEntity
+from homeassistant.components.sensor import (
+    PLATFORM_SCHEMA,
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    ATTR_UNIT_OF_MEASUREMENT,
     CONF_NAME,
-    UnitOfTime,
     PERCENTAGE,
-    EVENT_HOMEASSISTANT_START,
-    STATE_UNKNOWN,
+    UnitOfEnergy,
     UnitOfTemperature,
+    UnitOfTime,
+    STATE_ON,
+    STATE_UNKNOWN,
 )
 from homeassistant.core import HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers import entity_platform, entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
-from homeassistant.util.unit_conversion import TemperatureConverter
-from homeassistant.util.unit_system import METRIC_SYSTEM
+import homeassistant.util.dt as dt_util
 
 from .const import *
+from .cache import VentTimeCache, cached_e_s, vent_time_key
+from .calibration import CALIBRATION_MAX_SAMPLES, Calibration, DecayTracker, episode_stats
+from .dispatcher import StateDispatcher
+from .hub import OutdoorHub
+from .model import (
+    DEFAULT_CONSTANTS,
+    Solution,
+    calc_dew_point,
+    forecast,
+    solve_time_to_vent,
+    surface_temperature,
+    vent_time_percentiles,
+    ventilation_heat_loss,
+)
+from .parsing import parse_humidity, parse_temperature
+from .planner import ForecastHub, plan_venting
+from .scheduler import INDOOR_HUMIDITY, INDOOR_TEMP, OUTDOOR_HUMIDITY, OUTDOOR_TEMP, UpdateScheduler
+from .stats import PerfStats
+
+if TYPE_CHECKING:
+    from .table import VentTimeTable
 
 _LOGGER = logging.getLogger(__name__)
 
 ATTR_MAXIMUM_HUMIDITY = "maximum_possible_indoor_absolute_humidity"
 ATTR_INDOOR_ABSOLUTE_HUMIDITY = "absolute_humidity_inside"
 ATTR_OUTDOOR_ABSOLUTE_HUMIDITY = "absolute_humidity_outside"
+ATTR_PERFORMANCE = "performance"
+ATTR_FORECAST = "forecast"
+ATTR_TRACKING = "tracking"
+# Percentiles of the vent time under the measurement errors of the sensors
+ATTR_VENT_TIME_LOWER = "vent_time_lower"
+ATTR_VENT_TIME_UPPER = "vent_time_upper"
+# Best forecast slot to vent in
+ATTR_PLAN = "plan"
+# Change with nearly every reading, the options can leave them out of the recorder
+HIGH_CHURN_ATTRIBUTES = frozenset({ATTR_INDOOR_ABSOLUTE_HUMIDITY, ATTR_OUTDOOR_ABSOLUTE_HUMIDITY})
 
-# Parameters of the model
-k_1 = 49.9737675 
-k_2 = 2.28452262
-k_3 = 49.3679433
-k_4 = 8.39747826
+
+
+class RoomConditions(NamedTuple):
+    """Quantities derived from the readings of a room, calculated once per state."""
+
+    # Air without any vapour has no dew point
+    dew_point: float | None
+    surface_humidity: float | None
+    heat_loss: float
+
+
+DEW_POINT = SensorEntityDescription(
+    key="dew_point",
+    name="Dew Point",
+    device_class=SensorDeviceClass.TEMPERATURE,
+    state_class=SensorStateClass.MEASUREMENT,
+    native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    suggested_display_precision=1,
+    entity_registry_enabled_default=False,
+)
+# Relative humidity at the coldest surface, above about 70 % mold can grow there
+SURFACE_HUMIDITY = SensorEntityDescription(
+    key="surface_humidity",
+    name="Mold Risk Humidity",
+    device_class=SensorDeviceClass.HUMIDITY,
+    state_class=SensorStateClass.MEASUREMENT,
+    native_unit_of_measurement=PERCENTAGE,
+    suggested_display_precision=0,
+)
+# Heat to warm the room air back up after venting for the vent time
+HEAT_LOSS = SensorEntityDescription(
+    key="heat_loss",
+    name="Ventilation Heat Loss",
+    device_class=SensorDeviceClass.ENERGY,
+    native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+    suggested_display_precision=0,
+    entity_registry_enabled_default=False,
+)
+
+SERVICE_START_VENTING = "start_venting"
+SERVICE_STOP_VENTING = "stop_venting"
+SERVICE_RESET_CALIBRATION = "reset_calibration"
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
@@ -46,13 +122,41 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
         vol.Required(CONF_OUTDOOR_TEMP): cv.entity_id,
         vol.Required(CONF_INDOOR_HUMIDITY): cv.entity_id,
         vol.Required(CONF_OUTDOOR_HUMIDITY): cv.entity_id,
+        vol.Optional(CONF_WINDOW_SENSOR): cv.entity_id,
+        vol.Optional(CONF_WEATHER_ENTITY): cv.entity_id,
         vol.Optional(CONF_MAX_ALLOWED_HUMIDITY): vol.Coerce(float),
+        vol.Optional(CONF_SURFACE_FACTOR): vol.All(vol.Coerce(float), vol.Range(min=1)),
         vol.Optional(CONF_ROOM_VOLUME): vol.Coerce(float),
         vol.Optional(CONF_WINDOW_SIZE): vol.Coerce(float),
+        vol.Optional(CONF_MAX_VENT_TIME, default=DEFAULT_MAX_VENT_TIME): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional(CONF_UPDATE_DELAY, default=DEFAULT_UPDATE_DELAY): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_TEMP_DEADBAND, default=DEFAULT_TEMP_DEADBAND): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_HUMIDITY_DEADBAND, default=DEFAULT_HUMIDITY_DEADBAND): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_CACHE_SIZE, default=DEFAULT_CACHE_SIZE): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_TABLE_MODE, default=DEFAULT_TABLE_MODE): cv.boolean,
+        vol.Optional(CONF_PERFORMANCE_STATS, default=DEFAULT_PERFORMANCE_STATS): cv.boolean,
+        vol.Optional(CONF_FORECAST_RESOLUTION, default=DEFAULT_FORECAST_RESOLUTION): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+        vol.Optional(CONF_TRACKING_INTERVAL, default=DEFAULT_TRACKING_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional(CONF_MAX_UPDATE_INTERVAL, default=DEFAULT_MAX_UPDATE_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_STALE_AFTER, default=DEFAULT_STALE_AFTER): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_STATE_TOLERANCE, default=DEFAULT_STATE_TOLERANCE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_ATTRIBUTE_TOLERANCE, default=DEFAULT_ATTRIBUTE_TOLERANCE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_HEARTBEAT, default=DEFAULT_HEARTBEAT): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional(CONF_RECORD_ABSOLUTE_HUMIDITY, default=DEFAULT_RECORD_ABSOLUTE_HUMIDITY): cv.boolean,
+        vol.Optional(CONF_UNCERTAINTY_SAMPLES, default=DEFAULT_UNCERTAINTY_SAMPLES): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_PLANNING_HORIZON, default=DEFAULT_PLANNING_HORIZON): vol.All(vol.Coerce(float), vol.Range(min=1)),
         vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
     }
 )
 
+
+def _async_register_services() -> None:
+    """Register the services calibrating the model of a room."""
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(SERVICE_START_VENTING, {}, "async_start_venting")
+    platform.async_register_entity_service(SERVICE_STOP_VENTING, {}, "async_stop_venting")
+    platform.async_register_entity_service(SERVICE_RESET_CALIBRATION, {}, "async_reset_calibration")
+
 async def async_setup_platform(
     hass: HomeAssistant,
     config: ConfigType,
@@ -69,8 +173,7 @@ async def async_setup_platform(
     window_size = config.get(CONF_WINDOW_SIZE)
     room_volume = config.get(CONF_ROOM_VOLUME)
 
-    async_add_entities([
-        VentTime(
+    room = VentTime(
             name,
             indoor_temp_sensor,
             outdoor_temp_sensor,
@@ -79,7 +182,13 @@ async def async_setup_platform(
             max_humidity_allowed,
             window_size,
             room_volume,
-        )])
+            config,
+            window_sensor=config.get(CONF_WINDOW_SENSOR),
+            weather_entity=config.get(CONF_WEATHER_ENTITY),
+            surface_factor=config.get(CONF_SURFACE_FACTOR),
+    )
+    async_add_entities([room, *room.condition_sensors()])
+    _async_register_services()
 
 async def async_setup_entry(
         hass: HomeAssistant,
@@ -87,33 +196,59 @@ async def async_setup_entry(
         async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up Vent time sensor through the UI."""
-    name = config_entry.data.get(CONF_NAME, DEFAULT_NAME)
-    indoor_temp_sensor = config_entry.data.get(CONF_INDOOR_TEMP)
-    outdoor_temp_sensor = config_entry.data.get(CONF_OUTDOOR_TEMP)
-    indoor_humidity_sensor = config_entry.data.get(CONF_INDOOR_HUMIDITY)
-    outdoor_humidity_sensor = config_entry.data.get(CONF_OUTDOOR_HUMIDITY)
-    max_humidity_allowed = config_entry.data.get(CONF_MAX_ALLOWED_HUMIDITY)
-    window_size = config_entry.data.get(CONF_WINDOW_SIZE)
-    room_volume = config_entry.data.get(CONF_ROOM_VOLUME)
-
-    async_add_entities([
+    # A building entry holds many rooms sharing its outdoor sensors
+    if CONF_ROOMS in config_entry.data:
+        outdoor = {key: config_entry.data.get(key) for key in (CONF_OUTDOOR_TEMP, CONF_OUTDOOR_HUMIDITY, CONF_WEATHER_ENTITY)}
+        rooms = [{**outdoor, **room} for room in config_entry.data[CONF_ROOMS]]
+        # Rooms of different buildings may have the same name
+        prefix = f"{config_entry.entry_id}_"
+        await _async_migrate_unique_ids(hass, config_entry, prefix)
+    else:
+        rooms = [config_entry.data]
+        prefix = ""
+
+    entities = [
         VentTime(
-            name,
-            indoor_temp_sensor,
-            outdoor_temp_sensor,
-            indoor_humidity_sensor,
-            outdoor_humidity_sensor,
-            max_humidity_allowed,
-            window_size,
-            room_volume,
+            room.get(CONF_NAME, DEFAULT_NAME),
+            room.get(CONF_INDOOR_TEMP),
+            room.get(CONF_OUTDOOR_TEMP),
+            room.get(CONF_INDOOR_HUMIDITY),
+            room.get(CONF_OUTDOOR_HUMIDITY),
+            room.get(CONF_MAX_ALLOWED_HUMIDITY),
+            room.get(CONF_WINDOW_SIZE),
+            room.get(CONF_ROOM_VOLUME),
+            config_entry.options,
+            window_sensor=room.get(CONF_WINDOW_SENSOR),
+            weather_entity=room.get(CONF_WEATHER_ENTITY),
+            surface_factor=room.get(CONF_SURFACE_FACTOR),
+            unique_id=f"{prefix}{str(room.get(CONF_NAME, DEFAULT_NAME)).lower()}",
         )
-    ])
+        for room in rooms
+    ]
+    # Keep the entities around for the diagnostics
+    hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ENTITIES, {})[config_entry.entry_id] = entities
+    async_add_entities([*entities, *(sensor for entity in entities for sensor in entity.condition_sensors())])
+    _async_register_services()
+
+
+async def _async_migrate_unique_ids(hass: HomeAssistant, config_entry: ConfigEntry, prefix: str) -> None:
+    """Prefix the unique ids the entities of a building had before with its entry id."""
+
+    @callback
+    def migrate(entity_entry: er.RegistryEntry) -> dict | None:
+        if entity_entry.unique_id.startswith(prefix):
+            return None
+        return {"new_unique_id": f"{prefix}{entity_entry.unique_id}"}
+
+    await er.async_migrate_entries(hass, config_entry.entry_id, migrate)
 
 
 class VentTime(SensorEntity):
     """Represents a Vent time sensor."""
 
     _attr_should_poll = False
+    _attr_suggested_display_precision = 0
+    _unrecorded_attributes = frozenset({ATTR_PERFORMANCE, ATTR_FORECAST})
 
     def __init__(
             self,
@@ -125,11 +260,18 @@ class VentTime(SensorEntity):
             max_humidity_allowed,
             window_size,
             room_volume,
+            options=None,
+            window_sensor=None,
+            weather_entity=None,
+            surface_factor=None,
+            unique_id=None,
     ):
         """Initialize the sensor."""
         self._name = name
         self._state = None
-        self._unique_id = str(name).lower()
+        # The calibrations of the rooms of an entry are stored by the name of the room
+        self._calibration_key = str(name).lower()
+        self._unique_id = unique_id or self._calibration_key
 
         self._indoor_temp_sensor = indoor_temp_sensor
         self._indoor_humidity_sensor = indoor_humidity_sensor
@@ -138,13 +280,63 @@ class VentTime(SensorEntity):
         self._max_hum_allowed = max_humidity_allowed
         self._window_size = window_size
         self._room_volume = room_volume
+        self._window_sensor = window_sensor
+        self._weather_entity = weather_entity
+        self._surface_factor = surface_factor
+
+        self._stats = None
+        self._scheduler: UpdateScheduler | None = None
+        self._set_options(options or {})
+        self._constants = DEFAULT_CONSTANTS
+        self._solver_evaluations = 0
+        # The last solution, the solver starts its search from there
+        self._solution: Solution | None = None
+        # The forecast and the readings it was predicted from
+        self._forecast = None
+        self._forecast_inputs = None
+        # The uncertainty band and the readings it was sampled around
+        self._uncertainty = None
+        self._uncertainty_inputs = None
+        # The plan and what it was planned from
+        self._plan = None
+        self._plan_key = None
+        self._forecast_hub: ForecastHub | None = None
+        # The derived quantities, what they were derived from and the sensors showing them
+        self._conditions: RoomConditions | None = None
+        self._conditions_key = None
+        self._dependents: set[RoomConditionSensor] = set()
         self._available = False
         self._entities = {
             self._indoor_temp_sensor,
             self._indoor_humidity_sensor,
-            self._outdoor_temp_sensor,
-            self._outdoor_humidity_sensor,
         }
+        if window_sensor is not None:
+            self._entities.add(window_sensor)
+        # Fit of the decay measured since the window was opened, None while it is closed
+        self._tracker: DecayTracker | None = None
+        self._tracking_start = None
+        self._unsub_tracking = None
+        # Pending calculation of a deferred reading or of readings becoming stale
+        self._unsub_reevaluation = None
+        self._reevaluation_due = None
+        # What was written last and when, to hold back insignificant changes
+        self._published = None
+        self._published_at = None
+        self._unsub_heartbeat = None
+        self._outdoor: OutdoorHub | None = None
+        self._debouncer: Debouncer | None = None
+        # Whether the sensor is added to Home Assistant and uses the hubs above
+        self._attached = False
+        self._cache: VentTimeCache | None = None
+        self._uncertainty_cache: VentTimeCache | None = None
+        self._table: VentTimeTable | None = None
+        self._release_shared = []
+        self._calibration = Calibration()
+        # Samples of the running venting episode as (time, indoor temp, indoor AH, outdoor temp, outdoor AH)
+        self._episode = None
+        self._episode_start = None
+        # Readings the current state was calculated from, to apply the dead-band to
+        self._calculated_inputs = None
 
         self._indoor_absolute_humidity = None
         self._outdoor_absolute_humidity = None
@@ -155,6 +347,8 @@ class VentTime(SensorEntity):
 
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
+        self._attached = True
+        self.async_on_remove(self._async_detach)
 
         @callback
         def vent_time_sensors_state_listener(event):
@@ -169,31 +363,67 @@ class VentTime(SensorEntity):
                 new_state,
             )
 
-            if self._update_sensor(entity, old_state, new_state):
-                self.async_schedule_update_ha_state(True)
+            if self._stats is not None:
+                self._stats.count("events")
+
+            if entity == self._window_sensor:
+                self._async_window_changed(new_state)
+                return
+            if not self._update_sensor(entity, old_state, new_state):
+                return
+            if self._episode is not None:
+                self._record_sample()
+            if self._tracker is not None:
+                # Only the fit is updated, the state is written at the tracking interval
+                self._track_sample()
+            elif self.inputs_changed:
+                self.async_request_update()
+            elif self._stats is not None:
+                self._stats.count("skipped")
 
-        async_track_state_change_event(
-            self.hass, list(self._entities), vent_time_sensors_state_listener
+        # Coalesce readings arriving in a burst, e.g. temperature and humidity of one sensor
+        self._debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=self._update_delay,
+            immediate=False,
+            function=self._async_debounced_update,
         )
+        self.async_on_remove(self._debouncer.async_cancel)
+        self.async_on_remove(self._async_cancel_reevaluation)
+        self.async_on_remove(self._async_cancel_heartbeat)
+        self._async_update_unrecorded_attributes()
+
+        # All rooms share one subscription routing the events by entity id
+        self.async_on_remove(
+            StateDispatcher.async_get(self.hass).async_track(self._entities, vent_time_sensors_state_listener)
+        )
+
+        # The outdoor sensors are tracked once for all rooms sharing them
+        self._outdoor = OutdoorHub.async_get(
+            self.hass, self._outdoor_temp_sensor, self._outdoor_humidity_sensor
+        )
+        self.async_on_remove(self._outdoor.async_add_room(self))
+
+        if self._weather_entity is not None:
+            self._forecast_hub = ForecastHub.async_get(self.hass, self._weather_entity)
+            self.async_on_remove(self._forecast_hub.async_add_room(self))
+
+        if (entry := self._config_entry) is not None and self._calibration_key in entry.data.get(CONF_CALIBRATION, {}):
+            self._calibration = Calibration(entry.data[CONF_CALIBRATION][self._calibration_key])
+            self._constants = self._calibration.constants(self._window_size, self._room_volume)
+
+        self._async_acquire_shared()
+        self.async_on_remove(self._async_release_shared)
 
         # Read initial state
         indoor_temp = self.hass.states.get(self._indoor_temp_sensor)
-        outdoor_temp = self.hass.states.get(self._outdoor_temp_sensor)
         indoor_hum = self.hass.states.get(self._indoor_humidity_sensor)
-        outdoor_hum = self.hass.states.get(self._outdoor_humidity_sensor)
 
         schedule_update = self._update_sensor(
             self._indoor_temp_sensor, None, indoor_temp
         )
 
-        schedule_update = (
-            False
-            if not self._update_sensor(
-                self._outdoor_temp_sensor, None, outdoor_temp
-            )
-            else schedule_update
-        )
-
         schedule_update = (
             False
             if not self._update_sensor(
@@ -202,16 +432,115 @@ class VentTime(SensorEntity):
             else schedule_update
         )
 
-        schedule_update = (
-            False
-            if not self._update_sensor(
-                self._outdoor_humidity_sensor, None, outdoor_hum
-            )
-            else schedule_update
-        )
-
         if schedule_update:
-            self.async_schedule_update_ha_state(True)
+            # Rooms added together are calculated together
+            self._outdoor.async_schedule_refresh()
+
+        if self._window_sensor is not None:
+            self.async_on_remove(self._async_stop_tracking)
+            self._async_window_changed(self.hass.states.get(self._window_sensor))
+
+    def _set_options(self, options):
+        self._max_vent_time = options.get(CONF_MAX_VENT_TIME, DEFAULT_MAX_VENT_TIME)
+        self._update_delay = options.get(CONF_UPDATE_DELAY, DEFAULT_UPDATE_DELAY)
+        self._temp_deadband = options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND)
+        self._humidity_deadband = options.get(CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND)
+        self._cache_size = int(options.get(CONF_CACHE_SIZE, DEFAULT_CACHE_SIZE))
+        self._table_mode = options.get(CONF_TABLE_MODE, DEFAULT_TABLE_MODE)
+        if options.get(CONF_PERFORMANCE_STATS, DEFAULT_PERFORMANCE_STATS):
+            self._stats = self._stats or PerfStats()
+        else:
+            self._stats = None
+        self._forecast_resolution = options.get(CONF_FORECAST_RESOLUTION, DEFAULT_FORECAST_RESOLUTION)
+        self._uncertainty_samples = int(options.get(CONF_UNCERTAINTY_SAMPLES, DEFAULT_UNCERTAINTY_SAMPLES))
+        self._planning_horizon = timedelta(hours=options.get(CONF_PLANNING_HORIZON, DEFAULT_PLANNING_HORIZON))
+        self._tracking_interval = options.get(CONF_TRACKING_INTERVAL, DEFAULT_TRACKING_INTERVAL)
+        self._stale_after = options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER)
+        self._state_tolerance = options.get(CONF_STATE_TOLERANCE, DEFAULT_STATE_TOLERANCE)
+        self._attribute_tolerance = options.get(CONF_ATTRIBUTE_TOLERANCE, DEFAULT_ATTRIBUTE_TOLERANCE)
+        self._heartbeat = options.get(CONF_HEARTBEAT, DEFAULT_HEARTBEAT)
+        self._record_absolute_humidity = options.get(CONF_RECORD_ABSOLUTE_HUMIDITY, DEFAULT_RECORD_ABSOLUTE_HUMIDITY)
+        if max_update_interval := options.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL):
+            self._scheduler = self._scheduler or UpdateScheduler(self._max_hum_allowed, self._update_delay, max_update_interval)
+            self._scheduler.min_interval = self._update_delay
+            self._scheduler.max_interval = max_update_interval
+        else:
+            self._scheduler = None
+
+    @callback
+    def async_set_options(self, options, room=None):
+        """Apply new options and room parameters to the running sensor instead of setting it up again."""
+        if room is not None:
+            self._max_hum_allowed = room.get(CONF_MAX_ALLOWED_HUMIDITY)
+            self._window_size = room.get(CONF_WINDOW_SIZE)
+            self._room_volume = room.get(CONF_ROOM_VOLUME)
+            # The calibration is fitted for the size of the room
+            self._constants = self._calibration.constants(self._window_size, self._room_volume)
+            self._solution = None
+        self._set_options(options)
+        if self._scheduler is not None:
+            self._scheduler.max_hum_allowed = self._max_hum_allowed
+        # A sensor not added, e.g. disabled in the registry, uses the options once it is
+        if not self._attached:
+            return
+        self._debouncer.cooldown = self._update_delay
+        self._outdoor.update_cooldown()
+        # The cache and table are keyed on the maximum vent time
+        self._async_release_shared()
+        self._async_acquire_shared()
+        self._calculated_inputs = None
+        self._forecast_inputs = self._uncertainty_inputs = self._plan_key = None
+        self._async_update_unrecorded_attributes()
+        # The tolerances may have changed, the recalculation writes the state
+        self._published = None
+        if self._tracker is not None:
+            self._async_schedule_tracking()
+        self._outdoor.async_schedule_refresh()
+
+    @callback
+    def _async_detach(self):
+        self._attached = False
+
+    @callback
+    def _async_update_unrecorded_attributes(self):
+        """Leave the absolute humidities out of the recorder unless the options want them."""
+        if self._state_info is None:
+            return
+        # The recorder reads the attributes to leave out from the state info of each entity
+        unrecorded = self._state_info["unrecorded_attributes"] - HIGH_CHURN_ATTRIBUTES
+        if not self._record_absolute_humidity:
+            unrecorded |= HIGH_CHURN_ATTRIBUTES
+        self._state_info["unrecorded_attributes"] = unrecorded
+
+    @property
+    def _config_entry(self) -> ConfigEntry | None:
+        """Return the config entry of the sensor, None if it is set up in YAML."""
+        return self.platform.config_entry if self.platform is not None else None
+
+    @callback
+    def _async_acquire_shared(self):
+        """Join the cache and table of all rooms with the same parameters."""
+        room_key = (self._window_size, self._room_volume, self._max_hum_allowed, self._max_vent_time, self._constants)
+        if self._cache_size:
+            self._cache = VentTimeCache.async_get(self.hass, room_key, self._cache_size)
+            self._release_shared.append(self._cache.async_acquire())
+            if self._uncertainty_samples:
+                self._uncertainty_cache = VentTimeCache.async_get(
+                    self.hass, (*room_key, ATTR_VENT_TIME_LOWER, self._uncertainty_samples), self._cache_size
+                )
+                self._release_shared.append(self._uncertainty_cache.async_acquire())
+        if self._table_mode:
+            # The table needs NumPy, only load it when it is used
+            from .table import VentTimeTable
+
+            self._table = VentTimeTable.async_get(self.hass, room_key)
+            self._release_shared.append(self._table.async_acquire())
+
+    @callback
+    def _async_release_shared(self):
+        while self._release_shared:
+            self._release_shared.pop()()
+        self._cache = self._uncertainty_cache = self._table = None
 
     def _update_sensor(self, entity, old_state, new_state):
         """Update information based on new sensor states."""
@@ -225,160 +554,447 @@ class VentTime(SensorEntity):
             return False
 
         if entity == self._indoor_temp_sensor:
-            self._indoor_temp = VentTime._update_temp_sensor(new_state)
-        if entity == self._outdoor_temp_sensor:
-            self._outdoor_temp = VentTime._update_temp_sensor(new_state)
+            self._indoor_temp = parse_temperature(new_state)
         if entity == self._indoor_humidity_sensor:
-            self._indoor_hum = VentTime._update_hum_sensor(new_state)
-        if entity == self._outdoor_humidity_sensor:
-            self._outdoor_hum = VentTime._update_hum_sensor(new_state)
+            self._indoor_hum = parse_humidity(new_state)
+
+        if None in (self._indoor_temp, self._indoor_hum):
+            self._indoor_absolute_humidity = None
+        else:
+            self._calc_indoor_absolute_humidity()
 
         return True
 
-    @staticmethod
-    def _update_temp_sensor(state):
-        """Parse temperature sensor value."""
-        _LOGGER.debug("Updating temp sensor with value %s", state.state)
+    @callback
+    def async_request_update(self):
+        """Recalculate the state, after the update delay if one is configured."""
+        if not self.update_due():
+            self.async_defer_update()
+        elif self._update_delay:
+            self.hass.async_create_task(self._debouncer.async_call())
+        else:
+            self.async_recalculate()
 
-        # Return an error if the sensor change its state to Unknown.
-        if state.state == STATE_UNKNOWN:
-            _LOGGER.debug(
-                "Unable to parse temperature sensor %s with state: %s",
-                state.entity_id,
-                state.state,
-            )
-            return None
+    async def _async_debounced_update(self):
+        # The hub may have recalculated this room in the meantime
+        if self.inputs_changed:
+            self.async_recalculate()
 
-        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    def update_due(self):
+        """Take the current readings and return whether the adaptive schedule allows a calculation."""
+        if self._scheduler is None:
+            return True
+        now = monotonic()
+        for reading, value in (
+            (INDOOR_TEMP, self._indoor_temp),
+            (INDOOR_HUMIDITY, self._indoor_hum),
+            (OUTDOOR_TEMP, self._outdoor.temp),
+            (OUTDOOR_HUMIDITY, self._outdoor.hum),
+        ):
+            self._scheduler.observe(reading, value, now)
+        return self._scheduler.delay(now) == 0
 
-        if (temp := util.convert(state.state, float)) is None:
-            _LOGGER.debug(
-                "Unable to parse temperature sensor %s with state: %s",
-                state.entity_id,
-                state.state,
-            )
-            return None
+    @callback
+    def async_defer_update(self):
+        """Calculate the room once the adaptive schedule makes it due."""
+        self._async_schedule_reevaluation(self._scheduler.delay(monotonic()))
+
+    @callback
+    def _async_schedule_reevaluation(self, delay):
+        """Calculate the room in delay seconds unless it is already due earlier"""
+        due = monotonic() + delay
+        if self._unsub_reevaluation is not None:
+            if self._reevaluation_due <= due:
+                return
+            self._unsub_reevaluation()
+        self._reevaluation_due = due
+        self._unsub_reevaluation = async_call_later(self.hass, delay, self._async_reevaluate)
+
+    @callback
+    def _async_reevaluate(self, _now):
+        self._unsub_reevaluation = None
+        self.async_recalculate()
+
+    @callback
+    def _async_cancel_reevaluation(self):
+        if self._unsub_reevaluation is not None:
+            self._unsub_reevaluation()
+            self._unsub_reevaluation = None
+
+    @callback
+    def _async_calculated(self):
+        """Plan the next calculation after the state was calculated."""
+        if self._scheduler is not None:
+            self._scheduler.calculated(monotonic())
+        if self._stale_after and (oldest := self._oldest_reading()) is not None:
+            stale_in = (oldest + timedelta(minutes=self._stale_after) - dt_util.utcnow()).total_seconds()
+            if stale_in > 0:
+                self._async_schedule_reevaluation(stale_in)
+
+    def _oldest_reading(self):
+        """Return when the least recently updated input sensor was updated"""
+        states = [
+            self.hass.states.get(entity_id)
+            for entity_id in (self._indoor_temp_sensor, self._indoor_humidity_sensor, self._outdoor_temp_sensor, self._outdoor_humidity_sensor)
+        ]
+        return min((state.last_updated for state in states if state is not None), default=None)
+
+    @property
+    def inputs_stale(self):
+        """Return whether a reading is older than the configured maximum age."""
+        if not self._stale_after or (oldest := self._oldest_reading()) is None:
+            return False
+        return dt_util.utcnow() - oldest > timedelta(minutes=self._stale_after)
 
-        # convert to celsius if necessary
-        if unit == UnitOfTemperature.FAHRENHEIT:
-            return TemperatureConverter.convert(
-                temp, UnitOfTemperature.FAHRENHEIT, UnitOfTemperature.CELSIUS
+    @property
+    def update_delay(self):
+        """Return how long readings are coalesced before recalculating."""
+        return self._update_delay
+
+    @property
+    def inputs_changed(self):
+        """Return whether a reading moved out of the dead-band since the last calculation."""
+        if self._tracker is not None:
+            # While the window is open the state follows the tracker instead
+            return False
+        inputs = (self._indoor_temp, self._indoor_hum, self._outdoor.temp, self._outdoor.hum)
+        last = self._calculated_inputs
+        if last is None or None in inputs or None in last:
+            return inputs != last
+        return any(
+            0 < abs(value - last_value) >= deadband
+            for value, last_value, deadband in zip(
+                inputs,
+                last,
+                (self._temp_deadband, self._humidity_deadband, self._temp_deadband, self._humidity_deadband),
             )
-        if unit == UnitOfTemperature.CELSIUS:
-            return temp
-        _LOGGER.error(
-            "Temp sensor %s has unsupported unit: %s (allowed: %s, %s)",
-            state.entity_id,
-            unit,
-            UnitOfTemperature.CELSIUS,
-            UnitOfTemperature.FAHRENHEIT,
         )
 
+    @property
+    def model_inputs(self):
+        """Return the indoor readings and room parameters the model needs, None if incomplete or stale."""
+        if self._indoor_absolute_humidity is None or self.inputs_stale:
+            return None
+        return (
+            self._indoor_temp,
+            self._indoor_absolute_humidity,
+            self._window_size,
+            self._room_volume,
+            self._max_hum_allowed,
+            self._max_vent_time,
+            self._constants,
+        )
+
+    @property
+    def cached_time_to_vent(self):
+        """Return the vent time for the current readings if it is cached or in the table."""
+        if self._cache is not None and (time := self._cache.get(self._cache_key())) is not None:
+            return time
+        if self._table is not None:
+            return self._table.lookup(self._indoor_temp, self._indoor_hum, self._outdoor.temp, self._outdoor.hum)
         return None
 
-    @staticmethod
-    def _update_hum_sensor(state):
-        """Parse humidity sensor value."""
-        _LOGGER.debug("Updating humidity sensor with value %s", state.state)
+    def _cache_key(self):
+        return vent_time_key(self._indoor_temp, self._indoor_hum, self._outdoor.temp, self._outdoor.hum)
 
-        # Return an error if the sensor change its state to Unknown.
-        if state.state == STATE_UNKNOWN:
-            _LOGGER.debug(
-                "Unable to parse humidity sensor %s, state: %s",
-                state.entity_id,
-                state.state,
-            )
-            return None
+    def _update_outdoor(self):
+        """Take over the current outdoor conditions from the hub."""
+        self._outdoor_temp = self._outdoor.temp
+        self._outdoor_hum = self._outdoor.hum
+        self._outdoor_absolute_humidity = self._outdoor.absolute_humidity
+        self._calculated_inputs = (self._indoor_temp, self._indoor_hum, self._outdoor_temp, self._outdoor_hum)
 
-        if (hum := util.convert(state.state, float)) is None:
-            _LOGGER.debug(
-                "Unable to parse humidity sensor %s, state: %s",
-                state.entity_id,
-                state.state,
-            )
-            return None
+    @callback
+    def async_set_time_to_vent(self, time, cached=False):
+        """Publish a vent time the hub calculated for this room in a batch or found cached."""
+        if self._stats is not None:
+            self._stats.count("cache_hits" if cached else "batch_recomputes")
+        if self._cache is not None and not cached:
+            self._cache.put(self._cache_key(), time)
+        self._update_outdoor()
+        self._state = round(time, 2)
+        self._available = True
+        _LOGGER.debug("You have to vent %s minutes", self._state)
+        self._async_calculated()
+        self._async_publish()
 
-        if (unit := state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)) != PERCENTAGE:
-            _LOGGER.error(
-                "Humidity sensor %s has unsupported unit: %s %s",
-                state.entity_id,
-                unit,
-                " (allowed: %)",
-            )
-            return None
+    async def async_start_venting(self) -> None:
+        """Start recording a venting episode to calibrate the model with."""
+        self._episode = []
+        self._episode_start = monotonic()
+        self._record_sample()
 
-        if hum > 100 or hum < 0:
-            _LOGGER.error(
-                "Humidity sensor %s is out of range: %s %s",
-                state.entity_id,
-                hum,
-                "(allowed: 0-100%)",
-            )
-            return None
+    async def async_stop_venting(self) -> None:
+        """Finish the venting episode and fit the model constants to all recent episodes."""
+        if (samples := self._episode) is None:
+            return
+        self._episode = None
+        if len(samples) < 2:
+            _LOGGER.debug("Venting episode of %s is too short for the calibration", self.entity_id)
+            return
+
+        # Only the sums of the new episode are calculated, the fit reuses those of the previous ones
+        stats = await self.hass.async_add_executor_job(episode_stats, *zip(*samples))
+        if stats is None:
+            _LOGGER.debug("Venting episode of %s tells nothing about the room", self.entity_id)
+            return
+        self._calibration.add(stats)
+        self._async_save_calibration()
+
+    async def async_reset_calibration(self) -> None:
+        """Forget all venting episodes and go back to the default constants."""
+        self._episode = None
+        self._calibration = Calibration()
+        self._async_save_calibration()
+
+    @callback
+    def _async_window_changed(self, state):
+        """Track the measured decay while the window is open and predict again once it is closed."""
+        if state is not None and state.state == STATE_ON:
+            if self._tracker is None:
+                self._async_start_tracking()
+            return
+        if (tracker := self._tracker) is None:
+            return
+        self._async_stop_tracking()
+        _LOGGER.debug("Window of %s closed after %d samples", self.entity_id, tracker.samples)
+        # Unless the services record an episode, the tracked one calibrates the room
+        if self._episode is None and (stats := tracker.episode_stats) is not None:
+            self._calibration.add(stats)
+            self._async_save_calibration()
+        self._calculated_inputs = None
+        self.async_request_update()
+
+    @callback
+    def _async_start_tracking(self):
+        if None in (self._indoor_absolute_humidity, self._outdoor.absolute_humidity):
+            _LOGGER.debug("Window of %s opened without readings, keeping the prediction", self.entity_id)
+            return
+        self._tracker = DecayTracker(
+            self._window_size, self._room_volume, self._max_hum_allowed, self._max_vent_time, self._constants
+        )
+        self._tracking_start = monotonic()
+        self._track_sample()
+        self._async_schedule_tracking()
+        self._async_publish_tracking()
+
+    @callback
+    def _async_stop_tracking(self):
+        if self._unsub_tracking is not None:
+            self._unsub_tracking()
+            self._unsub_tracking = None
+        self._tracker = None
+
+    @callback
+    def _async_schedule_tracking(self):
+        """Publish the tracked vent time at the tracking interval"""
+        if self._unsub_tracking is not None:
+            self._unsub_tracking()
+        self._unsub_tracking = async_track_time_interval(
+            self.hass, self._async_publish_tracking, timedelta(seconds=self._tracking_interval)
+        )
+
+    @callback
+    def _async_publish_tracking(self, _now=None):
+        self._update_tracked_state()
+        self._async_publish()
+
+    def _track_sample(self):
+        """Add the current readings to the fit of the decay since the window was opened."""
+        if None in (self._indoor_absolute_humidity, self._outdoor.absolute_humidity):
+            return
+        self._tracker.add(
+            (monotonic() - self._tracking_start)/60,
+            self._indoor_temp,
+            self._indoor_absolute_humidity,
+            self._outdoor.temp,
+            self._outdoor.absolute_humidity,
+        )
+
+    def _update_tracked_state(self):
+        """Count down the vent time left according to the decay measured so far."""
+        self._update_outdoor()
+        # A sensor dropping out while the window is open makes the room unavailable as well
+        if None in (self._indoor_absolute_humidity, self._outdoor_absolute_humidity):
+            self._available = False
+            return
+        self._state = round(self._tracker.remaining_time((monotonic() - self._tracking_start)/60), 2)
+        self._available = True
+        _LOGGER.debug("Tracking %s, %s minutes left", self.entity_id, self._state)
+
+    def _record_sample(self):
+        """Record the current readings as a sample of the venting episode."""
+        if len(self._episode) >= CALIBRATION_MAX_SAMPLES:
+            return
+        if None in (self._indoor_absolute_humidity, self._outdoor.absolute_humidity):
+            return
+        self._episode.append((
+            (monotonic() - self._episode_start)/60,
+            self._indoor_temp,
+            self._indoor_absolute_humidity,
+            self._outdoor.temp,
+            self._outdoor.absolute_humidity,
+        ))
 
-        return hum
+    @callback
+    def _async_save_calibration(self):
+        """Store the episodes on the config entry and calculate with the fitted constants."""
+        if (entry := self._config_entry) is not None:
+            # The rooms of a building store their calibrations side by side
+            calibrations = {**entry.data.get(CONF_CALIBRATION, {}), self._calibration_key: self._calibration.as_list()}
+            self.hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_CALIBRATION: calibrations})
+
+        constants = self._calibration.constants(self._window_size, self._room_volume)
+        if constants == self._constants:
+            return
+        _LOGGER.info("Calibrated the model of %s: %s", self.entity_id, constants)
+        # The cached vent times were calculated with the old constants
+        self._async_release_shared()
+        self._constants = constants
+        self._async_acquire_shared()
+        self._calculated_inputs = None
+        self._forecast_inputs = self._uncertainty_inputs = self._plan_key = None
+        self.async_recalculate()
+
+    @callback
+    def _async_publish(self):
+        """Write the state unless it moved less than the tolerances since it was last written."""
+        if (self._state_tolerance or self._attribute_tolerance) and not self._publish_significant():
+            if self._stats is not None:
+                self._stats.count("suppressed_writes")
+            # The held back state is written at the latest after the heartbeat
+            if self._unsub_heartbeat is None:
+                delay = max(0, self._published_at + self._heartbeat*60 - monotonic())
+                self._unsub_heartbeat = async_call_later(self.hass, delay, self._async_heartbeat)
+            return
+        self._async_write()
+
+    def _publish_significant(self):
+        """Return whether the state or attributes moved out of the tolerances since the last write"""
+        if (last := self._published) is None:
+            return True
+        available, state, indoor, outdoor, tracking = self._published_values()
+        last_available, last_state, last_indoor, last_outdoor, last_tracking = last
+        if available != last_available or tracking != last_tracking:
+            return True
+        if not available:
+            return False
+        # Whether one has to vent at all is always worth writing
+        if (state == 0) != (last_state == 0) or abs(state - last_state) > self._state_tolerance:
+            return True
+        return max(abs(indoor - last_indoor), abs(outdoor - last_outdoor)) > self._attribute_tolerance
+
+    def _published_values(self):
+        return (
+            self._available,
+            self._state,
+            self._indoor_absolute_humidity,
+            self._outdoor_absolute_humidity,
+            self._tracker is not None,
+        )
+
+    @callback
+    def _async_write(self):
+        self._async_cancel_heartbeat()
+        self._published = self._published_values()
+        self._published_at = monotonic()
+        if self._stats is not None:
+            self._stats.count("writes")
+        self.async_write_ha_state()
+        # The derived sensors follow the state of the room
+        for dependent in self._dependents:
+            dependent.async_write_ha_state()
+
+    @callback
+    def _async_heartbeat(self, _now):
+        self._unsub_heartbeat = None
+        self._async_write()
+
+    @callback
+    def _async_cancel_heartbeat(self):
+        if self._unsub_heartbeat is not None:
+            self._unsub_heartbeat()
+            self._unsub_heartbeat = None
+
+    @callback
+    def async_recalculate(self):
+        """Calculate the state and write it if it changed significantly."""
+        self._update_state()
+        self._async_publish()
 
     async def async_update(self) -> None:
         """Calculate latest state."""
+        self._update_state()
+
+    def _update_state(self):
         _LOGGER.debug("Update state for %s", self.entity_id)
-        # check all sensors
-        if None in (self._indoor_temp, self._indoor_hum, self._outdoor_temp, self._outdoor_hum):
-            self._available = False
-            self._outdoor_absolute_humidity = None
-            self._indoor_absolute_humidity = None
-            return
+        if self._stats is not None:
+            start = perf_counter()
+            self._stats.count("recomputes")
 
-        # re-calculate e_s and vent time
-        self._calc_indoor_absolute_humidity()
-        self._calc_outdoor_absolute_humidity()
-        self._calc_time_to_vent()
-        if self._state is None:
-            self._available = False
-            self._outdoor_absolute_humidity = None
-            self._indoor_absolute_humidity = None
+        if self._tracker is not None:
+            self._update_tracked_state()
         else:
-            self._available = True
+            self._update_outdoor()
+            # check all sensors
+            if None in (self._indoor_absolute_humidity, self._outdoor_absolute_humidity):
+                self._available = False
+            elif self.inputs_stale:
+                _LOGGER.debug("Readings of %s are older than %s minutes", self.entity_id, self._stale_after)
+                self._available = False
+                # Any new reading has to be calculated, even one within the dead-band
+                self._calculated_inputs = None
+            else:
+                # re-calculate vent time, the absolute humidities are kept up to date with the readings
+                self._calc_time_to_vent()
+                self._available = self._state is not None
+            self._async_calculated()
 
-    def _calc_e_s(self, temp):
-        """Calculate the maximum possible absolute humidity for the indoor temperature"""
-        # According to https://journals.ametsoc.org/view/journals/bams/86/2/bams-86-2-225.xml?tab_body=pdf Equation 6 p.226
-        C_1 = 610.94 # Kp
-        A_1 = 17.625
-        B_1 = 243.04 # °C
-        return C_1*math.exp((A_1*temp)/(B_1+temp))
+        if self._stats is not None:
+            self._stats.record("async_update", perf_counter() - start)
 
     def _calc_indoor_absolute_humidity(self):
-        self._indoor_absolute_humidity = (self._indoor_hum/100)*self._calc_e_s(self._indoor_temp)
+        self._indoor_absolute_humidity = (self._indoor_hum/100)*cached_e_s(self._indoor_temp)
         _LOGGER.debug("Indoor absolute humidity: %f", self._indoor_absolute_humidity)
-    
-    def _calc_outdoor_absolute_humidity(self):
-        self._outdoor_absolute_humidity = (self._outdoor_hum/100)*self._calc_e_s(self._outdoor_temp)
-        _LOGGER.debug("Outdoor absolute humidity: %f", self._outdoor_absolute_humidity)
-
-    def _humidity_model(self, time):
-        return (self._indoor_absolute_humidity - self._outdoor_absolute_humidity)/((time+1)**((k_1*self._window_size)/(k_2*self._room_volume))) + self._outdoor_absolute_humidity
-
-    def _temperature_model(self, time):
-        return (self._indoor_temp - self._outdoor_temp)/((time+1)**((k_3*self._window_size)/(k_4*self._room_volume))) + self._outdoor_temp
 
     def _calc_time_to_vent(self):
         """Calculate the time until the humidity is under max_allowed_hum"""
-
         if self._indoor_absolute_humidity <= self._outdoor_absolute_humidity:
             _LOGGER.debug("Venting has no point, the outside is to humid")
-            self._state = 0
+            time = self._solver_evaluations = 0
+        elif (time := self.cached_time_to_vent) is not None:
+            self._solver_evaluations = 0
+            if self._stats is not None:
+                self._stats.count("cache_hits")
         else:
-            # One could use a binary search here, but it is unecessary
-            for i in range(301):
-                if (self._humidity_model(i)/self._calc_e_s(self._temperature_model(i)))*100 <= self._max_hum_allowed:
-                    self._state = i
-                    break
-            else:
-                self._state = 300
-                _LOGGER.debug("Venting would take longer than 5h")
+            if self._stats is not None:
+                start = perf_counter()
+            self._solution = solve_time_to_vent(
+                self._indoor_temp,
+                self._outdoor_temp,
+                self._indoor_absolute_humidity,
+                self._outdoor_absolute_humidity,
+                self._window_size,
+                self._room_volume,
+                self._max_hum_allowed,
+                self._max_vent_time,
+                self._constants,
+                previous=self._solution,
+            )
+            time, self._solver_evaluations = self._solution[:2]
+            if self._stats is not None:
+                self._stats.record("calc_time_to_vent", perf_counter() - start)
+                self._stats.count("solves")
+                self._stats.count("solver_evaluations", self._solver_evaluations)
+            if self._cache is not None:
+                self._cache.put(self._cache_key(), time)
+        self._state = round(time, 2)
 
-
-        _LOGGER.debug("You have to vent %s minutes", self._state)
+        if self._state >= self._max_vent_time:
+            _LOGGER.debug("Venting would take longer than %s minutes", self._max_vent_time)
+        _LOGGER.debug("You have to vent %s minutes (%d model evaluations)", self._state, self._solver_evaluations)
+        if self._cache is not None:
+            _LOGGER.debug("Vent time cache: %s", self._cache.stats)
 
     @property
     def name(self):
@@ -407,7 +1023,237 @@ class VentTime(SensorEntity):
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        return {
+        attributes = {
             ATTR_INDOOR_ABSOLUTE_HUMIDITY: round(self._indoor_absolute_humidity, 2),
             ATTR_OUTDOOR_ABSOLUTE_HUMIDITY: round(self._outdoor_absolute_humidity, 2)
         }
+        if self._window_sensor is not None:
+            attributes[ATTR_TRACKING] = self._tracker is not None
+        if self._forecast_resolution:
+            attributes[ATTR_FORECAST] = self._get_forecast()
+        # While tracking the state no longer comes from the prediction the band is about
+        if self._uncertainty_samples and self._tracker is None:
+            attributes[ATTR_VENT_TIME_LOWER], attributes[ATTR_VENT_TIME_UPPER] = self._get_uncertainty()
+        if self._forecast_hub is not None:
+            attributes[ATTR_PLAN] = self._get_plan()
+        if self._stats is not None:
+            attributes[ATTR_PERFORMANCE] = self._stats.as_dict()
+        return attributes
+
+    def _get_forecast(self):
+        """Return the predicted course while venting, only predicting again for new readings."""
+        if self._forecast_inputs != self._calculated_inputs:
+            import numpy as np
+
+            _, temp, hum = forecast(
+                self._indoor_temp,
+                self._outdoor_temp,
+                self._indoor_absolute_humidity,
+                self._outdoor_absolute_humidity,
+                self._window_size,
+                self._room_volume,
+                self._forecast_resolution,
+                self._max_vent_time,
+                self._constants,
+            )
+            # The n-th values are predicted for n*resolution minutes of venting
+            self._forecast = {
+                "resolution": self._forecast_resolution,
+                "temperature": np.round(temp, 2).tolist(),
+                "humidity": np.round(hum, 1).tolist(),
+            }
+            self._forecast_inputs = self._calculated_inputs
+        return self._forecast
+
+    def _get_uncertainty(self):
+        """Return the lower and upper percentile of the vent time, only sampling again for new readings."""
+        if self._uncertainty_inputs != self._calculated_inputs:
+            # Rooms with the same parameters share the bands like the vent times
+            key = vent_time_key(self._indoor_temp, self._indoor_hum, self._outdoor_temp, self._outdoor_hum)
+            if self._uncertainty_cache is None or (band := self._uncertainty_cache.get(key)) is None:
+                lower, upper = vent_time_percentiles(
+                    self._indoor_temp,
+                    self._outdoor_temp,
+                    self._indoor_hum,
+                    self._outdoor_hum,
+                    self._window_size,
+                    self._room_volume,
+                    self._max_hum_allowed,
+                    self._uncertainty_samples,
+                    max_vent_time=self._max_vent_time,
+                    constants=self._constants,
+                )
+                band = (round(float(lower), 2), round(float(upper), 2))
+                if self._uncertainty_cache is not None:
+                    self._uncertainty_cache.put(key, band)
+            self._uncertainty = band
+            self._uncertainty_inputs = self._calculated_inputs
+        return self._uncertainty
+
+    def _get_plan(self):
+        """Return the best forecast slot to vent in, only planning again for a new forecast or other indoor readings."""
+        # Small changes of the indoor readings hardly move the best slot, the hour drops past slots
+        key = (
+            self._forecast_hub.version,
+            dt_util.utcnow().replace(minute=0, second=0, microsecond=0),
+            round(self._indoor_temp*2)/2,
+            round(self._indoor_hum),
+            self._max_vent_time,
+            self._planning_horizon,
+            self._constants,
+        )
+        if self._plan_key != key:
+            self._plan = None
+            if (slots := self._forecast_hub.upcoming(self._planning_horizon)) is not None:
+                best, times, heat_losses = plan_venting(
+                    key[2],
+                    key[3],
+                    slots.temp,
+                    slots.hum,
+                    self._window_size,
+                    self._room_volume,
+                    self._max_hum_allowed,
+                    self._max_vent_time,
+                    self._constants,
+                )
+                if best is not None:
+                    self._plan = {
+                        "start": slots.start[best].isoformat(),
+                        "vent_time": round(float(times[best]), 2),
+                        "heat_loss": round(float(heat_losses[best]), 1),
+                    }
+            self._plan_key = key
+        return self._plan
+
+    @callback
+    def async_forecast_updated(self):
+        """Write the state with the plan for the new forecast."""
+        if self.hass is not None and self._available:
+            self._async_write()
+
+    def condition_sensors(self) -> list[RoomConditionSensor]:
+        """Return the sensors of the quantities derived from the readings of the room."""
+        descriptions = [DEW_POINT, HEAT_LOSS]
+        if self._surface_factor is not None:
+            descriptions.append(SURFACE_HUMIDITY)
+        return [RoomConditionSensor(self, description) for description in descriptions]
+
+    @callback
+    def async_add_dependent(self, sensor: RoomConditionSensor):
+        """Write the state of a derived sensor together with the room, returns a callback to stop it."""
+        self._dependents.add(sensor)
+
+        @callback
+        def remove_dependent():
+            self._dependents.discard(sensor)
+
+        return remove_dependent
+
+    @property
+    def conditions(self) -> RoomConditions | None:
+        """Return the quantities derived from the readings, only deriving them again for a new state."""
+        if not self._available:
+            return None
+        key = (self._indoor_temp, self._indoor_absolute_humidity, self._outdoor_temp, self._state, self._constants)
+        if self._conditions_key != key:
+            dew_point = surface_humidity = None
+            if self._indoor_absolute_humidity > 0:
+                # The absolute humidity is the vapour pressure the dew point is found for
+                dew_point = round(calc_dew_point(self._indoor_absolute_humidity), 2)
+            if self._surface_factor is not None:
+                temp = surface_temperature(self._indoor_temp, self._outdoor_temp, self._surface_factor)
+                surface_humidity = round(min(100.0, self._indoor_absolute_humidity/cached_e_s(temp)*100), 1)
+            self._conditions = RoomConditions(
+                dew_point=dew_point,
+                surface_humidity=surface_humidity,
+                heat_loss=round(ventilation_heat_loss(
+                    self._state,
+                    self._indoor_temp,
+                    self._outdoor_temp,
+                    self._window_size,
+                    self._room_volume,
+                    self._constants,
+                ), 1),
+            )
+            self._conditions_key = key
+        return self._conditions
+
+    @property
+    def scenario_base(self):
+        """Return the readings and parameters of the room with its constants for the compute service."""
+        return {
+            "indoor_temp": self._indoor_temp,
+            "indoor_humidity": self._indoor_hum,
+            "outdoor_temp": self._outdoor_temp,
+            "outdoor_humidity": self._outdoor_hum,
+            CONF_WINDOW_SIZE: self._window_size,
+            CONF_ROOM_VOLUME: self._room_volume,
+            CONF_MAX_ALLOWED_HUMIDITY: self._max_hum_allowed,
+            CONF_MAX_VENT_TIME: self._max_vent_time,
+        }, self._constants
+
+    @property
+    def diagnostics(self):
+        """Return the readings, parameters and statistics of this room for the diagnostics."""
+        return {
+            "state": self._state,
+            "available": self._available,
+            "readings": {
+                "indoor_temp": self._indoor_temp,
+                "indoor_humidity": self._indoor_hum,
+                "outdoor_temp": self._outdoor_temp,
+                "outdoor_humidity": self._outdoor_hum,
+            },
+            "room": {
+                "window_size": self._window_size,
+                "room_volume": self._room_volume,
+                "max_humidity_allowed": self._max_hum_allowed,
+                "max_vent_time": self._max_vent_time,
+                "constants": self._constants._asdict(),
+            },
+            "calibration": {
+                "episodes": len(self._calibration),
+                "recording": self._episode is not None,
+            },
+            "tracking": {
+                "samples": self._tracker.samples,
+                "constants": self._tracker.constants._asdict(),
+            } if self._tracker is not None else None,
+            "last_solver_evaluations": self._solver_evaluations,
+            "update_interval": self._scheduler.interval if self._scheduler is not None else None,
+            "inputs_stale": self.inputs_stale,
+            "plan": self._plan,
+            "conditions": self._conditions._asdict() if self._conditions is not None else None,
+            "cache": self._cache.stats if self._cache is not None else None,
+            "table": {"ready": self._table.ready} if self._table is not None else None,
+            "performance": self._stats.as_dict() if self._stats is not None else None,
+        }
+
+
+class RoomConditionSensor(SensorEntity):
+    """Shows a quantity derived from the readings of a room, written together with its vent time."""
+
+    _attr_should_poll = False
+
+    def __init__(self, room: VentTime, description: SensorEntityDescription) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._room = room
+        self._attr_name = f"{room.name} {description.name}"
+        self._attr_unique_id = f"{room.unique_id}_{description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the room."""
+        self.async_on_remove(self._room.async_add_dependent(self))
+
+    @property
+    def available(self):
+        """Return the availability of this sensor."""
+        return self.native_value is not None
+
+    @property
+    def native_value(self):
+        """Return the state of the entity."""
+        if (conditions := self._room.conditions) is None:
+            return None
+        return getattr(conditions, self.entity_description.key)
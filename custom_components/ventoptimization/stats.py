@@ -0,0 +1,86 @@
+"""Performance counters and latency histograms of the vent time entities."""
+from __future__ import annotations
+
+from bisect import bisect_left
+
+# Upper bounds of the latency buckets in µs, the last bucket is unbounded
+LATENCY_BUCKETS = (10, 30, 100, 300, 1000, 3000, 10000, 30000)
+
+
+class LatencyHistogram:
+    """Counts latencies in logarithmic buckets."""
+
+    __slots__ = ("counts", "count", "total", "maximum")
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.counts = [0]*(len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record one latency."""
+        microseconds = seconds*1e6
+        self.counts[bisect_left(LATENCY_BUCKETS, microseconds)] += 1
+        self.count += 1
+        self.total += microseconds
+        if microseconds > self.maximum:
+            self.maximum = microseconds
+
+    def as_dict(self) -> dict:
+        """Return the histogram with bucket labels."""
+        labels = [f"<={bound}us" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}us"]
+        return {
+            "count": self.count,
+            "mean_us": round(self.total/self.count, 1) if self.count else None,
+            "max_us": round(self.maximum, 1),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class PerfStats:
+    """Counters and latency histograms of one vent time entity.
+
+    Entities only keep an instance if performance statistics are enabled, so that
+    disabled instrumentation costs a single None check per update.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.counters = {
+            "events": 0,
+            "recomputes": 0,
+            "batch_recomputes": 0,
+            "skipped": 0,
+            "solves": 0,
+            "solver_evaluations": 0,
+            "cache_hits": 0,
+            "writes": 0,
+            "suppressed_writes": 0,
+        }
+        self.latencies = {
+            "async_update": LatencyHistogram(),
+            "calc_time_to_vent": LatencyHistogram(),
+        }
+
+    def count(self, counter: str, value: int = 1) -> None:
+        """Increase a counter."""
+        self.counters[counter] += value
+
+    def record(self, latency: str, seconds: float) -> None:
+        """Record the duration of an operation."""
+        self.latencies[latency].record(seconds)
+
+    def as_dict(self) -> dict:
+        """Return all statistics."""
+        lookups = self.counters["cache_hits"] + self.counters["solves"]
+        return {
+            **self.counters,
+            "cache_hit_rate": round(self.counters["cache_hits"]/lookups, 3) if lookups else None,
+            "mean_solver_evaluations": (
+                round(self.counters["solver_evaluations"]/self.counters["solves"], 2)
+                if self.counters["solves"] else None
+            ),
+            "latency": {name: histogram.as_dict() for name, histogram in self.latencies.items()},
+        }
@@ -0,0 +1,125 @@
+"""Precomputed vent times of one room configuration, answered by interpolation."""
+from __future__ import annotations
+
+from array import array
+import logging
+
+import numpy as np
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN
+from .model import vent_times
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_VENT_TIME_TABLES = "vent_time_tables"
+
+# (start, step, number of points) of the grid axes covering realistic readings,
+# in the order indoor temperature, indoor humidity, outdoor temperature, outdoor humidity
+TABLE_AXES = (
+    (10.0, 1.0, 26), # °C
+    (30.0, 2.5, 29), # %
+    (-20.0, 2.0, 31), # °C
+    (10.0, 5.0, 19), # %
+)
+
+# Cells whose corners differ by more than this contain a jump of the vent time, e.g. where
+# venting stops making sense, so they are answered by the exact model instead
+TABLE_MAX_CELL_SPREAD = 1.0 # min
+
+# Largest deviation of an interpolated vent time from the exact model, checked by the tests
+TABLE_MAX_ERROR = 1.0 # min
+
+
+class VentTimeTable:
+    """Vent times of one room configuration on a grid of readings."""
+
+    def __init__(self, hass: HomeAssistant, room_key: tuple) -> None:
+        """Initialize the table, it is empty until built."""
+        self.hass = hass
+        self.room_key = room_key
+        # Indexing an array is much cheaper than indexing NumPy for single lookups
+        self._values: array | None = None
+        self._users = 0
+
+        sizes = [size for _, _, size in TABLE_AXES]
+        self._strides = [int(np.prod(sizes[axis + 1:])) for axis in range(4)]
+        # Offsets of the corners of a cell from its first corner, the last axis varying fastest
+        self._corner_offsets = [0]
+        for stride in self._strides:
+            self._corner_offsets = [corner for base in self._corner_offsets for corner in (base, base + stride)]
+
+    @classmethod
+    @callback
+    def async_get(cls, hass: HomeAssistant, room_key: tuple) -> VentTimeTable:
+        """Return the table for the room parameters, building it in the background if necessary."""
+        tables = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_VENT_TIME_TABLES, {})
+        if (table := tables.get(room_key)) is None:
+            table = tables[room_key] = cls(hass, room_key)
+            hass.async_create_background_task(table._async_build(), f"{DOMAIN} vent time table")
+        return table
+
+    @callback
+    def async_acquire(self) -> CALLBACK_TYPE:
+        """Register a user of the table and return a callback releasing it."""
+        self._users += 1
+
+        @callback
+        def release() -> None:
+            self._users -= 1
+            if not self._users:
+                self.hass.data[DOMAIN][DATA_VENT_TIME_TABLES].pop(self.room_key, None)
+
+        return release
+
+    async def _async_build(self) -> None:
+        self._values = await self.hass.async_add_executor_job(self.build, self.room_key)
+        _LOGGER.debug("Vent time table ready")
+
+    @staticmethod
+    def build(room_key: tuple) -> array:
+        """Evaluate the model on the grid and return the flattened grid, runs in the executor."""
+        window_size, room_volume, max_hum_allowed, max_vent_time, constants = room_key
+        axes = [start + step*np.arange(size) for start, step, size in TABLE_AXES]
+        indoor_temp, indoor_hum, outdoor_temp, outdoor_hum = np.meshgrid(*axes, indexing="ij")
+        values = vent_times(
+            indoor_temp, outdoor_temp, indoor_hum, outdoor_hum,
+            window_size, room_volume, max_hum_allowed, max_vent_time, constants,
+        ).astype(np.float32)
+        return array("f", values.tobytes())
+
+    @property
+    def ready(self) -> bool:
+        """Return whether the table is built."""
+        return self._values is not None
+
+    def lookup(self, indoor_temp, indoor_hum, outdoor_temp, outdoor_hum):
+        """Interpolate the vent time, None if the readings are not covered by the table."""
+        if self._values is None:
+            return None
+
+        index = 0
+        fractions = []
+        for value, (start, step, size), stride in zip(
+            (indoor_temp, indoor_hum, outdoor_temp, outdoor_hum), TABLE_AXES, self._strides
+        ):
+            position = (value - start)/step
+            if not 0 <= position <= size - 1:
+                return None
+            cell = min(int(position), size - 2)
+            index += cell*stride
+            fractions.append(position - cell)
+
+        values = self._values
+        corners = [values[index + offset] for offset in self._corner_offsets]
+        if max(corners) - min(corners) > TABLE_MAX_CELL_SPREAD:
+            return None
+
+        # Interpolate along one axis after the other, starting with the last
+        for fraction in reversed(fractions):
+            corners = [
+                low + (high - low)*fraction
+                for low, high in zip(corners[::2], corners[1::2])
+            ]
+        return corners[0]
@@ -0,0 +1 @@
+"""Tests of the vent optimization integration."""
@@ -0,0 +1,25 @@
+"""Tests of the compute service."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from custom_components.ventoptimization.compute import ATTR_VENT_TIME, SERVICE_SCHEMA, compute
+from custom_components.ventoptimization.const import CONF_MAX_ALLOWED_HUMIDITY, CONF_ROOM_VOLUME, CONF_WINDOW_SIZE
+
+ROOM = {CONF_WINDOW_SIZE: 0.75, CONF_ROOM_VOLUME: 30, CONF_MAX_ALLOWED_HUMIDITY: 65}
+
+
+def test_scenarios_with_more_humid_air_outside():
+    """Scenarios with more humid air outside get no venting next to the others"""
+    hass = SimpleNamespace(data={})
+    data = SERVICE_SCHEMA({"scenarios": [
+        {"indoor_temp": 22, "indoor_humidity": 75, "outdoor_temp": 8, "outdoor_humidity": 70, **ROOM},
+        {"indoor_temp": 20, "indoor_humidity": 50, "outdoor_temp": 25, "outdoor_humidity": 90, **ROOM},
+        {"indoor_temp": 21, "indoor_humidity": 90, "outdoor_temp": 5, "outdoor_humidity": 80, **ROOM},
+    ]})
+
+    times = [result[ATTR_VENT_TIME] for result in compute(hass, data)]
+    assert times[1] == 0
+    assert 0 < times[0] < times[2] < 300
+    # Cached results are the same
+    assert [result[ATTR_VENT_TIME] for result in compute(hass, data)] == times
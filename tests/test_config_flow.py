@@ -0,0 +1,94 @@
+"""Tests of the config flow."""
+from __future__ import annotations
+
+import asyncio
+import tempfile
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+
+from custom_components.ventoptimization.config_flow import VentOptimizationFlowHandler
+from custom_components.ventoptimization.const import (
+    CONF_ADD_ANOTHER_ROOM,
+    CONF_CALIBRATION,
+    CONF_INDOOR_HUMIDITY,
+    CONF_INDOOR_TEMP,
+    CONF_MAX_ALLOWED_HUMIDITY,
+    CONF_OUTDOOR_HUMIDITY,
+    CONF_OUTDOOR_TEMP,
+    CONF_ROOM_VOLUME,
+    CONF_ROOMS,
+    CONF_WINDOW_SIZE,
+    DOMAIN,
+)
+
+EPISODES = [[60.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]]
+
+
+def _room(name):
+    return {
+        CONF_NAME: name,
+        CONF_INDOOR_TEMP: f"sensor.{name.lower()}_temperature",
+        CONF_INDOOR_HUMIDITY: f"sensor.{name.lower()}_humidity",
+        CONF_MAX_ALLOWED_HUMIDITY: 65,
+        CONF_WINDOW_SIZE: 0.75,
+        CONF_ROOM_VOLUME: 30,
+    }
+
+
+async def _async_reconfigure(data, steps):
+    """Return the data of an entry after running the reconfigure steps on it"""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        entry = config_entries.ConfigEntry(
+            version=1, domain=DOMAIN, title=data[CONF_NAME], data=data, source=config_entries.SOURCE_USER
+        )
+        flow = VentOptimizationFlowHandler()
+        flow.hass = hass
+        flow.handler = DOMAIN
+        flow.flow_id = "reconfigure"
+        flow.context = {"source": "reconfigure", "entry_id": entry.entry_id}
+        hass.config_entries._entries[entry.entry_id] = entry
+        await flow.async_step_reconfigure()
+        for step, user_input in steps:
+            await getattr(flow, f"async_step_{step}")(user_input)
+        result = dict(entry.data)
+        await hass.async_stop(force=True)
+    return result
+
+
+def test_reconfigure_keeps_calibration_of_room():
+    """Reconfiguring a room keeps the episodes its sensor calibrated the model with"""
+    data = {
+        **_room("Bath"),
+        CONF_OUTDOOR_TEMP: "sensor.outdoor_temperature",
+        CONF_OUTDOOR_HUMIDITY: "sensor.outdoor_humidity",
+        CONF_CALIBRATION: {"bath": EPISODES},
+    }
+    changed = {key: value for key, value in data.items() if key != CONF_CALIBRATION} | {CONF_ROOM_VOLUME: 40}
+
+    result = asyncio.run(_async_reconfigure(data, [("room", changed)]))
+    assert result[CONF_ROOM_VOLUME] == 40
+    assert result[CONF_CALIBRATION] == {"bath": EPISODES}
+
+
+def test_reconfigure_drops_calibration_of_renamed_room():
+    """Only the calibration of a building's room that got a new name is dropped"""
+    data = {
+        CONF_NAME: "Home",
+        CONF_OUTDOOR_TEMP: "sensor.outdoor_temperature",
+        CONF_OUTDOOR_HUMIDITY: "sensor.outdoor_humidity",
+        CONF_ROOMS: [_room("Bath"), _room("Kitchen")],
+        CONF_CALIBRATION: {"bath": EPISODES, "kitchen": EPISODES},
+    }
+    building = {key: data[key] for key in (CONF_NAME, CONF_OUTDOOR_TEMP, CONF_OUTDOOR_HUMIDITY)}
+
+    result = asyncio.run(_async_reconfigure(data, [
+        ("building", building),
+        ("building_room", {**_room("Bath"), CONF_ADD_ANOTHER_ROOM: True}),
+        ("building_room", {**_room("Pantry"), CONF_ADD_ANOTHER_ROOM: False}),
+    ]))
+    assert [room[CONF_NAME] for room in result[CONF_ROOMS]] == ["Bath", "Pantry"]
+    assert result[CONF_CALIBRATION] == {"bath": EPISODES}
@@ -0,0 +1,73 @@
+"""Tests of the outdoor hub recalculating many rooms in one batch."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import tempfile
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ventoptimization.const import CONF_CACHE_SIZE, CONF_UPDATE_DELAY
+from custom_components.ventoptimization.hub import BATCH_MIN_ROOMS
+from custom_components.ventoptimization.model import calc_absolute_humidity, calc_time_to_vent
+from custom_components.ventoptimization.sensor import VentTime
+
+CELSIUS = {"unit_of_measurement": "°C"}
+PERCENT = {"unit_of_measurement": "%"}
+
+# Every room misses the cache and is updated right away
+OPTIONS = {CONF_UPDATE_DELAY: 0, CONF_CACHE_SIZE: 0}
+
+# indoor temperature and humidity of the rooms
+ROOMS = [(22, 90), (22, 50), (21, 80), (20, 40), (23, 95), (19, 55)]
+
+
+async def _async_vent_times(outdoor_temp, outdoor_hum):
+    """Return the states of the rooms after changing the outdoor readings"""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.states.async_set("sensor.outdoor_temperature", "5", CELSIUS)
+        hass.states.async_set("sensor.outdoor_humidity", "70", PERCENT)
+        entities = []
+        for room, (temp, hum) in enumerate(ROOMS):
+            hass.states.async_set(f"sensor.temperature_{room}", str(temp), CELSIUS)
+            hass.states.async_set(f"sensor.humidity_{room}", str(hum), PERCENT)
+            entity = VentTime(
+                f"Room {room}",
+                f"sensor.temperature_{room}",
+                "sensor.outdoor_temperature",
+                f"sensor.humidity_{room}",
+                "sensor.outdoor_humidity",
+                65,
+                0.75,
+                30,
+                OPTIONS,
+            )
+            entity.hass = hass
+            entity.entity_id = f"sensor.vent_time_{room}"
+            await entity.async_added_to_hass()
+            entities.append(entity)
+        await hass.async_block_till_done()
+
+        hass.states.async_set("sensor.outdoor_temperature", str(outdoor_temp), CELSIUS)
+        hass.states.async_set("sensor.outdoor_humidity", str(outdoor_hum), PERCENT)
+        await hass.async_block_till_done()
+        states = [hass.states.get(entity.entity_id).state for entity in entities]
+        await hass.async_stop(force=True)
+    return states
+
+
+def test_batch_with_rooms_more_humid_outside():
+    """Rooms with more humid air outside get no venting within the batch of the others"""
+    # Entities added without a platform warn about it
+    logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+    assert len(ROOMS) >= BATCH_MIN_ROOMS
+
+    states = asyncio.run(_async_vent_times(20, 90))
+    outdoor_absolute_humidity = calc_absolute_humidity(90, 20)
+    expected = [
+        round(calc_time_to_vent(temp, 20, calc_absolute_humidity(hum, temp), outdoor_absolute_humidity, 0.75, 30, 65)[0], 2)
+        for temp, hum in ROOMS
+    ]
+    assert 0 < expected.count(0) < len(ROOMS)
+    assert [float(state) for state in states] == expected
@@ -0,0 +1,81 @@
+"""Tests of the vent model."""
+from __future__ import annotations
+
+import numpy as np
+
+from custom_components.ventoptimization.model import (
+    DEFAULT_CONSTANTS,
+    ModelConstants,
+    calc_absolute_humidity,
+    calc_absolute_humidity_batch,
+    calc_e_s_batch,
+    calc_time_to_vent,
+    calc_time_to_vent_batch,
+    humidity_exponent,
+    humidity_model,
+    temperature_exponent,
+    temperature_model,
+)
+
+ROOM = (0.75, 30, 65) # window size, room volume, wished humidity
+
+
+def test_batch_matches_scalar_at_wished_humidity():
+    """A room reading exactly the wished humidity needs no venting in both solvers"""
+    indoor_temp = np.round(np.arange(15, 24.05, 0.1), 1)
+    outdoor_absolute_humidity = calc_absolute_humidity(95, 14.8)
+    indoor_absolute_humidity = [calc_absolute_humidity(65, temp) for temp in indoor_temp.tolist()]
+
+    batch = calc_time_to_vent_batch(indoor_temp, 14.8, indoor_absolute_humidity, outdoor_absolute_humidity, *ROOM)
+    scalar = [
+        calc_time_to_vent(temp, 14.8, absolute_humidity, outdoor_absolute_humidity, *ROOM)[0]
+        for temp, absolute_humidity in zip(indoor_temp.tolist(), indoor_absolute_humidity)
+    ]
+    assert batch.tolist() == scalar == [0]*len(scalar)
+
+
+def test_batch_matches_scalar():
+    """The batch solver takes the same steps as the scalar one for every element"""
+    rng = np.random.default_rng(0)
+    size = 2000
+    indoor_temp = np.round(rng.uniform(15, 26, size), 1)
+    outdoor_temp = np.round(rng.uniform(-10, 25, size), 1)
+    indoor_absolute_humidity = calc_absolute_humidity_batch(rng.integers(40, 96, size), indoor_temp)
+    outdoor_absolute_humidity = calc_absolute_humidity_batch(rng.integers(30, 101, size), outdoor_temp)
+
+    batch = calc_time_to_vent_batch(indoor_temp, outdoor_temp, indoor_absolute_humidity, outdoor_absolute_humidity, *ROOM)
+    scalar = [
+        calc_time_to_vent(*inputs, *ROOM)[0]
+        for inputs in zip(indoor_temp.tolist(), outdoor_temp.tolist(), indoor_absolute_humidity.tolist(), outdoor_absolute_humidity.tolist())
+    ]
+    np.testing.assert_allclose(batch, scalar, rtol=0, atol=1e-9)
+
+
+def test_first_crossing_of_cooling_room():
+    """A room warmer than outside is solved right away at the first time it reaches the wished humidity"""
+    indoor_absolute_humidity = calc_absolute_humidity(75, 22)
+    outdoor_absolute_humidity = calc_absolute_humidity(70, 8)
+    time, evaluations = calc_time_to_vent(22, 8, indoor_absolute_humidity, outdoor_absolute_humidity, *ROOM)
+
+    times = np.arange(0, 10, 0.001)
+    absolute_humidity = humidity_model(times, indoor_absolute_humidity, outdoor_absolute_humidity, humidity_exponent(*ROOM[:2]))
+    temp = temperature_model(times, 22, 8, temperature_exponent(*ROOM[:2]))
+    first = times[np.argmax((absolute_humidity/calc_e_s_batch(temp))*100 <= ROOM[2])]
+    assert evaluations == 1
+    assert abs(time - first) <= 0.01
+
+
+def test_batch_with_constants_per_element():
+    """Every element is solved with its own constants, also next to elements needing no venting"""
+    constants = [DEFAULT_CONSTANTS, DEFAULT_CONSTANTS._replace(k_1=40), DEFAULT_CONSTANTS._replace(k_3=60)]*2
+    indoor_absolute_humidity = [2000, 500, 2200, 2400, 1800, 900]
+
+    batch = calc_time_to_vent_batch(
+        22, 8, indoor_absolute_humidity, 800, *ROOM, 300, ModelConstants(*np.array(constants).T)
+    )
+    scalar = [
+        calc_time_to_vent(22, 8, absolute_humidity, 800, *ROOM, 300, room_constants)[0]
+        for absolute_humidity, room_constants in zip(indoor_absolute_humidity, constants)
+    ]
+    assert scalar[1] == scalar[5] == 0
+    np.testing.assert_allclose(batch, scalar, rtol=0, atol=1e-9)
@@ -0,0 +1,44 @@
+"""Tests of the update scheduler."""
+from __future__ import annotations
+
+from custom_components.ventoptimization.scheduler import (
+    INDOOR_HUMIDITY,
+    INDOOR_TEMP,
+    OUTDOOR_HUMIDITY,
+    OUTDOOR_TEMP,
+    UpdateScheduler,
+)
+
+
+def _settled_scheduler():
+    """Return a scheduler whose readings were stable for three hours"""
+    scheduler = UpdateScheduler(65, 5, 3600)
+    for minute in range(0, 181, 5):
+        time = minute*60
+        for reading, value in ((INDOOR_TEMP, 21), (INDOOR_HUMIDITY, 55), (OUTDOOR_TEMP, 5), (OUTDOOR_HUMIDITY, 80)):
+            scheduler.observe(reading, value, time)
+        if scheduler.delay(time) == 0:
+            scheduler.calculated(time)
+    return scheduler, 180*60
+
+
+def test_step_after_quiet_period_is_due_right_away():
+    """A sudden jump of the humidity is calculated at once, not after the diluted rate allows it"""
+    scheduler, time = _settled_scheduler()
+    assert scheduler.delay(time + 60) > 0
+
+    scheduler.observe(INDOOR_HUMIDITY, 90, time + 60)
+    assert scheduler.delay(time + 60) == 0
+
+
+def test_crossing_wished_humidity_is_due_right_away():
+    """A small change is due at once if it takes the indoor humidity over the wished one"""
+    scheduler = UpdateScheduler(65, 5, 3600)
+    scheduler.observe(INDOOR_HUMIDITY, 64.5, 0)
+    scheduler.calculated(0)
+    scheduler.observe(INDOOR_HUMIDITY, 64.8, 600)
+    scheduler.calculated(600)
+    assert scheduler.delay(610) > 0
+
+    scheduler.observe(INDOOR_HUMIDITY, 65.2, 620)
+    assert scheduler.delay(620) == 0
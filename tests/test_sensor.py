@@ -0,0 +1,174 @@
+"""Tests of the vent time sensor and the sensors derived from its room."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import tempfile
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ventoptimization.const import (
+    CONF_MAX_ALLOWED_HUMIDITY,
+    CONF_ROOM_VOLUME,
+    CONF_UPDATE_DELAY,
+    CONF_WINDOW_SIZE,
+)
+from custom_components.ventoptimization.sensor import VentTime
+
+CELSIUS = {"unit_of_measurement": "°C"}
+PERCENT = {"unit_of_measurement": "%"}
+
+
+async def _async_conditions(indoor_hum):
+    """Return the state of a room with a surface factor and its derived quantities"""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.states.async_set("sensor.outdoor_temperature", "5", CELSIUS)
+        hass.states.async_set("sensor.outdoor_humidity", "70", PERCENT)
+        hass.states.async_set("sensor.temperature", "21", CELSIUS)
+        hass.states.async_set("sensor.humidity", str(indoor_hum), PERCENT)
+        entity = VentTime(
+            "Bath",
+            "sensor.temperature",
+            "sensor.outdoor_temperature",
+            "sensor.humidity",
+            "sensor.outdoor_humidity",
+            65,
+            0.75,
+            30,
+            {CONF_UPDATE_DELAY: 0},
+            surface_factor=2,
+        )
+        entity.hass = hass
+        entity.entity_id = "sensor.bath"
+        await entity.async_added_to_hass()
+        await hass.async_block_till_done()
+        result = hass.states.get(entity.entity_id).state, entity.conditions
+        await hass.async_stop(force=True)
+    return result
+
+
+def test_conditions_of_dry_air():
+    """Air without any vapour has no dew point, the other quantities are still derived"""
+    # Entities added without a platform warn about it
+    logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+
+    state, conditions = asyncio.run(_async_conditions(0))
+    assert float(state) == 0
+    assert conditions.dew_point is None
+    assert conditions.surface_humidity == 0
+    assert conditions.heat_loss == 0
+
+    state, conditions = asyncio.run(_async_conditions(60))
+    assert 0 < conditions.dew_point < 21
+
+
+async def _async_room_changed(max_humidity_allowed):
+    """Return the state of a room before and after its wished humidity changed in place"""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.states.async_set("sensor.outdoor_temperature", "5", CELSIUS)
+        hass.states.async_set("sensor.outdoor_humidity", "70", PERCENT)
+        hass.states.async_set("sensor.temperature", "21", CELSIUS)
+        hass.states.async_set("sensor.humidity", "75", PERCENT)
+        options = {CONF_UPDATE_DELAY: 0}
+        entity = VentTime(
+            "Bath",
+            "sensor.temperature",
+            "sensor.outdoor_temperature",
+            "sensor.humidity",
+            "sensor.outdoor_humidity",
+            65,
+            0.75,
+            30,
+            options,
+        )
+        entity.hass = hass
+        entity.entity_id = "sensor.bath"
+        await entity.async_added_to_hass()
+        await hass.async_block_till_done()
+        before = hass.states.get(entity.entity_id).state
+        entity.async_set_options(options, {CONF_MAX_ALLOWED_HUMIDITY: max_humidity_allowed, CONF_WINDOW_SIZE: 0.75, CONF_ROOM_VOLUME: 30})
+        await hass.async_block_till_done()
+        after = hass.states.get(entity.entity_id).state
+        await hass.async_stop(force=True)
+    return before, after
+
+
+def test_room_parameters_applied_in_place():
+    """A changed wished humidity is calculated with right away by the running sensor"""
+    logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+
+    before, after = asyncio.run(_async_room_changed(80))
+    assert float(before) > 0
+    assert float(after) == 0
+
+
+def test_options_of_sensor_not_added():
+    """A sensor disabled in the registry is never added, it keeps the options for later"""
+    entity = VentTime(
+        "Bath",
+        "sensor.temperature",
+        "sensor.outdoor_temperature",
+        "sensor.humidity",
+        "sensor.outdoor_humidity",
+        65,
+        0.75,
+        30,
+        {CONF_UPDATE_DELAY: 0},
+    )
+    entity.async_set_options({CONF_UPDATE_DELAY: 5}, {CONF_MAX_ALLOWED_HUMIDITY: 70, CONF_WINDOW_SIZE: 1, CONF_ROOM_VOLUME: 30})
+    assert entity.scenario_base[0][CONF_MAX_ALLOWED_HUMIDITY] == 70
+
+
+async def _async_tracking_states():
+    """Return the states of a room while its window is open and the indoor humidity sensor drops out"""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.states.async_set("sensor.outdoor_temperature", "5", CELSIUS)
+        hass.states.async_set("sensor.outdoor_humidity", "70", PERCENT)
+        hass.states.async_set("sensor.temperature", "21", CELSIUS)
+        hass.states.async_set("sensor.humidity", "80", PERCENT)
+        hass.states.async_set("binary_sensor.window", "off")
+        entity = VentTime(
+            "Bath",
+            "sensor.temperature",
+            "sensor.outdoor_temperature",
+            "sensor.humidity",
+            "sensor.outdoor_humidity",
+            65,
+            0.75,
+            30,
+            {CONF_UPDATE_DELAY: 0},
+            window_sensor="binary_sensor.window",
+        )
+        entity.hass = hass
+        entity.entity_id = "sensor.bath"
+        await entity.async_added_to_hass()
+        await hass.async_block_till_done()
+        hass.states.async_set("binary_sensor.window", "on")
+        await hass.async_block_till_done()
+        states = [hass.states.get(entity.entity_id)]
+        hass.states.async_set("sensor.humidity", "unavailable")
+        await hass.async_block_till_done()
+        # The next tick of the tracking interval
+        entity._async_publish_tracking()
+        states.append(hass.states.get(entity.entity_id))
+        hass.states.async_set("sensor.humidity", "78", PERCENT)
+        await hass.async_block_till_done()
+        entity._async_publish_tracking()
+        states.append(hass.states.get(entity.entity_id))
+        await hass.async_stop(force=True)
+    return states
+
+
+def test_sensor_dropping_out_while_tracking():
+    """The room is unavailable while a sensor is, also with the window open"""
+    logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+
+    opened, dropped, back = asyncio.run(_async_tracking_states())
+    assert opened.attributes["tracking"] is True
+    assert float(opened.state) >= 0
+    assert dropped.state == "unavailable"
+    assert back.attributes["tracking"] is True
+    assert float(back.state) >= 0
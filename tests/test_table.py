@@ -0,0 +1,51 @@
+"""Tests of the table mode interpolating precomputed vent times."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from custom_components.ventoptimization.const import DEFAULT_MAX_VENT_TIME
+from custom_components.ventoptimization.model import DEFAULT_CONSTANTS, calc_absolute_humidity, calc_time_to_vent
+from custom_components.ventoptimization.table import TABLE_AXES, TABLE_MAX_ERROR, VentTimeTable
+
+SAMPLES = 2000
+
+# window size, room volume and wished humidity of typical rooms
+ROOMS = [(0.75, 30, 65), (1.5, 20, 55), (0.5, 60, 70)]
+
+
+@pytest.mark.parametrize("room", ROOMS)
+def test_interpolation_error(room):
+    """Interpolated vent times stay within the error bound of the exact model"""
+    room_key = (*room, DEFAULT_MAX_VENT_TIME, DEFAULT_CONSTANTS)
+    table = VentTimeTable(None, room_key)
+    table._values = VentTimeTable.build(room_key)
+
+    rng = np.random.default_rng(0)
+    samples = np.array([rng.uniform(start, start + step*(size - 1), SAMPLES) for start, step, size in TABLE_AXES]).T
+    errors = []
+    for indoor_temp, indoor_hum, outdoor_temp, outdoor_hum in samples.tolist():
+        if (interpolated := table.lookup(indoor_temp, indoor_hum, outdoor_temp, outdoor_hum)) is None:
+            continue
+        exact, _ = calc_time_to_vent(
+            indoor_temp,
+            outdoor_temp,
+            calc_absolute_humidity(indoor_hum, indoor_temp),
+            calc_absolute_humidity(outdoor_hum, outdoor_temp),
+            *room,
+        )
+        errors.append(abs(interpolated - exact))
+
+    # Most readings are answered by the table, the others by the exact model
+    assert len(errors) > SAMPLES/2
+    assert max(errors) <= TABLE_MAX_ERROR
+
+
+def test_lookup_outside_of_the_grid():
+    """Readings outside of the grid are left to the exact model"""
+    room_key = (0.75, 30, 65, DEFAULT_MAX_VENT_TIME, DEFAULT_CONSTANTS)
+    table = VentTimeTable(None, room_key)
+    assert table.lookup(22, 75, 8, 70) is None
+    table._values = VentTimeTable.build(room_key)
+    assert table.lookup(22, 75, 8, 70) is not None
+    assert table.lookup(22, 75, -30, 70) is None